@@ -2,7 +2,7 @@ import sys
 from flask import Flask
 from flask_cors import CORS
 from flask_session import Session
-from backend.routes import scenario_bp, review_bp, chatbot_bp
+from backend.routes import scenario_bp, review_bp, chatbot_bp, vector_bp
 import os
 from datetime import timedelta
 
@@ -18,7 +18,8 @@ def create_app():
         SESSION_TYPE='filesystem',
         SESSION_PERMANENT=False,
         PERMANENT_SESSION_LIFETIME=timedelta(minutes=30),
-        CORS_HEADERS='Content-Type'
+        CORS_HEADERS='Content-Type',
+        VECTOR_WARMUP=os.getenv('VECTOR_WARMUP', '0') == '1'  # 시작 시 벡터/검색 색인 warm-up (기본: 사용 안 함)
     )
     
     # CORS 설정
@@ -38,6 +39,7 @@ def create_app():
     app.register_blueprint(scenario_bp, url_prefix='/scenario')
     app.register_blueprint(review_bp, url_prefix='/review')
     app.register_blueprint(chatbot_bp, url_prefix='/chatbot')
+    app.register_blueprint(vector_bp, url_prefix='/vector')
     
     return app
 
@@ -2,11 +2,14 @@
 from flask import Flask
 from flask_cors import CORS
 from flask_session import Session
-from routes import scenario_bp, review_bp, chatbot_bp
 import os
 from datetime import timedelta
 
 def create_app():
+    # 라우트/서비스는 여기서 import: 토큰화 프로세스 풀(spawn) 워커가 이 파일을 __mp_main__으로 다시 실행할 때
+    # Flask 앱 전체(벡터 색인, GPT 클라이언트 등)를 다시 만들지 않도록
+    from routes import scenario_bp, review_bp, chatbot_bp, vector_bp
+
     app = Flask(__name__)
     
     # 기본 설정
@@ -15,7 +18,8 @@ def create_app():
         SESSION_TYPE='filesystem',
         SESSION_PERMANENT=False,
         PERMANENT_SESSION_LIFETIME=timedelta(minutes=30),
-        CORS_HEADERS='Content-Type'
+        CORS_HEADERS='Content-Type',
+        VECTOR_WARMUP=os.getenv('VECTOR_WARMUP', '0') == '1'  # 시작 시 벡터/검색 색인 warm-up (기본: 사용 안 함)
     )
     
     # CORS 설정
@@ -35,6 +39,7 @@ def create_app():
     app.register_blueprint(scenario_bp, url_prefix='/scenario')
     app.register_blueprint(review_bp, url_prefix='/review')
     app.register_blueprint(chatbot_bp, url_prefix='/chatbot')
+    app.register_blueprint(vector_bp, url_prefix='/vector')
     
     return app
 
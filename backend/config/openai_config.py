@@ -83,4 +83,14 @@ class ReviewAnalysisConfig(BaseConfig):
     """
     MODEL = "o3-mini"
     REASONING_EFFORT = "high"
-    MAX_COMPLETION_TOKENS = 4000
\ No newline at end of file
+    MAX_COMPLETION_TOKENS = 4000
+    REQUEST_TIMEOUT = float(os.getenv("REVIEW_ANALYSIS_TIMEOUT", 120))  # 요청 1건당 제한 시간(초)
+    MAX_RETRIES = 1
+
+    # map-reduce 요약 (토큰 수는 GPTService.estimate_tokens 근사치 기준)
+    BATCH_TOKEN_BUDGET = 6000  # map 요청 1건에 담을 리뷰 토큰 수
+    MAX_REVIEW_TOKENS = 500  # 리뷰 1개 최대 토큰 수 (넘으면 잘라냄)
+    MAX_BATCHES = 8  # 긍정/부정 각각 최대 묶음 수 (토큰 사용량 상한)
+    MAP_CONCURRENCY = 4  # 동시에 실행할 GPT 호출 수
+    MAP_REASONING_EFFORT = "low"
+    MAP_MAX_COMPLETION_TOKENS = 2000
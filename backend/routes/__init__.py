@@ -1,5 +1,6 @@
 from .scenario_routes import bp as scenario_bp
 from .review_routes import bp as review_bp
 from .chatbot_routes import bp as chatbot_bp
+from .vector_routes import bp as vector_bp
 
-__all__ = ['scenario_bp', 'review_bp', 'chatbot_bp'] 
\ No newline at end of file
+__all__ = ['scenario_bp', 'review_bp', 'chatbot_bp', 'vector_bp'] 
\ No newline at end of file
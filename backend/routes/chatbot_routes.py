@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify, session
 from flask_cors import cross_origin
 from services.chat_service import ChatService
 from config.chat_config import ChatConfig
+from services.llm_cache import llm_cache
 
 bp = Blueprint('chatbot', __name__)
 chat_service = ChatService()
@@ -28,7 +29,11 @@ def chat():
         messages.append({"role": "user", "content": message})
         
         # GPT 응답 (designer_type 전달)
-        response = chat_service.create_chat_completion(messages, designer_type)
+        response = chat_service.create_chat_completion(
+            messages,
+            designer_type,
+            bypass_cache=bool(data.get('bypass_cache', False))
+        )
         
         if response["success"]:
             # 응답 메시지 추가
@@ -71,3 +76,11 @@ def clear_chat():
     """대화 기록 초기화"""
     session.pop('chat_history', None)
     return jsonify({"success": True})
+
+@bp.route('/cache', methods=['GET'])
+def get_llm_cache_stats():
+    """LLM 응답 캐시 적중/실패 통계"""
+    return jsonify({
+        "success": True,
+        "stats": llm_cache.stats()
+    })
@@ -1,305 +1,119 @@
 # backend/routes/review_routes.py
 import requests
 import os
-from flask import Blueprint, request, jsonify
-import numpy as np
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
-from io import BytesIO
-import base64
-from collections import Counter
-import re
-import matplotlib
-import openai
-from datetime import datetime, timedelta
-import pandas as pd
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from datetime import timedelta
 import sys
 from pathlib import Path
 import json
-import time
-from konlpy.tag import Okt  # 한글 형태소 분석
-import nltk  # 영어 토큰화
-from langdetect import detect  # 언어 감지
-import io
+import hashlib
+import gzip
+import heapq
 
 # 프로젝트 루트 디렉토리 찾기
 root_dir = Path(__file__).resolve().parent.parent
 sys.path.append(str(root_dir))
 
 from services.gpt_service import GPTService
-
-matplotlib.use('Agg')  # GUI 없는 환경
+from services.steam_review_store import SteamReviewStore, SteamAPIError
+from services.review_aggregator import ReviewAggregator
+from services.job_service import JobManager, JobQueueFull
+from services.token_cache import TokenCache
+from services.wordcloud_renderer import WordCloudRenderer, WORDCLOUD_FORMATS
+from services.tokenizer import TokenizationEngine, TOKENIZER_VERSION
 
 bp = Blueprint('review', __name__)
 
-CACHE_DIR = Path("cache/reviews")
-CACHE_DURATION = timedelta(hours=24)  # 캐시 유효 기간
-
-# 토큰화 도구 초기화
-okt = Okt()
-nltk.download('punkt', quiet=True)
-nltk.download('stopwords', quiet=True)
-english_stopwords = set(nltk.corpus.stopwords.words('english'))
-
-def detect_language(text):
-    """텍스트의 언어를 감지 (한글/영어)"""
-    if not isinstance(text, str):
-        return 'etc'
-        
-    # 한글, 영어 각각의 문자 수 계산
-    korean_chars = len(re.findall(r'[가-힣]', text))
-    english_chars = len(re.findall(r'[a-zA-Z]', text))
-    total_chars = korean_chars + english_chars
-    
-    if total_chars == 0:
-        return 'etc'
-    
-    # 비율 계산
-    korean_ratio = korean_chars / total_chars if total_chars > 0 else 0
-    english_ratio = english_chars / total_chars if total_chars > 0 else 0
-    
-    # 임계값 (60%)으로 언어 판단
-    if korean_ratio > 0.6:
-        return 'ko'
-    elif english_ratio > 0.6:
-        return 'en'
-    return 'etc'
-
-# 한국어 불용어
-KOREAN_STOP_WORDS = {
-    # 기본 불용어
-    '게임', '겜', '중', '것', '등', '듯', '때', '나', '좀', '네', '예', 
-    '더', '수', '말', '개', '달', '전', '분', '시간', '이번', '그냥',
-    '정도', '처음', '다음', '이후', '진짜', '계속', '많이', '이거',
-    '저거', '근데', '그리고', '하나', '이제', '그때', '이런', '그런',
-    '무슨', '어떤', '같은', '요즘', '매우', '약간', '조금', '보고',
-    # 조사/어미/접속사
-    '가', '이', '을', '를', '에', '의', '로', '와', '과', '은', '는',
-    '께서', '에서', '으로', '처럼', '만큼', '까지', '부터', '이나', '나',
-    '고', '라고', '하고', '하면', '하니', '하지만', '하더라도', '하여',
-    '이고', '이면', '이니', '이지만', '이더라도', '이며', '이야', '랑',
-    # 대명사
-    '나', '너', '우리', '저희', '당신', '그', '그녀', '그들', '저', '이',
-    '저것', '이것', '그것', '여기', '저기', '거기', '어디', '누구',
-    # 부사
-    '매우', '정말', '너무', '아주', '잘', '더', '덜', '많이', '조금',
-    '그냥', '바로', '자주', '이미', '아직', '드디어', '마침내', '결국',
-    # 형용사/동사 기본형
-    '좋다', '나쁘다', '크다', '작다', '많다', '적다', '되다', '하다',
-    '이다', '있다', '없다', '가다', '오다', '주다', '받다', '보다',
-    # 게임 관련 기본 용어
-    '플레이', '스팀', '유저', '버전', '패치', '업데이트', '출시', '평가',
-    '리뷰', '추천', '비추천', '가격', '원', '시작', '설치', '실행', '구매',
-    '환불', '시즌', '다운로드', '접속', '로딩', '버그', '오류', '생각',
-    '느낌', '때문', '이유', '경우', '관련', '현재', '계정', '시스템',
-    # 시간 관련
-    '년', '월', '일', '시', '분', '초', '전', '후', '동안', '오늘',
-    '어제', '내일', '모레', '언제', '이번', '저번', '다음', '이후',
-    # 수량 관련
-    '하나', '둘', '셋', '넷', '다섯', '여섯', '일곱', '여덟', '아홉',
-    '열', '백', '천', '만', '억', '조', '몇', '얼마', '많은', '적은',
-    # 접속/연결어
-    '그리고', '하지만', '또는', '또한', '그러나', '그래서', '따라서',
-    '그러므로', '그런데', '그리하여', '하여', '또', '혹은', '및'
-}
-
-# 영어 불용어
-ENGLISH_STOP_WORDS = {
-    'the', 'be', 'to', 'of', 'and', 'a', 'in', 'that', 'have', 'i',
-    'it', 'for', 'not', 'on', 'with', 'he', 'as', 'you', 'do', 'at',
-    'this', 'but', 'his', 'by', 'from', 'they', 'we', 'say', 'her',
-    'she', 'or', 'an', 'will', 'my', 'one', 'all', 'would', 'there',
-    'their', 'what', 'so', 'up', 'out', 'if', 'about', 'who', 'get',
-    'which', 'go', 'me', 'game', 'play', 'games', 'playing', 'played',
-    'steam', 'user', 'version', 'patch', 'update', 'release', 'also', 'etc'
-}
-
-def simple_tokenize_ko(text):
-    """한글 텍스트 토큰화"""
-    try:
-        # 명사, 형용사, 동사만 추출
-        tokens = okt.pos(text, norm=True, stem=True)
-        words = [word for word, pos in tokens if pos in ['Noun', 'Adjective', 'Verb']]
-        # 2글자 이상이고 불용어가 아닌 단어만 선택
-        return [w for w in words if len(w) > 1 and w not in KOREAN_STOP_WORDS]
-    except Exception as e:
-        print(f"[ERROR] 한글 토큰화 실패: {str(e)}")
-        return []
-
-def simple_tokenize_en(text):
-    """영어 텍스트 토큰화"""
+CACHE_DIR = os.getenv('REVIEW_STORE_DIR', str(root_dir / "cache" / "reviews"))  # 쓸 수 없으면 임시 디렉터리 사용
+TOKEN_CACHE_DIR = os.getenv('TOKEN_CACHE_DIR', str(root_dir / "cache" / "tokens"))  # 쓸 수 없으면 임시 디렉터리 사용
+CACHE_DURATION = timedelta(hours=24)  # 캐시 유효 기간 (지나면 전체 재동기화)
+MAX_REVIEWS = 50000  # 분석에 사용할 최대 리뷰 수 (settings.max_reviews로 낮출 수 있음)
+MAX_RESPONSE_REVIEWS = 1000  # /steam/<app_id> 응답에 포함할 원본 리뷰 수
+REVIEW_PAGE_SIZE = 20  # /analyze 응답 및 /reviews/<app_id> 기본 페이지 크기
+MAX_REVIEW_PAGE_SIZE = 100
+REVIEW_FIELDS = (  # 응답 리뷰 기본 필드 ('author.playtime_forever'처럼 중첩 필드는 점으로 구분)
+    'recommendationid',
+    'review',
+    'voted_up',
+    'votes_up',
+    'timestamp_created',
+    'language',
+    'author.playtime_forever'
+)
+TOP_WORDS = 200  # 워드클라우드/응답에 포함할 긍정/부정 상위 단어 수
+COMPRESS_MIN_SIZE = 1024  # 이보다 작은 응답은 압축하지 않음
+# ETag/304를 적용할 엔드포인트 - 저장된 데이터를 다시 읽는 GET 조회만 (분석/Steam 호출은 본문을 만든 뒤라 절약되는 작업이 없음)
+ETAG_ENDPOINTS = ('review.get_review_page', 'review.get_analysis_job_result')
+GPT_CANDIDATES = 1000  # GPT map-reduce 요약용으로 보관할 긍정/부정 품질 상위 리뷰 수 (토큰 예산을 넘는 하위 리뷰는 GPTService에서 제외)
+ANALYSIS_WORKERS = int(os.getenv('ANALYSIS_WORKERS', 2))  # 비동기 분석 작업 동시 실행 수
+# 비동기 분석 작업 사용 여부 - 응답 후 백그라운드 스레드가 멈추는 서버리스(Vercel)에서는 기본적으로 끔 (stream 모드 사용)
+ANALYSIS_JOBS_ENABLED = os.getenv('ANALYSIS_JOBS', '0' if os.getenv('VERCEL') else '1') == '1'
+JOB_DIR = os.getenv('ANALYSIS_JOB_DIR', str(root_dir / "cache" / "jobs"))  # 작업 상태/결과 DB (워커 프로세스 간 공유)
+WORDCLOUD_FONT_PATH = os.getenv('WORDCLOUD_FONT_PATH', 'C:/Windows/Fonts/malgun.ttf')  # Windows 맑은 고딕 폰트
+TOKENIZER_WORKERS = int(os.getenv('TOKENIZER_WORKERS', max(1, (os.cpu_count() or 2) - 1)))  # 0이면 요청 스레드에서 토큰화
+
+# app_id별 리뷰 저장소 (delta 동기화, SQLite 파일은 처음 사용할 때 생성)
+review_store = SteamReviewStore(CACHE_DIR, CACHE_DURATION)
+
+# 워드클라우드 렌더러 (matplotlib 없이 PIL로 인코딩, 결과 메모이즈)
+wordcloud_renderer = WordCloudRenderer(WORDCLOUD_FONT_PATH)
+
+# 워드클라우드용 토큰화 엔진 (프로세스 풀, 워커별 Okt 상주, 리뷰별 토큰 캐시)
+tokenization_engine = TokenizationEngine(
+    max_workers=TOKENIZER_WORKERS,
+    cache=TokenCache(TOKEN_CACHE_DIR, TOKENIZER_VERSION)
+)
+
+def generate_wordcloud(word_freq, width=400, height=200, fmt='png'):
+    """워드클라우드 생성 - png/webp는 base64 이미지, layout은 단어 배치 JSON"""
     try:
-        # 단어 토큰화 및 소문자 변환
-        words = nltk.word_tokenize(text.lower())
-        # 불용어 및 특수문자 제거, 2글자 이상 단어만 선택
-        return [w for w in words if w.isalnum() and len(w) > 2 and w not in english_stopwords]
-    except Exception as e:
-        print(f"[ERROR] 영어 토큰화 실패: {str(e)}")
-        return []
-
-def generate_wordcloud(word_freq, width=400, height=200):
-    """워드클라우드 이미지 생성 및 base64 인코딩"""
-    try:
-        if not word_freq:
-            return None
-
-        # 워드클라우드 생성
-        wc = WordCloud(
-            width=width, 
-            height=height,
-            background_color='white',
-            font_path='C:/Windows/Fonts/malgun.ttf',  # Windows 맑은 고딕 폰트
-            min_font_size=10,
-            max_font_size=100
-        )
-        
-        # 워드클라우드 생성
-        wc.generate_from_frequencies(word_freq)
-        
-        # 이미지를 버퍼에 저장
-        buf = io.BytesIO()
-        plt.figure(figsize=(10, 5))
-        plt.imshow(wc, interpolation='bilinear')
-        plt.axis('off')
-        plt.savefig(buf, format='png', bbox_inches='tight', pad_inches=0)
-        plt.close()
-        
-        # base64 인코딩
-        buf.seek(0)
-        image_base64 = base64.b64encode(buf.getvalue()).decode()
-        buf.close()
-        
-        return image_base64
-    
+        return wordcloud_renderer.render(word_freq, width, height, fmt)
     except Exception as e:
         print(f"[ERROR] 워드클라우드 생성 실패: {str(e)}")
         return None
 
-def analyze_review_trends(reviews):
-    """리뷰 트렌드 분석"""
-    try:
-        if not reviews:
-            return {'daily': [], 'monthly': []}
-
-        df = pd.DataFrame(reviews)
-        if df.empty:
-            return {'daily': [], 'monthly': []}
-
-        df['timestamp'] = pd.to_datetime(df['timestamp_created'], unit='s')
-        df['date'] = df['timestamp'].dt.date
-        df['month'] = df['timestamp'].dt.strftime('%Y-%m')
-
-        # 그룹 집계 시 컬럼명을 review_count로 통일
-        daily_stats = df.groupby('date').agg(
-             review_count=('review', 'count'),
-             voted_up=('voted_up', 'sum')
-        ).reset_index()
-        
-        daily_stats['positive_ratio'] = (daily_stats['voted_up'] / daily_stats['review_count'] * 100).round(2)
-        daily_stats['date'] = daily_stats['date'].astype(str)
-        
-        monthly_stats = df.groupby('month').agg(
-             review_count=('review', 'count'),
-             voted_up=('voted_up', 'sum')
-        ).reset_index()
-        
-        monthly_stats['positive_ratio'] = (monthly_stats['voted_up'] / monthly_stats['review_count'] * 100).round(2)
-
-        return {
-            'daily': daily_stats.to_dict('records'),
-            'monthly': monthly_stats.to_dict('records')
-        }
-    except Exception as e:
-        print(f"[ERROR] 트렌드 분석 오류: {str(e)}")
-        return {'daily': [], 'monthly': []}
-
 # GPT 서비스 인스턴스 생성
 gpt_service = GPTService()
 
-def get_steam_reviews(app_id, language='all', review_type='all', day_range=30):
-    """Steam 리뷰 수집 함수"""
-    try:
-        # day_range 타입 변환
-        try:
-            day_range = int(day_range)
-        except (ValueError, TypeError):
-            day_range = 30
-            print(f"[WARNING] Invalid day_range value, using default: {day_range}")
+# 비동기 분석 작업 관리자 (작업 상태/결과는 SQLite에 저장하므로 gunicorn 워커 어느 쪽에서도 조회 가능)
+analysis_jobs = JobManager(max_workers=ANALYSIS_WORKERS, cache_dir=JOB_DIR)
 
-        print(f"[DEBUG] Collecting reviews for app_id={app_id}, language={language}, type={review_type}, days={day_range}")
-        
-        params = {
-            'json': 1,
-            'filter': 'updated',
-            'language': language if language != 'all' else None,
-            'review_type': review_type if review_type != 'all' else None,
-            'day_range': day_range,
-            'cursor': '*',
-            'num_per_page': 100,
-            'purchase_type': 'all'
-        }
+def _parse_day_range(day_range):
+    """day_range 타입 변환 (잘못된 값이면 기본값 30)"""
+    try:
+        return int(day_range)
+    except (ValueError, TypeError):
+        print(f"[WARNING] Invalid day_range value, using default: 30")
+        return 30
+
+def iter_steam_reviews(app_id, language='all', review_type='all', day_range=30, limit=MAX_REVIEWS):
+    """
+    Steam 리뷰를 작성일 최신순 페이지(list) 단위로 yield하는 제너레이터 (전체 리스트를 만들지 않음)
+    과거 방향 수집은 요청당 SteamReviewStore.MAX_FETCH_PER_SYNC개까지만 하고 나머지는 다음 요청에서 이어서 수집
+    """
+    day_range = _parse_day_range(day_range)
+    print(f"[DEBUG] Collecting reviews for app_id={app_id}, language={language}, type={review_type}, days={day_range}")
+
+    collected = 0
+    for page in review_store.iter_pages(
+        app_id,
+        language=language,
+        review_type=review_type,
+        day_range=day_range,
+        limit=limit
+    ):
+        collected += len(page)
+        print(f"[DEBUG] Collected {len(page)} reviews (total: {collected})")
+        yield page
 
+def get_steam_reviews(app_id, language='all', review_type='all', day_range=30):
+    """Steam 리뷰 수집 함수 (로컬 저장소 delta 동기화 후 필터링하여 반환)"""
+    try:
         all_reviews = []
-        total_pages = 0
-        cutoff_date = int(time.time()) - (day_range * 24 * 60 * 60)
-
-        while True:
-            try:
-                response = requests.get(
-                    f'https://store.steampowered.com/appreviews/{app_id}',
-                    params=params,
-                    timeout=30
-                )
-                response.raise_for_status()  # HTTP 에러 체크
-                data = response.json()
+        for page in iter_steam_reviews(app_id, language, review_type, day_range, limit=MAX_RESPONSE_REVIEWS):
+            all_reviews.extend(page)
 
-                if not data.get('success'):
-                    return {
-                        'success': 0,
-                        'error': 'Steam API 응답 실패',
-                        'details': data.get('error', 'Unknown error')
-                    }
-
-                if not data.get('reviews'):
-                    # 더 이상 리뷰가 없는 경우 (정상)
-                    break
-
-                new_reviews = []
-                for review in data['reviews']:
-                    if review.get('timestamp_created', 0) < cutoff_date:
-                        continue
-                    
-                    if language != 'all' and review.get('language') != language:
-                        continue
-                        
-                    if review_type != 'all':
-                        is_positive = review.get('voted_up', False)
-                        if (review_type == 'positive' and not is_positive) or \
-                           (review_type == 'negative' and is_positive):
-                            continue
-                    
-                    new_reviews.append(review)
-
-                all_reviews.extend(new_reviews)
-                print(f"[DEBUG] Collected {len(new_reviews)} reviews (total: {len(all_reviews)})")
-
-                cursor = data.get('cursor')
-                if not cursor or cursor == params['cursor'] or len(all_reviews) >= 1000:
-                    break
-
-                params['cursor'] = cursor
-                total_pages += 1
-                time.sleep(1)  # API rate limit
-
-            except requests.RequestException as e:
-                print(f"[ERROR] Steam API request failed: {str(e)}")
-                return {
-                    'success': 0, 
-                    'error': 'Steam API 요청 실패',
-                    'details': str(e)
-                }
-
-        print(f"[DEBUG] Review collection completed - {len(all_reviews)} reviews from {total_pages} pages")
+        print(f"[DEBUG] Review collection completed - {len(all_reviews)} reviews")
 
         # 수집된 리뷰가 없는 경우
         if not all_reviews:
@@ -311,6 +125,13 @@ def get_steam_reviews(app_id, language='all', review_type='all', day_range=30):
 
         return {'success': 1, 'reviews': all_reviews}
 
+    except SteamAPIError as e:
+        print(f"[ERROR] Steam API request failed: {e.details}")
+        return {
+            'success': 0,
+            'error': e.error,
+            'details': e.details
+        }
     except Exception as e:
         print(f"[ERROR] Review collection failed: {str(e)}")
         return {
@@ -319,83 +140,185 @@ def get_steam_reviews(app_id, language='all', review_type='all', day_range=30):
             'details': str(e)
         }
 
-def analyze_summary_stats(reviews):
-    """리뷰 요약 통계 분석"""
-    total = len(reviews)
-    if total == 0:
-        return {
-            'total_reviews': 0,
-            'positive_count': 0,
-            'negative_count': 0,
-            'positive_ratio': 0
-        }
-    
-    positive = sum(1 for r in reviews if r.get('voted_up', False))
-    return {
-        'total_reviews': total,
-        'positive_count': positive,
-        'negative_count': total - positive,
-        'positive_ratio': (positive / total * 100) if total > 0 else 0
+def top_words(word_freq, max_words=TOP_WORDS):
+    """빈도 상위 max_words개 단어만 남긴 dict (빈도 내림차순)"""
+    return dict(heapq.nlargest(max_words, word_freq.items(), key=lambda item: item[1]))
+
+def build_wordclouds(pos_freq, neg_freq, fmt='png', max_words=TOP_WORDS):
+    """
+    긍정/부정 단어 빈도로 워드클라우드 생성
+    fmt: 'png' | 'webp' (base64 이미지) 또는 'layout' (클라이언트 렌더링용 배치 JSON)
+    max_words: 워드클라우드와 응답 빈도 dict에 포함할 상위 단어 수
+    """
+    if fmt not in WORDCLOUD_FORMATS:
+        fmt = 'png'
+    pos_freq = top_words(pos_freq, max_words)
+    neg_freq = top_words(neg_freq, max_words)
+    result = {
+        'pos_wc_base64': None,
+        'neg_wc_base64': None,
+        'image_format': fmt,
+        'pos_freq': pos_freq,
+        'neg_freq': neg_freq
     }
-
-def filter_word_frequencies(word_freq, min_freq=2):
-    """단어 빈도수 필터링"""
-    return {word: freq for word, freq in word_freq.items() 
-            if freq >= min_freq}
-
-def generate_wordclouds(reviews):
-    """긍정/부정 리뷰 워드클라우드 생성"""
+    if fmt == 'layout':
+        result['pos_layout'] = generate_wordcloud(pos_freq, fmt=fmt)
+        result['neg_layout'] = generate_wordcloud(neg_freq, fmt=fmt)
+    else:
+        result['pos_wc_base64'] = generate_wordcloud(pos_freq, fmt=fmt)
+        result['neg_wc_base64'] = generate_wordcloud(neg_freq, fmt=fmt)
+    return result
+
+def _parse_int(value, default, minimum, maximum):
+    """정수 파라미터 파싱 (잘못된 값이면 default, 범위를 벗어나면 잘라냄)"""
     try:
-        if not reviews:
+        return max(minimum, min(int(value), maximum))
+    except (ValueError, TypeError):
+        return default
+
+def _parse_fields(value):
+    """
+    응답 리뷰 필드 목록 파싱 (리스트 또는 콤마 구분 문자열)
+    'all'이면 None (원본 리뷰 그대로), 지정하지 않으면 REVIEW_FIELDS
+    """
+    if value is None:
+        return REVIEW_FIELDS
+    if isinstance(value, str):
+        if value == 'all':
             return None
+        value = value.split(',')
+    fields = tuple(field.strip() for field in value if isinstance(field, str) and field.strip())
+    return fields or REVIEW_FIELDS
+
+def project_review(review, fields):
+    """리뷰 dict에서 fields만 남긴 dict (fields가 None이면 원본 그대로)"""
+    if fields is None:
+        return review
+    projected = {}
+    for field in fields:
+        *parents, name = field.split('.')
+        source, target = review, projected
+        for parent in parents:
+            source = source.get(parent) if isinstance(source, dict) else None
+            target = target.setdefault(parent, {})
+        if isinstance(source, dict) and name in source:
+            target[name] = source[name]
+    return projected
+
+def iter_analysis_sections(app_id, settings, use_gpt=False):
+    """
+    리뷰 분석 결과를 (section, data) 단위로 준비되는 즉시 yield
+      progress → reviews → summary_stats → trends → wordcloud → gpt_summary
+    Steam 수집 실패 시 ('error', {...})를 yield하고 종료
+    원본 리뷰는 첫 페이지(settings.review_page_size개, settings.review_fields 필드)만 포함하고
+    나머지는 /reviews/<app_id>로 페이지 조회
+    """
+    # 리뷰를 페이지 단위로 받으면서 통계/트렌드/단어 빈도/GPT 후보를 한 번에 누적
+    aggregator = ReviewAggregator(
+        tokenizer=tokenization_engine,
+        keep_top=GPT_CANDIDATES if use_gpt else 0,
+        dedup=settings.get('dedup', True)  # 복사/붙여넣기 리뷰는 대표 하나만 토큰화/GPT 전달
+    )
+    page_size = _parse_int(settings.get('review_page_size'), REVIEW_PAGE_SIZE, 0, MAX_REVIEW_PAGE_SIZE)
+    fields = _parse_fields(settings.get('review_fields'))
+    max_words = _parse_int(settings.get('max_words'), TOP_WORDS, 1, TOP_WORDS * 5)
+    wordcloud_format = settings.get('wordcloud_format', 'png')
+    reviews = []  # 응답에 포함할 최신 리뷰 첫 페이지
 
-        # 긍정/부정 리뷰 분리
-        positive_reviews = [r['review'] for r in reviews if r.get('voted_up')]
-        negative_reviews = [r['review'] for r in reviews if not r.get('voted_up')]
-
-        # 긍정 리뷰 워드클라우드
-        pos_tokens = []
-        pos_freq = {}
-        for review in positive_reviews:
-            lang = detect_language(review)
-            if lang == 'ko':
-                pos_tokens.extend(simple_tokenize_ko(review))
-            elif lang == 'en':
-                pos_tokens.extend(simple_tokenize_en(review))
-
-        if pos_tokens:
-            pos_freq = dict(Counter(pos_tokens))
-            pos_freq = filter_word_frequencies(pos_freq)  # 빈도수 필터링 추가
-
-        # 부정 리뷰 워드클라우드
-        neg_tokens = []
-        neg_freq = {}
-        for review in negative_reviews:
-            lang = detect_language(review)
-            if lang == 'ko':
-                neg_tokens.extend(simple_tokenize_ko(review))
-            elif lang == 'en':
-                neg_tokens.extend(simple_tokenize_en(review))
-
-        if neg_tokens:
-            neg_freq = dict(Counter(neg_tokens))
-            neg_freq = filter_word_frequencies(neg_freq)  # 빈도수 필터링 추가
-
-        # 워드클라우드 이미지 생성
-        return {
-            'pos_wc_base64': generate_wordcloud(pos_freq),
-            'neg_wc_base64': generate_wordcloud(neg_freq),
-            'pos_freq': pos_freq,
-            'neg_freq': neg_freq
-        }
+    try:
+        for page in iter_steam_reviews(
+            app_id=app_id,
+            language=settings.get('language', 'all'),
+            review_type=settings.get('review_type', 'all'),
+            day_range=settings.get('day_range', 30),
+            limit=_parse_int(settings.get('max_reviews'), MAX_REVIEWS, 1, MAX_REVIEWS)
+        ):
+            aggregator.update(page)
+            if len(reviews) < page_size:
+                reviews.extend(project_review(review, fields) for review in page[:page_size - len(reviews)])
+            yield 'progress', aggregator.summary_stats()
+    except SteamAPIError as e:
+        print(f"[ERROR] Steam API request failed: {e.details}")
+        yield 'error', {'success': 0, 'error': e.error, 'details': e.details}
+        return
+
+    yield 'reviews', reviews
+    yield 'reviews_page', {
+        'page': 1,
+        'page_size': page_size,
+        'total': aggregator.total,
+        'has_more': aggregator.total > len(reviews)
+    }
+    yield 'summary_stats', aggregator.summary_stats()
+    yield 'trends', aggregator.trends()
+
+    # 리뷰가 없는 경우 - 정상 응답으로 처리
+    if not aggregator.total:
+        yield 'wordcloud', build_wordclouds({}, {}, fmt=wordcloud_format)
+        yield 'message', f"최근 {settings.get('day_range', 30)}일 동안 {settings.get('language', '모든')} 언어의 리뷰가 없습니다."
+        return
+
+    yield 'wordcloud', build_wordclouds(
+        *aggregator.word_frequencies(),
+        fmt=wordcloud_format,
+        max_words=max_words
+    )
+
+    # GPT 분석 (선택적)
+    if use_gpt:
+        try:
+            # 품질 점수 상위 리뷰 객체를 전달
+            positive_reviews, negative_reviews = aggregator.top_reviews()
+            
+            if positive_reviews or negative_reviews:
+                gpt_summary = gpt_service.summarize_reviews(
+                    positive_reviews,
+                    negative_reviews,
+                    bypass_cache=bool(settings.get('bypass_cache', False))
+                )
+                yield 'gpt_summary', gpt_summary
+                if gpt_summary.get('errors'):
+                    # 한쪽 분석만 실패한 경우 - 나머지 결과는 그대로 두고 경고로 전달
+                    yield 'gpt_error', "; ".join(gpt_summary['errors'].values())
+        except Exception as e:
+            print(f"[ERROR] GPT analysis failed: {str(e)}")
+            yield 'gpt_error', str(e)
+
+def _stream_format(data):
+    """스트리밍 응답 형식 결정 (body의 stream 값 또는 Accept 헤더) - 'ndjson', 'sse', None"""
+    stream = data.get('stream')
+    if stream in ('ndjson', 'sse'):
+        return stream
+    if stream is True:
+        return 'ndjson'
+    accept = request.headers.get('Accept', '')
+    if 'text/event-stream' in accept:
+        return 'sse'
+    if 'application/x-ndjson' in accept:
+        return 'ndjson'
+    return None
+
+def _stream_sections(sections, fmt):
+    """(section, data)를 NDJSON 줄 또는 SSE 이벤트로 직렬화"""
+    def encode(section, payload):
+        body = json.dumps({'section': section, 'data': payload}, ensure_ascii=False)
+        return f"event: {section}\ndata: {body}\n\n" if fmt == 'sse' else body + "\n"
 
+    try:
+        for section, payload in sections:
+            yield encode(section, payload)
     except Exception as e:
-        print(f"[ERROR] 워드클라우드 생성 실패: {str(e)}")
-        return None
+        # 헤더가 이미 전송된 뒤이므로 오류도 섹션으로 전달
+        print(f"[ERROR] Streaming analysis failed: {str(e)}")
+        yield encode('error', {'success': 0, 'error': str(e)})
+    yield encode('done', None)
 
 @bp.route('/analyze', methods=['POST'])
 def analyze_reviews():
-    """리뷰 분석 엔드포인트"""
+    """
+    리뷰 분석 엔드포인트
+    stream: "ndjson" | "sse" (또는 Accept 헤더)를 지정하면 섹션별로 준비되는 즉시 전송
+    """
     try:
         data = request.get_json()
         if not data:
@@ -407,71 +330,134 @@ def analyze_reviews():
 
         settings = data.get('settings', {})
         use_gpt = data.get('use_gpt', False)
+        sections = iter_analysis_sections(app_id, settings, use_gpt)
 
-        # 리뷰 수집
-        reviews_result = get_steam_reviews(
-            app_id=app_id,
-            language=settings.get('language', 'all'),
-            review_type=settings.get('review_type', 'all'),
-            day_range=settings.get('day_range', 30)
-        )
+        fmt = _stream_format(data)
+        if fmt:
+            return Response(
+                stream_with_context(_stream_sections(sections, fmt)),
+                mimetype='text/event-stream' if fmt == 'sse' else 'application/x-ndjson',
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+            )
+
+        # 분석 결과
+        result = {'success': 1}
+        for section, payload in sections:
+            if section == 'error':
+                return jsonify(payload), 500
+            if section != 'progress':
+                result[section] = payload
 
-        if not reviews_result.get('success'):
-            return jsonify(reviews_result), 500
+        return jsonify(result), 200
 
-        reviews = reviews_result['reviews']
-        
-        # 리뷰가 없는 경우 - 정상 응답으로 처리
-        if not reviews:
+    except Exception as e:
+        print(f"[ERROR] Analysis failed: {str(e)}")
+        return jsonify({'success': 0, 'error': str(e)}), 500
+
+def _analysis_job_key(app_id, settings, use_gpt):
+    """같은 app_id/설정의 작업을 병합하기 위한 key"""
+    raw = json.dumps([str(app_id), settings, bool(use_gpt)], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+def _run_analysis_job(job, app_id, settings, use_gpt):
+    """작업 풀에서 분석 파이프라인을 실행하며 진행 상황을 job에 기록"""
+    result = {'success': 1}
+    for section, payload in iter_analysis_sections(app_id, settings, use_gpt):
+        if section == 'error':
+            raise RuntimeError(f"{payload['error']}: {payload.get('details')}")
+        if section == 'progress':
+            job.update(stage='collecting', reviews_processed=payload['total_reviews'])
+            continue
+        result[section] = payload
+        job.update(stage=section, sections=[key for key in result if key != 'success'])
+    return result
+
+@bp.route('/jobs', methods=['POST'])
+def create_analysis_job():
+    """비동기 리뷰 분석 작업 생성 (/analyze와 같은 body) - 즉시 job_id 반환"""
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'success': 0, 'error': 'Invalid request data'}), 400
+
+        app_id = data.get('app_id')
+        if not app_id:
+            return jsonify({'success': 0, 'error': 'Game ID is required'}), 400
+
+        if not ANALYSIS_JOBS_ENABLED:
             return jsonify({
-                'success': 1,
-                'reviews': [],
-                'summary_stats': {
-                    'total_reviews': 0,
-                    'positive_count': 0,
-                    'negative_count': 0,
-                    'positive_ratio': 0
-                },
-                'trends': {
-                    'daily': [],
-                    'monthly': []
-                },
-                'wordcloud': {
-                    'pos_wc_base64': None,
-                    'neg_wc_base64': None,
-                    'pos_freq': {},
-                    'neg_freq': {}
-                },
-                'message': f"최근 {settings.get('day_range', 30)}일 동안 {settings.get('language', '모든')} 언어의 리뷰가 없습니다."
-            }), 200
+                'success': 0,
+                'error': '이 서버에서는 비동기 분석 작업을 사용할 수 없습니다. /analyze의 stream 모드를 사용하세요.'
+            }), 501
 
-        # 분석 결과
-        result = {
-            'success': 1,
-            'reviews': reviews,
-            'summary_stats': analyze_summary_stats(reviews),
-            'trends': analyze_review_trends(reviews),
-            'wordcloud': generate_wordclouds(reviews)
-        }
+        settings = data.get('settings', {})
+        use_gpt = data.get('use_gpt', False)
 
-        # GPT 분석 (선택적)
-        if use_gpt and reviews:
-            try:
-                # 리뷰 객체 전체를 전달하여 품질 기반 선별 가능하도록
-                positive_reviews = [r for r in reviews if r.get('voted_up')]
-                negative_reviews = [r for r in reviews if not r.get('voted_up')]
-                
-                if positive_reviews or negative_reviews:
-                    gpt_result = gpt_service.summarize_reviews(positive_reviews, negative_reviews)
-                    result['gpt_summary'] = gpt_result
-            except Exception as e:
-                print(f"[ERROR] GPT analysis failed: {str(e)}")
-                result['gpt_error'] = str(e)
+        try:
+            job, merged = analysis_jobs.submit(
+                _analysis_job_key(app_id, settings, use_gpt),
+                _run_analysis_job, app_id, settings, use_gpt
+            )
+        except JobQueueFull as e:
+            return jsonify({'success': 0, 'error': str(e)}), 503
 
-        return jsonify(result), 200
+        return jsonify({'success': 1, 'merged': merged, **job.to_dict()}), 202
 
     except Exception as e:
-        print(f"[ERROR] Analysis failed: {str(e)}")
+        print(f"[ERROR] Job creation failed: {str(e)}")
+        return jsonify({'success': 0, 'error': str(e)}), 500
+
+@bp.route('/jobs/<job_id>', methods=['GET'])
+def get_analysis_job(job_id):
+    """분석 작업 상태/진행 상황 조회"""
+    job = analysis_jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': 0, 'error': 'Job not found'}), 404
+    return jsonify({'success': 1, **job.to_dict()}), 200
+
+@bp.route('/jobs/<job_id>/result', methods=['GET'])
+def get_analysis_job_result(job_id):
+    """분석 작업 결과 조회 (진행 중이면 202, 실패 시 500)"""
+    job = analysis_jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': 0, 'error': 'Job not found'}), 404
+    if job.status == 'failed':
+        return jsonify({'success': 0, **job.to_dict()}), 500
+    if not job.finished:
+        return jsonify({'success': 1, **job.to_dict()}), 202
+    return jsonify(job.result), 200
+
+@bp.route('/reviews/<app_id>', methods=['GET'])
+def get_review_page(app_id):
+    """
+    저장된 리뷰 페이지 조회 (/analyze 이후 나머지 원본 리뷰 탐색용, Steam 호출 없음)
+    query: language, review_type, day_range, page(1부터), page_size, fields
+    """
+    try:
+        language = request.args.get('language', 'all')
+        review_type = request.args.get('review_type', 'all')
+        day_range = _parse_day_range(request.args.get('day_range', 30))
+        page = _parse_int(request.args.get('page'), 1, 1, 10 ** 6)
+        page_size = _parse_int(request.args.get('page_size'), REVIEW_PAGE_SIZE, 1, MAX_REVIEW_PAGE_SIZE)
+        fields = _parse_fields(request.args.get('fields'))
+
+        total = review_store.count_reviews(app_id, language, review_type, day_range)
+        reviews = review_store.get_reviews(
+            app_id, language, review_type, day_range,
+            limit=page_size,
+            offset=(page - 1) * page_size
+        )
+        return jsonify({
+            'success': 1,
+            'reviews': [project_review(review, fields) for review in reviews],
+            'page': page,
+            'page_size': page_size,
+            'total': total,
+            'has_more': page * page_size < total
+        }), 200
+
+    except Exception as e:
+        print(f"[ERROR] Review page query failed: {str(e)}")
         return jsonify({'success': 0, 'error': str(e)}), 500
 
 @bp.route('/search/games', methods=['GET'])
@@ -614,3 +600,47 @@ def get_steam_reviews_route(app_id):
     except Exception as e:
         print(f"[ERROR] Route handling failed: {str(e)}")
         return jsonify({'success': 0, 'error': str(e)}), 500
+
+def _accepted_encodings():
+    """Accept-Encoding 헤더에서 q=0이 아닌 인코딩 집합"""
+    encodings = set()
+    for item in request.headers.get('Accept-Encoding', '').split(','):
+        name, _, params = item.strip().partition(';')
+        if name and params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            encodings.add(name.lower())
+    return encodings
+
+def _etag_matches(etag):
+    """If-None-Match에 etag가 있는지 (약한 비교)"""
+    if_none_match = request.headers.get('If-None-Match', '')
+    if if_none_match.strip() == '*':
+        return True
+    candidates = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+    return etag.removeprefix('W/') in candidates
+
+@bp.after_request
+def compress_response(response):
+    """
+    JSON 응답을 gzip으로 압축하고, ETAG_ENDPOINTS의 GET 응답에는 ETag를 붙임 (같으면 304)
+    스트리밍 응답과 오류 응답은 그대로 전달
+    ETag는 압축 전 본문 기준이므로 인코딩과 무관한 약한 ETag 사용
+    """
+    if (response.status_code != 200 or response.is_streamed or response.direct_passthrough
+            or 'Content-Encoding' in response.headers or response.mimetype != 'application/json'):
+        return response
+
+    body = response.get_data()
+    response.headers['Vary'] = 'Accept-Encoding'
+
+    if request.method == 'GET' and request.endpoint in ETAG_ENDPOINTS:
+        etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+        response.headers['ETag'] = etag
+        if _etag_matches(etag):
+            response.status_code = 304
+            response.set_data(b'')
+            return response
+
+    if len(body) >= COMPRESS_MIN_SIZE and 'gzip' in _accepted_encodings():
+        response.set_data(gzip.compress(body, compresslevel=6))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
@@ -1,14 +1,61 @@
 # routes/scenario_routes.py
 
+import os
+import threading
+
 from flask import Blueprint, request, jsonify
 from flask_cors import cross_origin
 
 from services.vector_service import vector_service
 from services.chat_service import ChatService
+from services.semantic_cache import SemanticAnswerCache
+from services.hybrid_search import HybridRetriever
 
 bp = Blueprint('scenario', __name__)
 chat_service = ChatService()
 
+# 벡터 검색 + BM25 키워드 검색 (캐릭터/지명 같은 고유명사 질문 보강)
+retriever = HybridRetriever(vector_service, candidates=int(os.getenv('SCENARIO_SEARCH_CANDIDATES', 10)))
+
+# 벡터 색인/검색 색인 warm-up
+#   - 앱 설정 VECTOR_WARMUP=True(환경 변수 VECTOR_WARMUP=1)이면 blueprint 등록 시 백그라운드에서 시작
+#   - 기본값은 사용 안 함 (서버리스처럼 워커가 자주 새로 뜨는 환경에서 import마다 색인을 읽지 않도록)
+#     이 경우 /scenario/ready 첫 호출 때 시작하고, 그 전 요청은 처음 사용할 때 초기화
+# VECTOR_WARMUP_QUERIES: 미리 임베딩해 둘 자주 들어오는 질문 ('|'로 구분)
+WARMUP_QUERIES = [query.strip() for query in os.getenv('VECTOR_WARMUP_QUERIES', '').split('|') if query.strip()]
+_warmup_lock = threading.Lock()
+_warmup_started = False
+
+def warm_up():
+    vector_service.warm_up(WARMUP_QUERIES)
+    retriever.keyword_index(vector_service.index_version())
+
+def start_background_warm_up():
+    """warm-up을 백그라운드 스레드에서 한 번만 시작 (오류는 로그와 /scenario/ready 상태에 남김)"""
+    global _warmup_started
+    with _warmup_lock:
+        if _warmup_started:
+            return
+        _warmup_started = True
+    def run():
+        try:
+            warm_up()
+        except Exception as e:
+            print(f"[ERROR] 시나리오 검색 warm-up 실패: {str(e)}")
+    threading.Thread(target=run, name='scenario-warmup', daemon=True).start()
+
+@bp.record_once
+def start_warm_up(state):
+    """blueprint가 앱에 등록될 때 한 번, VECTOR_WARMUP 설정이 켜져 있으면 warm-up 시작"""
+    if state.app.config.get('VECTOR_WARMUP', False):
+        start_background_warm_up()
+
+# 비슷한 질문 + 같은 검색 문맥이면 이전 답변 재사용 (재인덱싱 시 자동 무효화)
+answer_cache = SemanticAnswerCache(
+    threshold=float(os.getenv('SCENARIO_CACHE_THRESHOLD', 0.93)),
+    max_entries=int(os.getenv('SCENARIO_CACHE_MAX_ENTRIES', 512))
+)
+
 @bp.route('/', methods=['GET'])
 def get_scenarios():
     """시나리오 목록 조회"""
@@ -44,12 +91,28 @@ def scenario_chat():
         if not question:
             return jsonify({"success": False, "error": "메시지가 제공되지 않았습니다."}), 400
 
-        # 1. 관련 문서 검색
-        docs = vector_service.query(question, top_k=3)
+        bypass_cache = bool(data.get('bypass_cache', False))
+
+        # 1. 질문에 고유명사(캐릭터/지명 등 data 파일 이름, keywords)가 있으면 임베딩 없이 해당 문서 사용
+        #    없으면 질문 임베딩 (검색과 답변 캐시 조회에 함께 사용) 후 벡터 + 키워드 검색으로 관련 문서 검색
+        index_version = vector_service.index_version()
+        embedding = None
+        docs = retriever.entity_query(question, top_k=3, index_version=index_version)
+        if docs is None:
+            embedding = vector_service.embed(question)
+            docs = retriever.query(question, top_k=3, query_embedding=embedding, index_version=index_version)
+        context_ids = docs.get("ids", [[]])[0]
         context_snippets = docs.get("documents", [[]])[0]
         context_text = "\n\n".join(context_snippets)
 
-        # 2. user 메시지 생성
+        # 2. 같은 의미의 질문에 같은 문맥이 검색된 적이 있으면 저장된 답변 반환
+        #    (고유명사 경로는 임베딩이 없으므로 같은 프롬프트에 대한 LLM 응답 캐시만 사용)
+        if embedding is not None and not bypass_cache:
+            cached_answer = answer_cache.get(embedding, context_ids, index_version)
+            if cached_answer is not None:
+                return jsonify({"success": True, "message": cached_answer, "cached": True})
+
+        # 3. user 메시지 생성
         user_message = (
             f"스토리/설정 관련 질문:\n\n"
             f"{question}\n\n"
@@ -57,18 +120,38 @@ def scenario_chat():
             f"사용자의 질문 혹은 요청사항에 대해 상세하게 답변해줘."
         )
 
-        # 3. ChatService 호출: 시나리오 디자이너 모드
+        # 4. ChatService 호출: 시나리오 디자이너 모드
         gpt_response = chat_service.create_chat_completion(
             messages=[{"role": "user", "content": user_message}],
-            designer_type="시나리오 디자이너"
+            designer_type="시나리오 디자이너",
+            bypass_cache=bypass_cache
         )
 
-        # 4. 처리 결과 반환
+        # 5. 처리 결과 반환 (성공한 답변만 캐시)
         if gpt_response["success"]:
+            if embedding is not None:
+                answer_cache.put(question, embedding, context_ids, gpt_response["message"], index_version)
             return jsonify({"success": True, "message": gpt_response["message"]})
         else:
             return jsonify({"success": False, "error": gpt_response.get("error", "알 수 없는 오류")}), 500
 
     except Exception as e:
         print(f"[ERROR in scenario_chat]: {str(e)}")
-        return jsonify({"success": False, "error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@bp.route('/chat/cache', methods=['GET'])
+def get_answer_cache_stats():
+    """시나리오 답변 캐시 적중/실패 통계"""
+    return jsonify({"success": True, "stats": answer_cache.stats()})
+
+@bp.route('/ready', methods=['GET'])
+def readiness():
+    """
+    readiness probe: 벡터 색인 warm-up과 키워드/고유명사 검색 색인 생성이 끝난 워커만 200, 아니면 503
+    색인 크기, 로드/warm-up 시간, 오류 포함 (warm-up이 시작되지 않았으면 여기서 시작)
+    """
+    start_background_warm_up()
+    status = vector_service.status()
+    status["search_index"] = retriever.status()
+    ready = status["ready"] and status["search_index"]["ready"] and status["search_index"]["error"] is None
+    return jsonify({"success": ready, "status": status}), 200 if ready else 503
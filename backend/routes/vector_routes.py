@@ -1,18 +1,99 @@
+import hmac
+import os
+
 from flask import Blueprint, request, jsonify
 from services.vector_service import vector_service
 
 bp = Blueprint('vector', __name__)
 
+MAX_BULK_DOCUMENTS = 1000  # /add 한 번에 받을 수 있는 문서 수
+MAX_BULK_QUERIES = 500  # /query(POST) 한 번에 받을 수 있는 질의 수
+MAX_TOP_K = 50
+EMBED_BATCH_SIZE = 256  # 문서 임베딩 요청당 입력 수
+QUERY_INCLUDE_FIELDS = ("documents", "metadatas", "distances")
+# 문서 추가(쓰기) API용 관리자 토큰 - 설정하지 않으면 쓰기 API 비활성화 (기본값)
+# 요청 헤더: Authorization: Bearer <토큰>
+VECTOR_ADMIN_TOKEN = os.getenv('VECTOR_ADMIN_TOKEN') or None
+
+def _bad_request(message):
+    return jsonify({"error": message}), 400
+
+def _check_admin():
+    """쓰기 API 권한 확인 (통과하면 None, 아니면 오류 응답)"""
+    if VECTOR_ADMIN_TOKEN is None:
+        return jsonify({"error": "Vector write API is disabled (set VECTOR_ADMIN_TOKEN to enable)"}), 403
+    auth = request.headers.get("Authorization", "")
+    token = auth[len("Bearer "):] if auth.startswith("Bearer ") else ""
+    if not hmac.compare_digest(token.encode(), VECTOR_ADMIN_TOKEN.encode()):
+        return jsonify({"error": "Invalid admin token"}), 401
+    return None
+
 @bp.route('/add', methods=['POST'])
 def add_document():
-    """문서 추가 API : {doc_id, content, metadata} JSON Payload 필요"""
-    data = request.get_json()
-    doc_id = data.get("doc_id")
-    content = data.get("content")
-    metadata = data.get("metadata", {})
+    """
+    문서 추가 API (VECTOR_ADMIN_TOKEN 필요)
+      - 단일: {doc_id, content, metadata}, 이미 있는 id이면 409
+      - 여러 개: {documents: [{id, content, metadata}, ...], upsert: false}
+        임베딩은 EMBED_BATCH_SIZE개씩 나눠 요청 (임베딩 캐시에 있는 문서는 요청하지 않음)
+        upsert=false이면 이미 있는 id는 추가하지 않고 skipped_ids로 반환 (임베딩도 요청하지 않음)
+        upsert=true이면 같은 id의 기존 문서를 교체
+    """
+    denied = _check_admin()
+    if denied is not None:
+        return denied
+
+    data = request.get_json() or {}
+    if "documents" not in data:
+        doc_id = data.get("doc_id")
+        content = data.get("content")
+        metadata = data.get("metadata", {})
+        if not doc_id or not isinstance(content, str) or not content:
+            return _bad_request("doc_id and content are required")
+        try:
+            if vector_service.get_documents([str(doc_id)])["ids"]:
+                return jsonify({"error": f"Document {doc_id} already exists"}), 409
+            if not vector_service.add_document(str(doc_id), content, metadata):
+                return jsonify({"error": f"Failed to add document {doc_id}"}), 500
+            return jsonify({"message": "Document added successfully"}), 201
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+
+    documents = data["documents"]
+    if not isinstance(documents, list) or not documents:
+        return _bad_request("documents must be a non-empty list")
+    if len(documents) > MAX_BULK_DOCUMENTS:
+        return _bad_request(f"at most {MAX_BULK_DOCUMENTS} documents per request")
+    invalid = [
+        i for i, doc in enumerate(documents)
+        if not isinstance(doc, dict) or not doc.get("id") or not isinstance(doc.get("content"), str) or not doc["content"]
+    ]
+    if invalid:
+        return _bad_request(f"documents need id and content (invalid indices: {invalid[:20]})")
+    ids = [str(doc["id"]) for doc in documents]
+    if len(set(ids)) != len(ids):
+        return _bad_request("duplicate ids in documents")
+
     try:
-        vector_service.add_document(doc_id, content, metadata)
-        return jsonify({"message": "Document added successfully"}), 201
+        skipped_ids = []
+        if not data.get("upsert"):
+            # Chroma의 add는 이미 있는 id를 오류 없이 건너뛰므로 미리 확인해서 실제 추가한 수를 반환
+            existing = set(vector_service.get_documents(ids)["ids"])
+            skipped_ids = [doc_id for doc_id in ids if doc_id in existing]
+            documents = [doc for doc, doc_id in zip(documents, ids) if doc_id not in existing]
+            ids = [doc_id for doc_id in ids if doc_id not in existing]
+        if ids:
+            contents = [doc["content"] for doc in documents]
+            metadatas = [doc.get("metadata") or {} for doc in documents]
+            embeddings = vector_service.embed_many(contents, batch_size=EMBED_BATCH_SIZE)
+            if data.get("upsert"):
+                vector_service.upsert_documents(documents=contents, metadatas=metadatas, ids=ids, embeddings=embeddings)
+            else:
+                vector_service.add_documents(documents=contents, metadatas=metadatas, ids=ids, embeddings=embeddings)
+        return jsonify({
+            "message": f"{len(ids)} documents added successfully",
+            "count": len(ids),
+            "skipped_ids": skipped_ids
+        }), 201 if ids else 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -25,4 +106,40 @@ def query_documents():
         results = vector_service.query(query, top_k)
         return jsonify({"results": results})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+@bp.route('/query', methods=['POST'])
+def query_documents_bulk():
+    """
+    여러 질의 일괄 검색 API : {queries: [...], top_k: 5, include: ["documents", "metadatas", "distances"]}
+    질의 임베딩은 요청 한 번, 유사도 검색도 한 번에 실행
+    include로 필요한 항목만 선택 (ids는 항상 포함)
+    응답: {"results": [{"query", "ids", "documents"?, "metadatas"?, "distances"?}, ...]} (질의 순서 유지)
+    """
+    data = request.get_json() or {}
+    queries = data.get("queries")
+    if not isinstance(queries, list) or not queries or not all(isinstance(query, str) and query.strip() for query in queries):
+        return _bad_request("queries must be a non-empty list of strings")
+    if len(queries) > MAX_BULK_QUERIES:
+        return _bad_request(f"at most {MAX_BULK_QUERIES} queries per request")
+    try:
+        top_k = int(data.get("top_k", 5))
+    except (TypeError, ValueError):
+        return _bad_request("top_k must be an integer")
+    if not 1 <= top_k <= MAX_TOP_K:
+        return _bad_request(f"top_k must be between 1 and {MAX_TOP_K}")
+    include = data.get("include", list(QUERY_INCLUDE_FIELDS))
+    if not isinstance(include, list) or any(field not in QUERY_INCLUDE_FIELDS for field in include):
+        return _bad_request(f"include must be a list of {', '.join(QUERY_INCLUDE_FIELDS)}")
+
+    try:
+        # 같은 질의가 여러 번 있으면 한 번만 임베딩/검색
+        unique_queries = list(dict.fromkeys(queries))
+        found = vector_service.query_many(unique_queries, top_k=top_k, include=include)
+        by_query = {
+            query: {field: found[field][i] for field in ["ids"] + include}
+            for i, query in enumerate(unique_queries)
+        }
+        return jsonify({"results": [dict(by_query[query], query=query) for query in queries]})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
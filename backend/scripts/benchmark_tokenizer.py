@@ -0,0 +1,61 @@
+# scripts/benchmark_tokenizer.py
+
+"""
+워드클라우드 토큰화 처리량 벤치마크
+  - backend/data의 시나리오 문서를 리뷰 길이로 잘라 긍정/부정 리뷰 샘플을 만든 뒤
+  - 순차 처리(max_workers=0)와 프로세스 풀(TokenizationEngine)의 초당 처리 리뷰 수를 비교
+
+사용법: python scripts/benchmark_tokenizer.py [리뷰 수] [워커 수]
+"""
+
+import glob
+import json
+import os
+import sys
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.append(backend_dir)
+
+from services.tokenizer import TokenizationEngine
+
+
+def load_sample_reviews(count, max_length=300):
+    """data 폴더 문서를 max_length 단위로 잘라 count개의 리뷰 텍스트 생성"""
+    texts = []
+    for file_path in sorted(glob.glob(os.path.join(backend_dir, "data", "*.json"))):
+        with open(file_path, "r", encoding="utf-8") as f:
+            for doc in json.load(f):
+                content = doc.get("content", "")
+                texts.extend(content[i:i + max_length] for i in range(0, len(content), max_length))
+    if not texts:
+        raise RuntimeError("샘플 문서를 찾을 수 없습니다.")
+    return [texts[i % len(texts)] for i in range(count)]
+
+
+def run(engine, texts):
+    """긍정/부정 절반씩 한 번에 토큰화하고 (소요 시간, 토큰 수) 반환"""
+    half = len(texts) // 2
+    start = time.perf_counter()
+    pos_counter, neg_counter = engine.count(texts[:half], texts[half:])
+    elapsed = time.perf_counter() - start
+    return elapsed, sum(pos_counter.values()) + sum(neg_counter.values())
+
+
+def main():
+    review_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else max(1, (os.cpu_count() or 2) - 1)
+    texts = load_sample_reviews(review_count)
+
+    for label, engine in (("sequential", TokenizationEngine(max_workers=0)),
+                          (f"pool x{workers}", TokenizationEngine(max_workers=workers))):
+        engine.warm_up()  # JVM 시작 시간은 측정에서 제외
+        elapsed, tokens = run(engine, texts)
+        print(f"{label:>12}: {review_count} reviews in {elapsed:.2f}s "
+              f"({review_count / elapsed:,.0f} reviews/s, {tokens:,} tokens)")
+        engine.shutdown()
+
+
+if __name__ == '__main__':
+    main()
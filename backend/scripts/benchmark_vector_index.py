@@ -0,0 +1,107 @@
+# scripts/benchmark_vector_index.py
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import logging
+import tempfile
+
+import numpy as np
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# backend 폴더를 Python 경로에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.append(backend_dir)
+
+from services.numpy_vector_store import NumpyVectorStore
+
+def synthetic_embeddings(count, dimension, clusters, seed=0):
+    """임베딩과 비슷하게 군집을 이루는 정규화된 벡터 (군집 중심 + 잡음)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dimension)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, count)] + 0.6 * rng.normal(size=(count, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def load_store_embeddings(path):
+    """기존 numpy 백엔드 색인 폴더(index.json)의 float32 행렬 읽기"""
+    with open(os.path.join(path, "index.json"), "r", encoding="utf-8") as f:
+        index = json.load(f)
+    return np.fromfile(os.path.join(path, index["vectors_file"]), dtype=np.float32).reshape(-1, index["dimension"])
+
+def make_queries(vectors, count, seed=1):
+    """색인 벡터에 잡음을 더한 질의 (비슷한 질문이 들어오는 상황)"""
+    rng = np.random.default_rng(seed)
+    queries = vectors[rng.integers(0, len(vectors), count)]
+    queries = queries + 0.5 * rng.normal(size=queries.shape).astype(np.float32) / np.sqrt(vectors.shape[1])
+    return (queries / np.linalg.norm(queries, axis=1, keepdims=True)).astype(np.float32)
+
+def benchmark(vectors, queries, top_k, quantization, rerank_factor, exact):
+    """(색인 생성 시간, 검색 구조 메모리 바이트, 질의 지연 배열(ms), recall@k)"""
+    work_dir = tempfile.mkdtemp(prefix="vector_bench_")
+    try:
+        store = NumpyVectorStore(work_dir, quantization=quantization, rerank_factor=rerank_factor)
+        ids = [str(i) for i in range(len(vectors))]
+        start = time.perf_counter()
+        store.upsert(documents=ids, ids=ids, embeddings=vectors)
+        build_seconds = time.perf_counter() - start
+
+        store.search(queries[0], top_k)  # 첫 질의의 파일 매핑/페이지 로드 제외
+        latencies, hits = [], 0
+        for query, expected in zip(queries, exact):
+            start = time.perf_counter()
+            top, _ = store.search(query, top_k)
+            latencies.append((time.perf_counter() - start) * 1000)
+            hits += len(np.intersect1d(top, expected))
+
+        quantizer = store._quantizer
+        # 양자화 모드는 코드 전체 + 재채점 후보 행만 읽으므로 코드 크기를 검색 구조 메모리로 봄
+        scan_bytes = quantizer.nbytes if quantizer is not None else store._matrix.nbytes
+        return build_seconds, scan_bytes, np.array(latencies), hits / (len(queries) * top_k)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="NumpyVectorStore float32 / int8 / pq 색인의 recall, 지연, 메모리 비교")
+    parser.add_argument("--count", type=int, default=20_000, help="합성 벡터 수")
+    parser.add_argument("--dimension", type=int, default=1536, help="합성 벡터 차원 (ada-002: 1536)")
+    parser.add_argument("--clusters", type=int, default=200, help="합성 벡터 군집 수")
+    parser.add_argument("--store", help="합성 벡터 대신 사용할 numpy 백엔드 색인 폴더 (예: vector_store/numpy/my_collection)")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--rerank-factors", default="1,4,10", help="양자화 모드에서 시험할 재채점 후보 배수 (쉼표 구분)")
+    args = parser.parse_args()
+
+    if args.store:
+        vectors = load_store_embeddings(args.store)
+    else:
+        vectors = synthetic_embeddings(args.count, args.dimension, args.clusters)
+    queries = make_queries(vectors, args.queries)
+    logging.info(f"벡터 {vectors.shape[0]}개 x {vectors.shape[1]}차원, 질의 {len(queries)}개, top_k={args.top_k}")
+
+    # 정답: 전체 float32 행렬 정확 검색
+    similarities = queries @ vectors.T
+    exact = np.argpartition(-similarities, args.top_k, axis=1)[:, :args.top_k]
+
+    rows = [("float32", None, 1)]
+    for quantization in ("int8", "pq"):
+        rows.extend((quantization, quantization, int(factor)) for factor in args.rerank_factors.split(","))
+
+    print(f"\n{'mode':<8} {'rerank':>6} {'recall@k':>9} {'p50 ms':>8} {'p95 ms':>8} {'scan MB':>9} {'build s':>8}")
+    for label, quantization, factor in rows:
+        build_seconds, scan_bytes, latencies, recall = benchmark(
+            vectors, queries, args.top_k, quantization, factor, exact
+        )
+        print(
+            f"{label:<8} {('-' if quantization is None else f'x{factor}'):>6} {recall:>9.4f} "
+            f"{np.percentile(latencies, 50):>8.3f} {np.percentile(latencies, 95):>8.3f} "
+            f"{scan_bytes / 2**20:>9.2f} {build_seconds:>8.2f}"
+        )
+
+if __name__ == '__main__':
+    main()
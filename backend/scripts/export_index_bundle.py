@@ -0,0 +1,47 @@
+# scripts/export_index_bundle.py
+
+from dotenv import load_dotenv
+load_dotenv()  # .env 파일 로드
+
+import os
+import sys
+import time
+import argparse
+import logging
+
+# 로깅 설정
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# backend 폴더를 Python 경로에 추가
+current_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.abspath(os.path.join(current_dir, ".."))
+sys.path.append(backend_dir)
+
+from services.index_bundle import export_bundle, BundleVectorStore
+from services.vector_service import vector_service, EMBEDDING_MODEL, BUNDLE_PATH
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="현재 벡터 색인(VECTOR_BACKEND)을 서버리스 배포용 읽기 전용 번들 파일로 내보내기"
+    )
+    parser.add_argument("--output", default=str(BUNDLE_PATH), help="번들 파일 경로 (VECTOR_BUNDLE_PATH와 같게)")
+    args = parser.parse_args()
+
+    if vector_service.backend == "bundle":
+        logging.error("번들 백엔드에서는 내보낼 수 없습니다. VECTOR_BACKEND=chroma 또는 numpy로 실행하세요.")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    header = export_bundle(vector_service.collection, args.output, model_name=EMBEDDING_MODEL)
+    logging.info(
+        f"번들 저장 완료: {args.output} ({os.path.getsize(args.output) / 2**20:.2f} MB, "
+        f"문서 {header['count']}개, {header['dimension']}차원, {time.perf_counter() - start:.2f}초)"
+    )
+
+    # 배포 전에 체크섬/형식 확인 겸 다시 열어보기
+    start = time.perf_counter()
+    bundle = BundleVectorStore(args.output, verify=True)
+    logging.info(f"번들 검증 완료: version {bundle.version[:12]}, 열기 {(time.perf_counter() - start) * 1000:.1f}ms")
+
+if __name__ == '__main__':
+    main()
@@ -9,12 +9,29 @@ import json
 import sys
 import shutil
 import time
+import random
+import argparse
+import hashlib
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
 from tqdm import tqdm
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# 임베딩 요청 설정 (OpenAI 임베딩 API 한도: 요청당 입력 2048개, 약 300k 토큰)
+EMBED_BATCH_SIZE = 512
+EMBED_BATCH_TOKENS = 200_000
+EMBED_CONCURRENCY = 4  # 동시에 보낼 임베딩 요청 수
+PARSE_WORKERS = 8  # JSON 파일 병렬 파싱 스레드 수
+MAX_RETRIES = 5
+RETRY_BASE_DELAY = 1.0  # 초 (재시도마다 2배)
+# 다시 보내면 성공할 수 있는 오류만 재시도 (rate limit, 시간 초과, 연결 오류, 5xx)
+# 400(잘못된 요청)/401(인증) 등은 몇 번을 보내도 같으므로 바로 실패 처리
+RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError, ConnectionError, TimeoutError)
+MANIFEST_FILE = "index_manifest.json"  # 벡터 색인 폴더 안에 저장 (doc_id -> 내용 해시, 출처 파일)
+
 # backend 폴더를 Python 경로에 추가
 current_dir = os.path.dirname(os.path.abspath(__file__))
 backend_dir = os.path.abspath(os.path.join(current_dir, ".."))
@@ -49,77 +66,250 @@ def clean_chroma_directory(clean: bool = False):
 
     logging.info("새로운 ChromaDB 데이터베이스를 생성합니다 (또는 기존에 추가).")
 
-def index_documents(data_directory, clean_data: bool = False):
-    """JSON 파일들을 읽어서 ChromaDB에 인덱싱"""
-    # 선택적으로 기존 데이터 정리
-    clean_chroma_directory(clean=clean_data)
-    
+def prepare_document(doc, source_file):
+    """
+    JSON 문서 하나를 (doc_id, content, metadata)로 변환 (id 또는 content가 없으면 None)
+    keywords 리스트는 문자열로 바꾸고, 검색 힌트로 본문 상단에도 추가
+    """
+    doc_id = doc.get("id")
+    content = doc.get("content")
+    metadata = dict(doc.get("metadata", {}))
+
+    # 유효성 검사: id와 content가 반드시 있어야 함
+    if not doc_id or not content:
+        return None
+
+    # keywords 리스트 -> 문자열 변환
+    if "keywords" in metadata and isinstance(metadata["keywords"], list):
+        keywords_str = ", ".join(str(keyword) for keyword in metadata["keywords"])
+        metadata["keywords"] = keywords_str
+    else:
+        keywords_str = metadata.get("keywords", "")
+
+    # 파일 출처 정보 추가
+    metadata["source_file"] = source_file
+
+    # 문서 상단에 키워드를 추가 (검색 힌트)
+    if keywords_str:
+        content = f"### 키워드: {keywords_str}\n\n" + content
+
+    return doc_id, content, metadata
+
+def load_file(file_path):
+    """JSON 파일 하나를 읽어 (준비된 문서 리스트, 전체 문서 수) 반환 (병렬 파싱용)"""
+    with open(file_path, "r", encoding="utf-8") as f:
+        docs = json.load(f)
+    source_file = os.path.basename(file_path)
+    prepared = []
+    for doc in docs:
+        item = prepare_document(doc, source_file)
+        if item is None:
+            logging.warning(f"문서 건너뛰기 - id 또는 content 누락 (파일: {source_file})")
+            continue
+        prepared.append(item)
+    return prepared, len(docs)
+
+def iter_batches(docs):
+    """
+    임베딩 요청 한도에 맞춰 문서를 묶음으로 나눔
+      - 요청당 입력 수 EMBED_BATCH_SIZE 이하
+      - 요청당 토큰 수 EMBED_BATCH_TOKENS 이하 (문자 수를 토큰 수 상한으로 사용)
+    """
+    batch, batch_tokens = [], 0
+    for doc in docs:
+        tokens = len(doc[1])
+        if batch and (len(batch) >= EMBED_BATCH_SIZE or batch_tokens + tokens > EMBED_BATCH_TOKENS):
+            yield batch
+            batch, batch_tokens = [], 0
+        batch.append(doc)
+        batch_tokens += tokens
+    if batch:
+        yield batch
+
+def embed_with_retry(texts):
+    """임베딩 API 호출 (RETRYABLE_ERRORS일 때만 지수 백오프 + 지터로 재시도)"""
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            return vector_service.embed_many(texts)
+        except RETRYABLE_ERRORS as e:
+            if attempt == MAX_RETRIES:
+                raise
+            delay = RETRY_BASE_DELAY * (2 ** attempt) * (1 + random.random())
+            logging.warning(f"임베딩 요청 실패 ({len(texts)}개, {attempt + 1}회): {e} - {delay:.1f}초 후 재시도")
+            time.sleep(delay)
+
+def load_documents(data_directory):
+    """
+    data_directory의 JSON 파일들을 스레드 풀에서 병렬로 파싱
+    ({doc_id: (doc_id, content, metadata)}, 파일 수, 전체 문서 수) 반환
+    파싱은 병렬이지만 결과는 파일 경로 순서로 합치므로 중복 id는 항상 경로상 마지막 파일의 문서를 사용
+    """
     pattern = os.path.join(data_directory, "**", "*.json")
-    json_files = glob.glob(pattern, recursive=True)
-    
-    if not json_files:
-        logging.warning(f"{data_directory} 폴더 내에서 JSON 파일을 찾을 수 없습니다.")
-        return
-    
-    logging.info(f"{len(json_files)} 개의 JSON 파일을 찾았습니다. 인덱싱을 시작합니다...")
-    
+    json_files = sorted(glob.glob(pattern, recursive=True))
+    loaded = {}
+
+    with ThreadPoolExecutor(max_workers=PARSE_WORKERS) as pool:
+        futures = {pool.submit(load_file, file_path): file_path for file_path in json_files}
+        for future in tqdm(as_completed(futures), total=len(futures), desc="파일 처리 중"):
+            file_path = futures[future]
+            try:
+                loaded[file_path] = future.result()
+            except Exception as e:
+                logging.error(f"\n파일을 불러올 수 없습니다. {file_path}: {e}")
+
     total_docs = 0
-    success_docs = 0
-    
-    for file_path in tqdm(json_files, desc="파일 처리 중"):
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                docs = json.load(f)
-        except Exception as e:
-            logging.error(f"\n파일을 불러올 수 없습니다. {file_path}: {e}")
+    docs_by_id = {}
+    for file_path in json_files:
+        if file_path not in loaded:
             continue
-        
-        total_docs += len(docs)
-        
-        for doc in tqdm(docs, desc=f"{os.path.basename(file_path)} 문서 처리 중", leave=False):
+        prepared, count = loaded[file_path]
+        total_docs += count
+        for doc in prepared:
+            if doc[0] in docs_by_id:
+                logging.warning(f"중복 문서 id - 마지막 문서를 사용합니다 (ID: {doc[0]}, 파일: {doc[2]['source_file']})")
+            docs_by_id[doc[0]] = doc
+    return docs_by_id, len(json_files), total_docs
+
+def document_hash(doc):
+    """인덱싱될 본문과 메타데이터 전체의 해시 (둘 중 하나라도 바뀌면 다시 임베딩)"""
+    _, content, metadata = doc
+    raw = json.dumps([content, metadata], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def manifest_path():
+    # 백엔드(chroma/numpy)마다 저장 위치가 다르므로 manifest도 따로 관리
+    return os.path.join(vector_service.store_path, MANIFEST_FILE)
+
+def load_manifest():
+    """{doc_id: {"hash": ..., "source_file": ...}} (없으면 None)"""
+    try:
+        with open(manifest_path(), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def save_manifest(manifest):
+    """중간에 중단되어도 깨진 파일이 남지 않도록 임시 파일에 쓴 뒤 교체"""
+    path = manifest_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+def embed_and_upsert(docs):
+    """
+    문서를 임베딩 요청 한도 단위로 묶어 최대 EMBED_CONCURRENCY개 요청을 동시에 실행하고,
+    임베딩이 끝난 묶음부터 ChromaDB에 upsert (성공한 doc_id 집합 반환)
+    """
+    batches = list(iter_batches(sorted(docs, key=lambda doc: doc[0])))
+    logging.info(f"{len(docs)}개 문서를 {len(batches)}개 임베딩 요청으로 처리합니다 (동시 {EMBED_CONCURRENCY}개)")
+    succeeded = set()
+
+    with ThreadPoolExecutor(max_workers=EMBED_CONCURRENCY) as pool:
+        futures = {pool.submit(embed_with_retry, [doc[1] for doc in batch]): batch for batch in batches}
+        for future in tqdm(as_completed(futures), total=len(futures), desc="임베딩/인덱싱 중"):
+            batch = futures[future]
+            ids = [doc[0] for doc in batch]
             try:
-                doc_id = doc.get("id")
-                content = doc.get("content")
-                metadata = doc.get("metadata", {})
-
-                # 유효성 검사: id와 content가 반드시 있어야 함
-                if not doc_id or not content:
-                    logging.warning(f"문서 건너뛰기 - id 또는 content 누락 (파일: {os.path.basename(file_path)})")
-                    continue
-
-                # keywords 리스트 -> 문자열 변환
-                if "keywords" in metadata and isinstance(metadata["keywords"], list):
-                    keywords_str = ", ".join(str(keyword) for keyword in metadata["keywords"])
-                    metadata["keywords"] = keywords_str
-                else:
-                    keywords_str = metadata.get("keywords", "")
-                
-                # 파일 출처 정보 추가
-                metadata["source_file"] = os.path.basename(file_path)
-                
-                # 문서 상단에 키워드를 추가 (검색 힌트)
-                if keywords_str:
-                    content = f"### 키워드: {keywords_str}\n\n" + content
-
-                success = vector_service.add_document(doc_id, content, metadata)
-                if success:
-                    success_docs += 1
-                else:
-                    logging.error(f"문서 인덱싱 실패 (ID: {doc_id})")
-                    
+                embeddings = future.result()
+                vector_service.upsert_documents(
+                    documents=[doc[1] for doc in batch],
+                    metadatas=[doc[2] for doc in batch],
+                    ids=ids,
+                    embeddings=embeddings
+                )
+                succeeded.update(ids)
             except Exception as e:
-                logging.error(f"문서 인덱싱 중 오류 발생 (ID: {doc.get('id', 'unknown')}): {e}")
-    
-    logging.info(f"인덱싱 완료: 총 {total_docs}개 중 {success_docs}개 성공")
+                logging.error(f"문서 인덱싱 실패 ({len(ids)}개, ID: {ids[0]} ~ {ids[-1]}): {e}")
+    return succeeded
+
+def index_documents(data_directory, clean_data: bool = False, incremental: bool = True):
+    """
+    JSON 파일들을 읽어서 ChromaDB에 인덱싱
+      1. 파일 파싱을 스레드 풀에서 병렬 처리
+      2. manifest(doc_id -> 내용 해시, 출처 파일)와 비교해 추가/변경/삭제/유지 문서를 구분
+         - incremental=True: 추가/변경된 문서만 임베딩, incremental=False: 모든 문서를 다시 임베딩
+         - 원본에서 사라진 문서(JSON 파일 삭제, chunk 감소)는 컬렉션에서 삭제
+      3. 임베딩은 요청 한도 단위 묶음으로 동시에 실행하고 끝난 묶음부터 upsert
+    변경 내역(report dict)을 반환
+    """
+    # 선택적으로 기존 데이터 정리
+    clean_chroma_directory(clean=clean_data)
+
+    docs_by_id, file_count, total_docs = load_documents(data_directory)
+    if not file_count:
+        logging.warning(f"{data_directory} 폴더 내에서 JSON 파일을 찾을 수 없습니다.")
+        return None
+    logging.info(f"{file_count} 개의 JSON 파일에서 {len(docs_by_id)}개 문서를 읽었습니다.")
+
+    current = {
+        doc_id: {"hash": document_hash(doc), "source_file": doc[2]["source_file"]}
+        for doc_id, doc in docs_by_id.items()
+    }
+    manifest = {} if clean_data else load_manifest()
+    if manifest is None:
+        # manifest 도입 이전에 만든 컬렉션 - 저장된 id를 기준으로 삭제 대상만 판별하고 나머지는 모두 다시 임베딩
+        manifest = {doc_id: {"hash": None, "source_file": None} for doc_id in vector_service.list_ids()}
+        logging.info(f"manifest가 없어 기존 문서 {len(manifest)}개를 변경된 것으로 간주합니다.")
+
+    added = sorted(doc_id for doc_id in current if doc_id not in manifest)
+    updated = sorted(doc_id for doc_id in current if doc_id in manifest and manifest[doc_id]["hash"] != current[doc_id]["hash"])
+    deleted = sorted(doc_id for doc_id in manifest if doc_id not in current)
+    unchanged = [doc_id for doc_id in current if doc_id in manifest and manifest[doc_id]["hash"] == current[doc_id]["hash"]]
+    to_embed = added + updated if incremental else sorted(current)
+
+    if deleted:
+        vector_service.delete_documents(deleted)
+    succeeded = embed_and_upsert([docs_by_id[doc_id] for doc_id in to_embed]) if to_embed else set()
+    failed = sorted(set(to_embed) - succeeded)
+
+    # 실패한 문서는 이전 manifest 항목을 유지하여 다음 실행에서 다시 시도
+    new_manifest = {doc_id: entry for doc_id, entry in manifest.items() if doc_id in current and entry["hash"]}
+    new_manifest.update({doc_id: current[doc_id] for doc_id in unchanged})
+    new_manifest.update({doc_id: current[doc_id] for doc_id in succeeded})
+    save_manifest(new_manifest)
+
+    report = {
+        "files": file_count,
+        "documents": len(current),
+        "added": [doc_id for doc_id in added if doc_id in succeeded],
+        "updated": [doc_id for doc_id in updated if doc_id in succeeded],
+        "deleted": deleted,
+        "unchanged": len(unchanged),
+        "failed": failed,
+    }
+    log_report(report, {**{doc_id: entry["source_file"] for doc_id, entry in manifest.items()},
+                        **{doc_id: entry["source_file"] for doc_id, entry in current.items()}})
+
+    logging.info(f"인덱싱 완료: 총 {total_docs}개 중 {len(succeeded)}개 임베딩, {len(deleted)}개 삭제")
     # 실제 최종 persist_directory 경로 확인
     logging.info(f"Vector DB 저장 위치: {os.environ.get('CHROMA_PERSIST_DIRECTORY')}")
     logging.info("작업을 완료했습니다.")
+    return report
+
+def log_report(report, source_files):
+    """변경 내역을 출처 파일별로 요약해 출력"""
+    logging.info(
+        f"변경 내역 - 추가 {len(report['added'])}, 변경 {len(report['updated'])}, "
+        f"삭제 {len(report['deleted'])}, 유지 {report['unchanged']}, 실패 {len(report['failed'])}"
+    )
+    for label in ("added", "updated", "deleted", "failed"):
+        by_file = {}
+        for doc_id in report[label]:
+            by_file.setdefault(source_files.get(doc_id) or "(unknown)", []).append(doc_id)
+        for source_file, doc_ids in sorted(by_file.items()):
+            logging.info(f"  [{label}] {source_file}: {len(doc_ids)}개")
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="data 폴더의 JSON 문서를 ChromaDB에 인덱싱")
+    parser.add_argument("--clean", action="store_true", help="기존 vector_store를 백업하고 처음부터 인덱싱")
+    parser.add_argument("--full", action="store_true", help="변경 여부와 관계없이 모든 문서를 다시 임베딩")
+    args = parser.parse_args()
+
     current_dir = os.path.dirname(os.path.abspath(__file__))
     data_directory = os.path.join(current_dir, "..", "data")
     data_directory = os.path.abspath(data_directory)
     
     logging.info(f"데이터 폴더 경로: {data_directory}")
-    # clean_data를 False로 설정하여 기존 데이터 유지 (필요 시 True로 변경)
-    index_documents(data_directory, clean_data=False)
\ No newline at end of file
+    # 기본은 변경된 문서만 반영하는 증분 인덱싱
+    index_documents(data_directory, clean_data=args.clean, incremental=not args.full)
@@ -0,0 +1,30 @@
+# services/cache_dir.py
+
+import os
+import tempfile
+from pathlib import Path
+
+# 설정한 캐시 디렉터리에 쓸 수 없을 때(Vercel 등 읽기 전용 파일 시스템) 사용할 위치
+TEMP_CACHE_ROOT = Path(tempfile.gettempdir()) / "game-scenario-manager" / "cache"
+
+
+def resolve_cache_dir(path, name):
+    """
+    캐시 디렉터리를 만들고 쓸 수 있는 경로 반환
+      - path에 쓸 수 없으면 임시 디렉터리 아래 TEMP_CACHE_ROOT/name 사용
+      - 둘 다 쓸 수 없으면 OSError (호출하는 쪽에서 캐시 없이 동작)
+    """
+    error = None
+    for candidate in (Path(path), TEMP_CACHE_ROOT / name):
+        try:
+            candidate.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            error = e
+            continue
+        if not os.access(candidate, os.W_OK):
+            error = PermissionError(f"cache directory is not writable: {candidate}")
+            continue
+        if candidate != Path(path):
+            print(f"[WARNING] {path}에 쓸 수 없어 {candidate}에 캐시를 저장합니다 ({error})")
+        return candidate
+    raise error
@@ -5,12 +5,18 @@ from openai import OpenAI
 
 from config.chat_config import ChatConfig
 from config.openai_config import DesignerConfigs
+from services.llm_cache import llm_cache
 
 class ChatService:
     def __init__(self):
         self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
 
-    def create_chat_completion(self, messages, designer_type="범용", conversation_id=None):
+    def create_chat_completion(self, messages, designer_type="범용", conversation_id=None, bypass_cache=False):
+        """
+        디자이너 역할별 GPT 응답 생성
+        요청 파라미터(모델, 설정, 전체 메시지)가 완전히 같은 최근 호출의 응답은 llm_cache에서 반환
+        bypass_cache=True이면 캐시를 읽지 않고 새로 호출
+        """
         try:
             # 1. 시스템 프롬프트 가져오기
             system_prompt = ChatConfig.get_system_prompt(designer_type)
@@ -21,15 +27,19 @@ class ChatService:
             # 3. messages 준비: system_prompt -> developer 역할, 그 뒤 user/assistant
             full_messages = [{"role": "developer", "content": system_prompt}] + messages
 
-            # 4. API 호출
-            response = self.client.chat.completions.create(
-                model=gpt_config["model"],
-                messages=full_messages,
-                reasoning_effort=gpt_config["reasoning_effort"],
-                max_completion_tokens=gpt_config["max_completion_tokens"]
-            )
+            # 4. API 호출 (같은 요청은 캐시된 응답 사용)
+            params = {
+                "model": gpt_config["model"],
+                "messages": full_messages,
+                "reasoning_effort": gpt_config["reasoning_effort"],
+                "max_completion_tokens": gpt_config["max_completion_tokens"]
+            }
+
+            def create():
+                response = self.client.chat.completions.create(**params)
+                return response.choices[0].message.content
 
-            raw_answer = response.choices[0].message.content
+            raw_answer = llm_cache.get_or_create(params, create, bypass=bypass_cache)
             formatted_answer = self._format_markdown_response(raw_answer)
 
             return {
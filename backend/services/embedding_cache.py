@@ -0,0 +1,180 @@
+# services/embedding_cache.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+from contextlib import closing
+from pathlib import Path
+
+import numpy as np
+from openai import OpenAI
+
+# 프로젝트 루트 디렉토리 찾기
+root_dir = Path(__file__).resolve().parent.parent
+
+EMBEDDING_CACHE_DIR = root_dir / "cache" / "embeddings"
+
+
+class EmbeddingCache:
+    """
+    텍스트 임베딩 디스크 캐시 (모델별 디렉토리)
+      - vectors.f32: 임베딩을 행 단위로 이어 붙인 float32 행렬 (읽기는 memory-map)
+      - index.sqlite3: 텍스트 SHA-256 -> 행 번호, 차원 수
+    행렬 파일에 추가하는 동안 SQLite 쓰기 트랜잭션을 잡아 두므로
+    인덱싱 스크립트와 서버가 같은 캐시를 동시에 사용해도 행 번호가 겹치지 않음
+    임베딩 API 없이도 읽을 수 있어 저장된 텍스트는 오프라인에서도 임베딩 가능
+    """
+
+    def __init__(self, cache_dir, model_name):
+        self.model_name = model_name
+        self.cache_dir = Path(cache_dir) / model_name.replace("/", "_")
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.cache_dir / "index.sqlite3"
+        self.vectors_path = self.cache_dir / "vectors.f32"
+        self.vectors_path.touch(exist_ok=True)
+        self._matrix = None
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0}
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def _init_db(self):
+        with closing(self._connect()) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)')
+            conn.execute('CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, row INTEGER NOT NULL)')
+
+    @staticmethod
+    def make_key(text):
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def _dimension(self, conn):
+        row = conn.execute("SELECT value FROM meta WHERE name = 'dimension'").fetchone()
+        return int(row[0]) if row else None
+
+    def _rows(self, dimension, rows):
+        """행 번호 배열 -> (len(rows), dimension) 행렬 (파일이 커졌으면 다시 매핑)"""
+        needed = int(rows.max()) + 1
+        with self._lock:
+            if self._matrix is None or len(self._matrix) < needed:
+                # 다른 프로세스가 쓰는 중인 불완전한 마지막 행은 제외
+                row_count = os.path.getsize(self.vectors_path) // (dimension * 4)
+                self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode='r', shape=(row_count, dimension))
+            return np.array(self._matrix[rows])
+
+    def get_many(self, texts):
+        """텍스트 리스트 -> 임베딩 리스트 (캐시에 없는 항목은 None)"""
+        keys = [self.make_key(text) for text in texts]
+        found = {}
+        with closing(self._connect()) as conn:
+            dimension = self._dimension(conn)
+            unique_keys = list(dict.fromkeys(keys))
+            for start in range(0, len(unique_keys), 500):
+                chunk = unique_keys[start:start + 500]
+                found.update(conn.execute(
+                    f"SELECT key, row FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall())
+
+        results = [None] * len(texts)
+        if found:
+            hit_keys = list(found)
+            matrix = self._rows(dimension, np.array([found[key] for key in hit_keys], dtype=np.int64))
+            vectors = dict(zip(hit_keys, matrix))
+            results = [vectors.get(key) for key in keys]
+
+        hits = sum(vector is not None for vector in results)
+        with self._lock:
+            self._stats['hits'] += hits
+            self._stats['misses'] += len(texts) - hits
+        return results
+
+    def put_many(self, texts, embeddings):
+        """임베딩 저장 (이미 저장된 텍스트는 건너뜀)"""
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if not len(texts):
+            return
+        with closing(self._connect()) as conn:
+            # 다른 프로세스의 추가와 행 번호가 겹치지 않도록 파일 추가까지 쓰기 잠금 유지
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                dimension = self._dimension(conn)
+                if dimension is None:
+                    dimension = matrix.shape[1]
+                    conn.execute("INSERT INTO meta (name, value) VALUES ('dimension', ?)", (str(dimension),))
+                elif dimension != matrix.shape[1]:
+                    raise ValueError(f"임베딩 차원 불일치: 캐시 {dimension}, 입력 {matrix.shape[1]}")
+
+                new = {}
+                for text, vector in zip(texts, matrix):
+                    key = self.make_key(text)
+                    if key not in new and conn.execute('SELECT 1 FROM embeddings WHERE key = ?', (key,)).fetchone() is None:
+                        new[key] = vector
+                if new:
+                    with open(self.vectors_path, 'r+b') as f:
+                        # 이전에 중단된 쓰기가 남긴 불완전한 행은 덮어씀
+                        next_row = os.fstat(f.fileno()).st_size // (dimension * 4)
+                        f.seek(next_row * dimension * 4)
+                        f.write(np.stack(list(new.values())).tobytes())
+                        f.flush()
+                        os.fsync(f.fileno())
+                    conn.executemany(
+                        'INSERT INTO embeddings (key, row) VALUES (?, ?)',
+                        [(key, next_row + i) for i, key in enumerate(new)]
+                    )
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        with closing(self._connect()) as conn:
+            stats['entries'] = conn.execute('SELECT COUNT(*) FROM embeddings').fetchone()[0]
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else 0
+        return stats
+
+
+class OpenAIEmbeddingFunction:
+    """
+    OpenAI 임베딩 API 호출 함수 (chromadb 없이 numpy/bundle 백엔드에서도 사용)
+    ChromaDB 임베딩 함수 규약(__call__(input) -> 벡터 리스트)을 따르므로 Chroma 컬렉션에도 그대로 등록 가능
+    chromadb의 OpenAIEmbeddingFunction과 같게 줄바꿈을 공백으로 바꿔 요청 (기존 색인/캐시와 같은 벡터)
+    """
+
+    def __init__(self, api_key, model_name):
+        self.client = OpenAI(api_key=api_key)
+        self.model_name = model_name
+
+    def __call__(self, input):
+        texts = [text.replace("\n", " ") for text in input]
+        response = self.client.embeddings.create(input=texts, model=self.model_name)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+
+class CachedEmbeddingFunction:
+    """
+    임베딩 함수 래퍼 (ChromaDB 임베딩 함수 규약): 캐시에 없는 텍스트만 모아 embedding_fn을 한 번 호출하고 저장
+    embedding_fn이 None이면 오프라인 모드 (캐시에 없는 텍스트가 있으면 예외)
+    """
+
+    def __init__(self, embedding_fn, cache):
+        self.embedding_fn = embedding_fn
+        self.cache = cache
+
+    def __call__(self, input):
+        texts = list(input)
+        results = self.cache.get_many(texts)
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, results) if vector is None))
+        if missing:
+            if self.embedding_fn is None:
+                raise RuntimeError(f"오프라인 모드: 캐시에 없는 텍스트 {len(missing)}개를 임베딩할 수 없습니다")
+            embeddings = self.embedding_fn(missing)
+            self.cache.put_many(missing, embeddings)
+            computed = dict(zip(missing, np.asarray(embeddings, dtype=np.float32)))
+            results = [vector if vector is not None else computed[text] for text, vector in zip(texts, results)]
+        return [vector.tolist() for vector in results]
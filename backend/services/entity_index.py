@@ -0,0 +1,172 @@
+# services/entity_index.py
+
+import os
+import re
+from collections import deque
+
+_RESULT_FILE_RE = re.compile(r'^result[ _]\d+$')  # 이름 없는 크롤링 결과 파일
+_WORD_CHAR_RE = re.compile(r'[0-9a-z]')
+
+ALIAS_FILE = "entity_aliases.tsv"  # data 폴더의 한글 별칭 파일 (JSON이 아니므로 벡터 색인에는 포함되지 않음)
+
+
+class AhoCorasick:
+    """여러 문자열 패턴을 텍스트 한 번 순회로 모두 찾는 Aho-Corasick 오토마톤"""
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]  # 상태 -> [(패턴 길이, 값)]
+
+    def add(self, pattern, value):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((len(pattern), value))
+
+    def build(self):
+        """실패 링크 계산 (패턴 추가가 끝난 뒤 한 번 호출)"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+        return self
+
+    def find_all(self, text):
+        """(시작, 끝, 값) 리스트 (겹치는 일치 포함)"""
+        matches = []
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, value in self._output[state]:
+                matches.append((end - length, end, value))
+        return matches
+
+
+def entity_aliases(name):
+    """
+    파일 이름/keywords 하나에서 검색 별칭 목록 생성
+      'Black Tortoise, 玄武' -> 전체, 'black tortoise', '玄武'
+      'Wuun Lionel, the Grand General Story' -> ... 'grand general' (앞의 the, 뒤의 story 제거)
+    """
+    name = _normalize_name(name)
+    aliases = {name}
+    for part in [name] + name.split(','):
+        part = part.strip()
+        part = re.sub(r'^the\s+', '', part)
+        part = re.sub(r'\s+story$', '', part)
+        aliases.add(part)
+    return [alias for alias in aliases if alias and not _RESULT_FILE_RE.match(alias)]
+
+
+def _normalize_name(name):
+    return name.replace('_', ' ').strip().lower()
+
+
+def load_alias_map(path):
+    """
+    별칭 파일 읽기 -> {고유명사 이름(소문자): [별칭, ...]}
+    한 줄에 '이름<TAB>별칭1, 별칭2' (이름은 data 파일 이름 또는 keywords, #으로 시작하는 줄은 주석)
+      Penril\t펜릴
+      Black Tortoise\t현무, 흑거북
+    파일이 없으면 빈 dict
+    """
+    alias_map = {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return alias_map
+    for line_no, line in enumerate(lines, 1):
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        name, sep, aliases = line.partition('\t')
+        if not sep:
+            print(f"[WARNING] 별칭 파일 {path}:{line_no} 형식 오류 (탭 없음): {line}")
+            continue
+        alias_map.setdefault(_normalize_name(name), []).extend(
+            alias.strip() for alias in aliases.split(',') if alias.strip()
+        )
+    return alias_map
+
+
+class EntityIndex:
+    """
+    data 파일 이름과 chunk keywords/aliases, 별칭 파일(한글 이름)로 만든 고유명사 -> 문서 id 색인
+    질문에서 별칭을 찾으면 임베딩 없이 해당 문서 chunk를 바로 가져올 수 있음
+      - 영문 별칭은 단어 경계에서만 일치 (mu가 music에 일치하지 않도록), 3글자 이상
+      - 한글/한자 별칭은 조사가 붙어도 일치, 2글자 이상
+      - 여러 파일(max_files 초과)에 걸친 일반 키워드(story 등)는 제외
+    """
+
+    def __init__(self, max_files=3):
+        self.max_files = max_files
+        self.entities = {}  # 별칭 -> 문서 id 리스트 (chunk 순서)
+        self._matcher = None
+
+    def build(self, documents, alias_map=None):
+        """
+        documents: (doc_id, content, keywords, source_file, chunk_index) 리스트
+        alias_map: load_alias_map() 결과 (파일 이름/keywords에 없는 한글 이름 등 추가 별칭)
+        """
+        alias_map = alias_map or {}
+        files_by_alias, docs_by_alias = {}, {}
+        for doc_id, _, keywords, source_file, chunk_index in documents:
+            names = list(keywords)
+            if source_file:
+                names.append(os.path.splitext(source_file)[0])
+            for name in names:
+                aliases = entity_aliases(name)
+                for alias in list(aliases):
+                    aliases.extend(_normalize_name(extra) for extra in alias_map.get(alias, []))
+                for alias in aliases:
+                    if len(alias) < (3 if alias.isascii() else 2):
+                        continue
+                    files_by_alias.setdefault(alias, set()).add(source_file)
+                    docs_by_alias.setdefault(alias, {})[doc_id] = chunk_index
+
+        self.entities = {}
+        self._matcher = AhoCorasick()
+        for alias, chunks in docs_by_alias.items():
+            if len(files_by_alias[alias]) > self.max_files:
+                continue
+            self.entities[alias] = sorted(chunks, key=lambda doc_id: (chunks[doc_id], doc_id))
+            self._matcher.add(alias, alias)
+        self._matcher.build()
+        return self
+
+    def match(self, text):
+        """질문에 등장하는 별칭 (앞에서부터, 겹치면 가장 긴 것 우선)"""
+        if self._matcher is None:
+            return []
+        text = text.lower()
+        candidates = []
+        for start, end, alias in self._matcher.find_all(text):
+            if alias.isascii() and (
+                (start > 0 and _WORD_CHAR_RE.match(text[start - 1])) or
+                (end < len(text) and _WORD_CHAR_RE.match(text[end]))
+            ):
+                continue
+            candidates.append((start, -end, alias))
+
+        matched, position = [], 0
+        for start, negative_end, alias in sorted(candidates):
+            if start >= position:
+                matched.append(alias)
+                position = -negative_end
+        return matched
@@ -2,6 +2,9 @@ import openai
 import sys
 from pathlib import Path
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 from openai import OpenAI, APIError, BadRequestError
 
 # 프로젝트 루트 디렉토리 찾기
@@ -9,84 +12,231 @@ root_dir = Path(__file__).resolve().parent.parent
 sys.path.append(str(root_dir))
 
 from config.openai_config import ReviewAnalysisConfig
+from services.review_batch import ReviewBatch
+from services.llm_cache import llm_cache
 
 class GPTService:
-    def __init__(self):
+    def __init__(self, max_workers=ReviewAnalysisConfig.MAP_CONCURRENCY):
         ReviewAnalysisConfig.validate()
-        self.client = OpenAI(api_key=ReviewAnalysisConfig.API_KEY)
+        # 클라이언트(HTTP 커넥션 풀)와 호출 스레드 풀은 모든 요청이 공유 (스레드 수 = 동시 GPT 호출 상한)
+        self.client = OpenAI(
+            api_key=ReviewAnalysisConfig.API_KEY,
+            timeout=ReviewAnalysisConfig.REQUEST_TIMEOUT,
+            max_retries=ReviewAnalysisConfig.MAX_RETRIES
+        )
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='gpt')
 
-    def summarize_reviews(self, positive_texts, negative_texts):
-        """리뷰 요약 서비스"""
+    def summarize_reviews(self, positive_texts, negative_texts, bypass_cache=False):
+        """
+        리뷰 요약 서비스 (map-reduce)
+          1. 품질 점수순으로 정렬한 리뷰를 토큰 예산 단위의 묶음으로 나눔
+          2. map: 묶음이 여러 개면 묶음별 핵심 요약을 동시에 생성 (스레드 풀 크기로 동시 호출 수 제한)
+          3. reduce: 묶음 요약(묶음이 하나면 리뷰 원문)을 긍정/부정 분석 프롬프트로 최종 보고서 생성
+        한쪽이 실패하거나 시간 초과되어도 나머지 결과는 반환하고 실패 내용은 errors에 기록
+        같은 묶음/프롬프트의 호출은 llm_cache에서 재사용 (bypass_cache=True이면 새로 호출)
+        """
         try:
-            # 리뷰 선별 및 전처리
-            selected_pos = self._select_quality_reviews(positive_texts)
-            selected_neg = self._select_quality_reviews(negative_texts)
-            
-            # 직접 프롬프트 생성 및 GPT 호출
-            pos_summary = self._analyze_positive_reviews(selected_pos)
-            neg_summary = self._analyze_negative_reviews(selected_neg)
+            # 리뷰 선별 및 토큰 예산 단위 묶음 생성
+            batches = {
+                "positive": self._pack_batches(self._select_quality_reviews(positive_texts, max_reviews=None)),
+                "negative": self._pack_batches(self._select_quality_reviews(negative_texts, max_reviews=None))
+            }
 
-            return {
-                "positive_summary": self._format_summary(pos_summary),
-                "negative_summary": self._format_summary(neg_summary)
+            # map: 묶음별 요약 (긍정/부정 묶음을 모두 한 번에 제출)
+            map_futures = {
+                (side, i): self._submit(self._summarize_batch, side, batch, bypass_cache)
+                for side, side_batches in batches.items() if len(side_batches) > 1
+                for i, batch in enumerate(side_batches)
             }
         except Exception as e:
             print(f"[ERROR] GPT 요약 오류: {str(e)}")
             return {"error": f"GPT Error: {str(e)}"}
 
+        map_results, map_errors = self._wait_all(map_futures)
+
+        # reduce 입력 구성 - 일부 묶음이 실패해도 성공한 묶음 요약으로 진행
+        reduce_inputs, errors = {}, {}
+        for side, side_batches in batches.items():
+            if len(side_batches) <= 1:
+                reduce_inputs[side] = " | ".join(side_batches[0]) if side_batches else ""
+                continue
+            summaries = [map_results[(side, i)] for i in range(len(side_batches)) if (side, i) in map_results]
+            if not summaries:
+                errors[side] = next(message for (key, _), message in map_errors.items() if key == side)
+                continue
+            reduce_inputs[side] = "\n\n".join(
+                f"[리뷰 묶음 {i + 1}/{len(summaries)} 요약]\n{summary}" for i, summary in enumerate(summaries)
+            )
+
+        # reduce: 최종 보고서 (긍정/부정 병렬)
+        analyzers = {"positive": self._analyze_positive_reviews, "negative": self._analyze_negative_reviews}
+        reports, reduce_errors = self._wait_all({
+            side: self._submit(analyzers[side], reviews_block, bypass_cache)
+            for side, reviews_block in reduce_inputs.items()
+        })
+        errors.update(reduce_errors)
+
+        if len(errors) == len(analyzers):
+            return {"error": "; ".join(errors.values())}
+
+        result = {
+            "positive_summary": self._format_summary(reports.get("positive")),
+            "negative_summary": self._format_summary(reports.get("negative")),
+            "coverage": {
+                side: {
+                    "reviews": sum(len(batch) for batch in side_batches),
+                    "batches": len(side_batches),
+                    "failed_batches": sum(1 for key, _ in map_errors if key == side)
+                }
+                for side, side_batches in batches.items()
+            }
+        }
+        if errors:
+            result["errors"] = errors
+        return result
+
+    def _submit(self, fn, *args):
+        """
+        공유 스레드 풀에 fn(*args)를 제출하고 Future 반환
+        Future.started(Event)에 실제로 실행이 시작된 시각(started.at, monotonic)을 기록
+        """
+        started = threading.Event()
+
+        def run():
+            started.at = time.monotonic()
+            started.set()
+            return fn(*args)
+
+        future = self._executor.submit(run)
+        future.started = started
+        return future
+
+    @staticmethod
+    def _wait_all(futures):
+        """
+        {key: Future(_submit)}를 모두 기다려 ({key: 결과}, {key: 오류 메시지}) 반환
+        제한 시간(HTTP timeout x 재시도 포함 시도 횟수)은 작업마다 실행이 시작된 시점부터 계산
+        (다른 요청의 작업 뒤에서 대기 중인 묶음은 시간 초과로 처리하지 않음)
+        실행 중인 호출은 취소할 수 없고 HTTP timeout으로 끝나므로, 시간 초과는 결과를 기다리지 않는 것만 의미
+        """
+        limit = ReviewAnalysisConfig.REQUEST_TIMEOUT * (ReviewAnalysisConfig.MAX_RETRIES + 1)
+        results, errors = {}, {}
+        for key, future in futures.items():
+            try:
+                while not future.started.wait(timeout=1) and not future.done():
+                    pass
+                started_at = getattr(future.started, 'at', time.monotonic())
+                results[key] = future.result(timeout=max(0, started_at + limit - time.monotonic()))
+            except Exception as e:
+                message = str(e) or type(e).__name__
+                print(f"[ERROR] GPT {key} 요약 오류: {message}")
+                errors[key] = f"GPT Error: {message}"
+        return results, errors
+
+    @staticmethod
+    def estimate_tokens(text):
+        """
+        토큰 수 근사치 (tokenizer 의존성 없이 계산)
+        한글 등 비ASCII 문자는 문자당 약 1토큰, ASCII는 4문자당 약 1토큰
+        """
+        non_ascii = sum(1 for ch in text if ord(ch) > 127)
+        return non_ascii + (len(text) - non_ascii + 3) // 4
+
+    @classmethod
+    def _pack_batches(cls, texts):
+        """
+        리뷰 텍스트를 BATCH_TOKEN_BUDGET 이하의 묶음으로 순서대로 나눔
+          - 리뷰 하나는 MAX_REVIEW_TOKENS 근처에서 잘라 한 리뷰가 묶음을 독차지하지 않게 함
+          - MAX_BATCHES를 넘는 리뷰(품질 점수 하위)는 제외하여 토큰 사용량 상한을 고정
+        """
+        budget = ReviewAnalysisConfig.BATCH_TOKEN_BUDGET
+        max_review_tokens = ReviewAnalysisConfig.MAX_REVIEW_TOKENS
+        batches, batch, used = [], [], 0
+        for text in texts:
+            text = text.strip()
+            if not text:
+                continue
+            tokens = cls.estimate_tokens(text)
+            if tokens > max_review_tokens:
+                # 비율로 자른 뒤 한 번 더 계산 (한/영 혼합 텍스트도 예산을 넘지 않도록)
+                text = text[:len(text) * max_review_tokens // tokens]
+                tokens = cls.estimate_tokens(text)
+            if batch and used + tokens > budget:
+                batches.append(batch)
+                if len(batches) == ReviewAnalysisConfig.MAX_BATCHES:
+                    return batches
+                batch, used = [], 0
+            batch.append(text)
+            used += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _summarize_batch(self, side, texts, bypass_cache=False):
+        """map 단계 - 리뷰 묶음 하나의 핵심 포인트 요약"""
+        label = "긍정" if side == "positive" else "부정"
+        developer_msg = (
+            "당신은 게임 리뷰 분석가입니다. "
+            f"주어진 {label} 리뷰 묶음에서 언급된 내용을 빠짐없이 추려, "
+            "이후 여러 묶음의 요약을 합쳐 최종 보고서를 작성할 수 있도록 정리해 주십시오."
+        )
+        prompt = f"""
+다음은 게임의 {label}적인 리뷰 {len(texts)}개입니다. 아래 형식으로 정리해 주세요:
+
+- 언급된 핵심 포인트를 언급 빈도가 높은 순서로 나열해주세요
+- 포인트마다 대략적인 언급 횟수와 대표 인용구 1개를 포함해주세요
+- 인사말이나 결론 없이 목록만 작성해주세요
+
+리뷰 목록:
+{" | ".join(texts)}
+"""
+        return self._get_completion(
+            prompt,
+            developer_msg,
+            reasoning_effort=ReviewAnalysisConfig.MAP_REASONING_EFFORT,
+            max_completion_tokens=ReviewAnalysisConfig.MAP_MAX_COMPLETION_TOKENS,
+            bypass_cache=bypass_cache
+        )
+
     def _select_quality_reviews(self, reviews, max_reviews=20):
-        """품질 기반 리뷰 선별"""
+        """품질 기반 리뷰 선별 (max_reviews가 None이면 전체를 점수순으로 반환)"""
         if not reviews:
             return []
         
-        # 리뷰 품질 점수 계산 및 정렬
-        scored_reviews = []
-        for review in reviews:
-            if not isinstance(review, dict):
-                continue
-            
-            score = 0
-            # 1. 투표 수 (votes_up)
-            score += review.get('votes_up', 0) * 2
-            
-            # 2. 리뷰 길이 (너무 짧거나 긴 것은 제외)
-            text_length = len(review.get('review', ''))
-            if 50 <= text_length <= 1000:
-                score += 1
-            
-            # 3. 플레이 시간
-            playtime = review.get('author', {}).get('playtime_forever', 0)
-            if playtime > 10:  # 10시간 이상 플레이
-                score += 3
-            
-            # 4. 최신성 (최근 3개월 내 리뷰 우대)
-            timestamp = review.get('timestamp_created', 0)
-            if timestamp > time.time() - (90 * 24 * 60 * 60):
-                score += 2
-            
-            scored_reviews.append((score, review))
-        
-        # 점수 기반 정렬 및 선택
-        selected = sorted(scored_reviews, key=lambda x: x[0], reverse=True)
-        
+        # 리뷰 품질 점수를 벡터로 한 번에 계산하고 점수 내림차순(동점은 원래 순서)으로 선택
+        batch = ReviewBatch.from_reviews([review for review in reviews if isinstance(review, dict)])
+        scores = batch.quality_scores()
+        selected = np.argsort(-scores, kind='stable')[:max_reviews]
+
         # 선택된 리뷰의 텍스트만 추출
-        return [r[1]['review'] for r in selected[:max_reviews]]
+        return [batch.texts[i] for i in selected]
 
-    def _get_completion(self, prompt, developer_msg=None):
-        """GPT API 호출 (o3-mini는 system 프롬프트 대신 developer 프롬프트 사용)"""
+    def _get_completion(self, prompt, developer_msg=None,
+                        reasoning_effort=None, max_completion_tokens=None, bypass_cache=False):
+        """
+        GPT API 호출 (o3-mini는 system 프롬프트 대신 developer 프롬프트 사용)
+        제한 시간/재시도는 클라이언트 설정 (ReviewAnalysisConfig.REQUEST_TIMEOUT / MAX_RETRIES)
+        reasoning_effort / max_completion_tokens: 없으면 ReviewAnalysisConfig 값
+        요청 파라미터가 완전히 같은 최근 호출의 응답은 llm_cache에서 반환
+        """
         try:
             messages = []
             if developer_msg:
                 messages.append({"role": "developer", "content": developer_msg})
             messages.append({"role": "user", "content": prompt})
-            
-            response = self.client.chat.completions.create(
-                model=ReviewAnalysisConfig.MODEL,
-                messages=messages,
-                reasoning_effort=ReviewAnalysisConfig.REASONING_EFFORT,  # 예: "low", "medium", "high"
-                max_completion_tokens=ReviewAnalysisConfig.MAX_COMPLETION_TOKENS
-            )
-            return response.choices[0].message.content.strip()
+
+            params = {
+                "model": ReviewAnalysisConfig.MODEL,
+                "messages": messages,
+                "reasoning_effort": reasoning_effort or ReviewAnalysisConfig.REASONING_EFFORT,  # 예: "low", "medium", "high"
+                "max_completion_tokens": max_completion_tokens or ReviewAnalysisConfig.MAX_COMPLETION_TOKENS
+            }
+
+            def create():
+                response = self.client.chat.completions.create(**params)
+                return response.choices[0].message.content.strip()
+
+            return llm_cache.get_or_create(params, create, bypass=bypass_cache)
             
         except BadRequestError as e:
             print(f"[ERROR] Invalid request to OpenAI API: {str(e)}")
@@ -98,8 +248,8 @@ class GPTService:
             print(f"[ERROR] Unexpected error in GPT completion: {str(e)}")
             raise
 
-    def _analyze_positive_reviews(self, texts):
-        """긍정 리뷰 분석"""
+    def _analyze_positive_reviews(self, reviews_block, bypass_cache=False):
+        """긍정 리뷰 분석 (reduce 단계 - 리뷰 원문 또는 묶음별 요약을 최종 보고서로 정리)"""
         developer_msg = (
             "당신은 게임 개발사를 위한 시장조사 전문가입니다. "
             "사용자가 제공하는 긍정 리뷰를 분석하여, "
@@ -107,7 +257,7 @@ class GPTService:
         )
         
         prompt = f"""
-다음은 게임의 긍정적인 리뷰들입니다. 아래 형식으로 분석해 주세요:
+다음은 게임의 긍정적인 리뷰들(또는 리뷰 묶음별 요약)입니다. 아래 형식으로 분석해 주세요:
 
 # 주요 장점
 - 가장 자주 언급되는 긍정적인 특징들을 나열해주세요
@@ -126,12 +276,12 @@ class GPTService:
 300자 이내로 전체적인 긍정적 평가를 요약해주세요
 
 리뷰 목록:
-{" | ".join(texts[:20]) if texts else "없음"}
+{reviews_block or "없음"}
 """
-        return self._get_completion(prompt, developer_msg)
+        return self._get_completion(prompt, developer_msg, bypass_cache=bypass_cache)
 
-    def _analyze_negative_reviews(self, texts):
-        """부정 리뷰 분석"""
+    def _analyze_negative_reviews(self, reviews_block, bypass_cache=False):
+        """부정 리뷰 분석 (reduce 단계 - 리뷰 원문 또는 묶음별 요약을 최종 보고서로 정리)"""
         developer_msg = (
             "당신은 게임 개발사를 위한 시장조사 전문가입니다. "
             "사용자가 제공하는 부정 리뷰를 분석하여, "
@@ -139,7 +289,7 @@ class GPTService:
         )
         
         prompt = f"""
-다음은 게임의 부정적인 리뷰들입니다. 아래 형식으로 분석해 주세요:
+다음은 게임의 부정적인 리뷰들(또는 리뷰 묶음별 요약)입니다. 아래 형식으로 분석해 주세요:
 
 # 주요 단점
 - 가장 자주 언급되는 문제점들을 나열해주세요
@@ -158,9 +308,9 @@ class GPTService:
 300자 이내로 구체적인 개선 방안을 제시해주세요
 
 리뷰 목록:
-{" | ".join(texts[:20]) if texts else "없음"}
+{reviews_block or "없음"}
 """
-        return self._get_completion(prompt, developer_msg)
+        return self._get_completion(prompt, developer_msg, bypass_cache=bypass_cache)
 
     def _format_summary(self, text):
         """GPT 응답 포맷팅"""
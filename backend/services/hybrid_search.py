@@ -0,0 +1,253 @@
+# services/hybrid_search.py
+
+import glob
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter
+from itertools import zip_longest
+from pathlib import Path
+
+import numpy as np
+
+from services.entity_index import ALIAS_FILE, EntityIndex, load_alias_map
+
+# 프로젝트 루트 디렉토리 찾기
+root_dir = Path(__file__).resolve().parent.parent
+
+DATA_DIR = root_dir / "data"
+
+# 한글/한자는 글자 bigram (조사가 붙어도 이름 부분이 일치하도록), 영문/숫자는 소문자 단어 단위
+_TOKEN_RE = re.compile(r'[가-힣]+|[㐀-鿿豈-﫿]+|[a-z0-9]+')
+_CJK_RE = re.compile(r'[가-힣㐀-鿿豈-﫿]')
+
+
+def tokenize(text):
+    """검색용 토큰화 (형태소 분석기 없이 질의당 수십 µs)"""
+    tokens = []
+    for run in _TOKEN_RE.findall(text.lower()):
+        if _CJK_RE.match(run) and len(run) > 1:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def reciprocal_rank_fusion(rankings, k=60):
+    """여러 순위 리스트(doc_id 리스트)를 RRF 점수 순으로 병합"""
+    scores = Counter()
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            scores[doc_id] += 1.0 / (k + rank + 1)
+    return [doc_id for doc_id, _ in sorted(scores.items(), key=lambda item: (-item[1], item[0]))]
+
+
+class BM25Index:
+    """
+    메모리 내 BM25 역색인
+      - 문서 추가 시 term별 (문서 번호 배열, BM25 tf 가중치 배열)을 미리 계산해 두고
+        질의 시에는 질의 term의 posting만 idf를 곱해 누적
+      - keywords 메타데이터 토큰은 keyword_boost배로 반영 (고유명사 질의 보강)
+    """
+
+    def __init__(self, k1=1.2, b=0.75, keyword_boost=3):
+        self.k1 = k1
+        self.b = b
+        self.keyword_boost = keyword_boost
+        self.doc_ids = []
+        self.postings = {}  # term -> (문서 번호 배열, tf 가중치 배열)
+        self.idf = {}
+
+    def build(self, documents):
+        """documents: load_corpus()의 (doc_id, content, keywords 리스트, ...) 리스트"""
+        term_freqs = []
+        for _, content, keywords, *_ in documents:
+            tf = Counter(tokenize(content))
+            for keyword in keywords:
+                for token in tokenize(keyword):
+                    tf[token] += self.keyword_boost
+            term_freqs.append(tf)
+
+        self.doc_ids = [doc[0] for doc in documents]
+        lengths = np.array([sum(tf.values()) for tf in term_freqs], dtype=np.float32)
+        norms = self.k1 * (1 - self.b + self.b * lengths / max(lengths.mean(), 1.0)) if len(lengths) else lengths
+
+        docs_by_term, tfs_by_term = {}, {}
+        for doc_index, tf in enumerate(term_freqs):
+            for term, freq in tf.items():
+                docs_by_term.setdefault(term, []).append(doc_index)
+                tfs_by_term.setdefault(term, []).append(freq)
+
+        total = len(documents)
+        self.postings, self.idf = {}, {}
+        for term, doc_indices in docs_by_term.items():
+            doc_indices = np.array(doc_indices, dtype=np.int32)
+            tfs = np.array(tfs_by_term[term], dtype=np.float32)
+            self.postings[term] = (doc_indices, tfs * (self.k1 + 1) / (tfs + norms[doc_indices]))
+            self.idf[term] = math.log(1 + (total - len(doc_indices) + 0.5) / (len(doc_indices) + 0.5))
+        return self
+
+    def search(self, query, top_k=10):
+        """BM25 점수 상위 (doc_id, 점수) 리스트"""
+        terms = [term for term in set(tokenize(query)) if term in self.postings]
+        if not terms:
+            return []
+        scores = np.zeros(len(self.doc_ids), dtype=np.float32)
+        for term in terms:
+            doc_indices, weights = self.postings[term]
+            scores[doc_indices] += self.idf[term] * weights
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > top_k:
+            candidates = candidates[np.argpartition(scores[candidates], -top_k)[-top_k:]]
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(self.doc_ids[i], float(scores[i])) for i in candidates]
+
+
+def load_corpus(data_directory=DATA_DIR):
+    """
+    index_documents.py와 같은 규칙으로 data 폴더의 문서를
+    (doc_id, content, keywords + aliases 리스트, source_file, chunk_index) 리스트로 읽기
+    (id/content 없는 문서 제외, 중복 id는 마지막 문서 사용)
+    """
+    documents = {}
+    for file_path in sorted(glob.glob(os.path.join(data_directory, "**", "*.json"), recursive=True)):
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                docs = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] 검색 색인에서 제외된 파일 {file_path}: {str(e)}")
+            continue
+        for doc in docs:
+            if not doc.get("id") or not doc.get("content"):
+                continue
+            metadata = doc.get("metadata", {})
+            keywords = []
+            for field in ("keywords", "aliases"):
+                values = metadata.get(field, [])
+                if isinstance(values, str):
+                    values = [value.strip() for value in values.split(",")]
+                keywords.extend(str(value) for value in values)
+            documents[doc["id"]] = (
+                doc["id"], doc["content"], keywords, os.path.basename(file_path), metadata.get("chunk_index", 0)
+            )
+    return list(documents.values())
+
+
+class HybridRetriever:
+    """
+    벡터 검색(Chroma)과 BM25 키워드 검색 결과를 reciprocal rank fusion으로 병합
+    entity_query()는 질문에 고유명사(data 파일 이름/keywords)가 있으면 임베딩 없이 해당 chunk를 바로 반환
+    BM25/고유명사 색인은 처음 질의할 때 data 폴더에서 만들고, index_version이 바뀌면(재인덱싱) 다시 만듦
+    status(): 색인 준비 상태 (마지막 생성 시간/오류, readiness 확인용)
+    """
+
+    def __init__(self, vector_service, data_directory=DATA_DIR, candidates=10, rrf_k=60):
+        self.vector_service = vector_service
+        self.data_directory = data_directory
+        self.candidates = candidates
+        self.rrf_k = rrf_k
+        self._index = None
+        self._entities = None
+        self._version = None
+        self._build_seconds = None
+        self._error = None
+        self._lock = threading.Lock()
+
+    def _indexes(self, index_version):
+        """(BM25Index, EntityIndex)"""
+        with self._lock:
+            if self._index is None or self._version != index_version:
+                start = time.perf_counter()
+                try:
+                    documents = load_corpus(self.data_directory)
+                    index = BM25Index().build(documents)
+                    entities = EntityIndex().build(
+                        documents, load_alias_map(os.path.join(self.data_directory, ALIAS_FILE))
+                    )
+                except Exception as e:
+                    self._error = str(e)
+                    raise
+                self._index, self._entities, self._version = index, entities, index_version
+                self._build_seconds = time.perf_counter() - start
+                self._error = None
+            return self._index, self._entities
+
+    def keyword_index(self, index_version):
+        return self._indexes(index_version)[0]
+
+    def status(self):
+        """검색 색인 준비 상태 (ready: BM25/고유명사 색인이 만들어져 있음)"""
+        return {
+            "ready": self._index is not None,
+            "index_version": self._version,
+            "documents": len(self._index.doc_ids) if self._index is not None else 0,
+            "build_seconds": round(self._build_seconds, 4) if self._build_seconds is not None else None,
+            "error": self._error,
+        }
+
+    def entity_query(self, query_text, top_k=5, index_version=None):
+        """
+        질문에 나온 고유명사의 chunk를 Chroma에서 바로 가져오기 (일치하는 고유명사가 없으면 None)
+        고유명사별 chunk를 번갈아 top_k개까지 사용하고, 한 고유명사의 chunk가 많으면 BM25 점수 순으로 선택
+        """
+        index, entities = self._indexes(index_version)
+        matched = entities.match(query_text)
+        if not matched:
+            return None
+
+        ranked = []
+        if any(len(entities.entities[alias]) > 1 for alias in matched):
+            ranked = [doc_id for doc_id, _ in index.search(query_text, len(index.doc_ids))]
+        order = {doc_id: rank for rank, doc_id in enumerate(ranked)}
+        chunk_lists = [
+            sorted(entities.entities[alias], key=lambda doc_id: order.get(doc_id, len(order)))
+            for alias in matched
+        ]
+        ids = []
+        for chunks in zip_longest(*chunk_lists):
+            for doc_id in chunks:
+                if doc_id is not None and doc_id not in ids:
+                    ids.append(doc_id)
+        ids = ids[:top_k]
+
+        stored = self.vector_service.get_documents(ids)
+        found = dict(zip(stored["ids"], zip(stored["documents"], stored["metadatas"])))
+        ids = [doc_id for doc_id in ids if doc_id in found]  # 아직 인덱싱되지 않은 문서 제외
+        if not ids:
+            return None
+        return {
+            "ids": [ids],
+            "documents": [[found[doc_id][0] for doc_id in ids]],
+            "metadatas": [[found[doc_id][1] for doc_id in ids]],
+            "entities": matched,
+        }
+
+    def query(self, query_text, top_k=5, query_embedding=None, index_version=None):
+        """vector_service.query와 같은 형식 ({"ids": [[...]], "documents": [[...]], "metadatas": [[...]]})"""
+        vector_results = self.vector_service.query(query_text, top_k=self.candidates, query_embedding=query_embedding)
+        vector_ids = vector_results.get("ids", [[]])[0]
+        keyword_ids = [doc_id for doc_id, _ in self.keyword_index(index_version).search(query_text, self.candidates)]
+        ids = reciprocal_rank_fusion([vector_ids, keyword_ids], k=self.rrf_k)[:top_k]
+
+        # 벡터 검색 결과에 없는 문서(키워드로만 찾은 문서)는 Chroma에서 본문을 가져옴
+        found = {
+            doc_id: (document, metadata)
+            for doc_id, document, metadata in zip(
+                vector_ids,
+                vector_results.get("documents", [[]])[0],
+                (vector_results.get("metadatas") or [[None] * len(vector_ids)])[0]
+            )
+        }
+        missing = [doc_id for doc_id in ids if doc_id not in found]
+        if missing:
+            stored = self.vector_service.get_documents(missing)
+            found.update(zip(stored["ids"], zip(stored["documents"], stored["metadatas"])))
+        ids = [doc_id for doc_id in ids if doc_id in found]  # 아직 인덱싱되지 않은 문서 제외
+        return {
+            "ids": [ids],
+            "documents": [[found[doc_id][0] for doc_id in ids]],
+            "metadatas": [[found[doc_id][1] for doc_id in ids]],
+        }
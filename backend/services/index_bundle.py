@@ -0,0 +1,140 @@
+# services/index_bundle.py
+
+import hashlib
+import json
+import os
+import struct
+import time
+
+import numpy as np
+
+from services.numpy_vector_store import NumpyVectorStore
+
+# 파일 구조: MAGIC | 헤더 길이(uint64 LE) | 헤더 JSON | (ALIGN 정렬) 섹션들
+#   헤더: format_version, version(섹션 해시들의 해시), count, dimension, model,
+#         sections {이름: {offset, length, sha256}}
+#   섹션: vectors (정규화된 float32 행렬, 행 순서 = ids 순서), records (ids/documents/metadatas JSON)
+MAGIC = b"VECBNDL\x00"
+FORMAT_VERSION = 1
+ALIGN = 64
+
+
+class BundleError(Exception):
+    """번들 파일이 손상되었거나 지원하지 않는 형식"""
+
+
+def _sha256(buffer):
+    return hashlib.sha256(buffer).hexdigest()
+
+
+def export_bundle(collection, path, model_name=None):
+    """
+    컬렉션(Chroma 또는 NumpyVectorStore)의 벡터/문서/메타데이터를 단일 번들 파일로 저장
+    id 순으로 정렬해 같은 내용이면 같은 파일(같은 version)이 만들어짐
+    반환: 헤더 dict
+    """
+    stored = collection.get(include=["embeddings", "documents", "metadatas"])
+    order = sorted(range(len(stored["ids"])), key=lambda i: stored["ids"][i])
+    ids = [stored["ids"][i] for i in order]
+    matrix = np.asarray(stored["embeddings"], dtype=np.float32)
+    if not ids:
+        raise BundleError("빈 컬렉션은 번들로 만들 수 없습니다")
+    matrix = matrix[order]
+    matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+    records = json.dumps({
+        "ids": ids,
+        "documents": [stored["documents"][i] for i in order],
+        "metadatas": [stored["metadatas"][i] for i in order],
+    }, ensure_ascii=False, sort_keys=True).encode("utf-8")
+
+    sections = {"vectors": matrix.tobytes(), "records": records}
+    header = {
+        "format_version": FORMAT_VERSION,
+        "version": _sha256("".join(_sha256(data) for data in sections.values()).encode("ascii")),
+        "created_at": int(time.time()),
+        "model": model_name,
+        "count": len(ids),
+        "dimension": int(matrix.shape[1]),
+        "sections": {},
+    }
+
+    # 섹션 위치가 헤더 길이에 따라 달라지므로 헤더 길이가 더 바뀌지 않을 때까지 다시 계산
+    offsets, header_bytes = {}, b""
+    while True:
+        data_start = len(MAGIC) + 8 + len(header_bytes)
+        position = data_start
+        for name, data in sections.items():
+            position += -position % ALIGN
+            offsets[name] = position
+            header["sections"][name] = {"offset": position, "length": len(data), "sha256": _sha256(data)}
+            position += len(data)
+        encoded = json.dumps(header, sort_keys=True).encode("utf-8")
+        if len(encoded) == len(header_bytes):
+            break
+        header_bytes = encoded
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path + ".tmp", "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        for name, data in sections.items():
+            f.write(b"\x00" * (offsets[name] - f.tell()))
+            f.write(data)
+    os.replace(path + ".tmp", path)
+    return header
+
+
+def read_header(path):
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise BundleError(f"번들 파일이 아닙니다: {path}")
+        (length,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(length))
+    if header.get("format_version") != FORMAT_VERSION:
+        raise BundleError(f"지원하지 않는 번들 형식 버전: {header.get('format_version')}")
+    return header
+
+
+class BundleVectorStore(NumpyVectorStore):
+    """
+    번들 파일을 read-only memory-map으로 여는 읽기 전용 컬렉션 (VECTOR_BACKEND=bundle)
+    쓰기 가능한 디렉토리/SQLite가 없어도 되므로 서버리스 cold start에서 사용
+    verify=True이면 열 때 섹션 SHA-256을 확인 (손상된 배포 파일로 잘못된 답을 하지 않도록)
+    """
+
+    def __init__(self, path, embedding_function=None, verify=True):
+        # 색인 디렉토리를 만드는 NumpyVectorStore.__init__ 대신 공통 상태만 초기화
+        self._init_state(embedding_function, quantization=None, rerank_factor=1)
+        self.bundle_path = path
+        self.header = read_header(path)
+        self.version = self.header["version"]
+
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        sections = self.header["sections"]
+        views = {name: buffer[meta["offset"]:meta["offset"] + meta["length"]] for name, meta in sections.items()}
+        if any(len(view) != sections[name]["length"] for name, view in views.items()):
+            raise BundleError(f"번들 파일이 잘렸습니다: {path}")
+        if verify:
+            for name, view in views.items():
+                if _sha256(view) != sections[name]["sha256"]:
+                    raise BundleError(f"번들 체크섬 불일치 ({name}): {path}")
+
+        records = json.loads(views["records"].tobytes())
+        self._matrix = views["vectors"].view(np.float32).reshape(self.header["count"], self.header["dimension"])
+        self._ids = records["ids"]
+        self._documents = records["documents"]
+        self._metadatas = records["metadatas"]
+        self._positions = {doc_id: i for i, doc_id in enumerate(self._ids)}
+
+    def _refresh(self):
+        """번들은 바뀌지 않으므로 다시 읽을 필요 없음"""
+
+    def _write(self, update):
+        raise BundleError("번들 색인은 읽기 전용입니다 (index_documents.py로 갱신 후 다시 export)")
+
+    def upsert(self, documents, metadatas=None, ids=None, embeddings=None):
+        self._write(None)
+
+    def add(self, documents, metadatas=None, ids=None, embeddings=None):
+        self._write(None)
@@ -0,0 +1,250 @@
+# services/job_service.py
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from datetime import timedelta
+
+from services.cache_dir import resolve_cache_dir
+
+
+class JobQueueFull(Exception):
+    """대기 중인 작업 수가 한도를 넘음"""
+
+
+class Job:
+    """백그라운드 작업 하나의 상태"""
+
+    def __init__(self, job_id, key, on_change=None):
+        self.id = job_id
+        self.key = key
+        self.status = 'queued'  # queued -> running -> done | failed
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.updated_at = self.created_at  # 마지막으로 상태/진행 상황이 기록된 시각
+        self._on_change = on_change  # 상태가 바뀔 때 저장소에 기록하는 함수
+
+    @classmethod
+    def from_row(cls, row):
+        job = cls(row['id'], row['key'])
+        job.status = row['status']
+        job.progress = json.loads(row['progress'])
+        job.result = json.loads(row['result']) if row['result'] is not None else None
+        job.error = row['error']
+        job.created_at = row['created_at']
+        job.started_at = row['started_at']
+        job.finished_at = row['finished_at']
+        job.updated_at = row['updated_at']
+        return job
+
+    @property
+    def finished(self):
+        return self.status in ('done', 'failed')
+
+    def update(self, **progress):
+        """작업 함수가 진행 상황을 보고할 때 사용"""
+        self.progress.update(progress)
+        self._save()
+
+    def _save(self):
+        self.updated_at = time.time()
+        if self._on_change is not None:
+            self._on_change(self)
+
+    def to_dict(self, include_result=False):
+        data = {
+            'job_id': self.id,
+            'status': self.status,
+            'progress': dict(self.progress),
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+        if self.error:
+            data['error'] = self.error
+        if include_result:
+            data['result'] = self.result
+        return data
+
+
+class JobManager:
+    """
+    제한된 크기의 스레드 풀에서 작업을 실행하는 작업 관리자
+      - 작업 상태/결과는 SQLite에 저장하므로 같은 서버의 다른 워커 프로세스(gunicorn -w N)에서도 조회 가능
+      - 같은 key로 진행 중인 작업이 있으면 (다른 워커의 작업이라도) 새로 만들지 않고 기존 작업을 반환 (병합)
+      - 완료된 작업 결과는 result_ttl 동안 보관되어 클라이언트가 연결이 끊겨도 다시 조회 가능
+      - stale_after 동안 진행 상황이 기록되지 않은 미완료 작업은 실행하던 프로세스가 종료된 것으로 보고 실패 처리
+    작업은 요청을 받은 프로세스의 스레드에서 실행되므로 응답 후 스레드가 멈추는 서버리스 환경에서는 사용하지 않음
+    """
+
+    def __init__(self, max_workers=2, max_pending=32, result_ttl=timedelta(hours=1),
+                 cache_dir=None, stale_after=timedelta(minutes=30)):
+        """
+        cache_dir: 작업 DB(jobs.sqlite3)를 둘 디렉터리 (처음 사용할 때 생성)
+                   None이거나 쓸 수 없으면 프로세스 메모리에만 저장 (이 경우 단일 프로세스에서만 조회 가능)
+        """
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.stale_after = stale_after
+        self.cache_dir = cache_dir
+        self.db_path = None  # 처음 사용할 때 _open()에서 결정
+        self._memory_conn = None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 저장소
+    # ------------------------------------------------------------------
+    def _open(self):
+        with self._lock:
+            if self.db_path is not None:
+                return
+            db_path = None
+            if self.cache_dir is not None:
+                try:
+                    db_path = str(resolve_cache_dir(self.cache_dir, 'jobs') / 'jobs.sqlite3')
+                    self._init_db(db_path)
+                except (OSError, sqlite3.Error) as e:
+                    print(f"[WARNING] 작업 저장소를 디스크에 만들 수 없어 메모리에만 저장합니다: {str(e)}")
+                    db_path = None
+            if db_path is None:
+                db_path = f'file:analysis-jobs-{id(self)}?mode=memory&cache=shared'
+                self._memory_conn = sqlite3.connect(db_path, uri=True, check_same_thread=False)
+                self._init_db(db_path)
+            self.db_path = db_path
+
+    def _connect(self, db_path=None):
+        if db_path is None:
+            if self.db_path is None:
+                self._open()
+            db_path = self.db_path
+        conn = sqlite3.connect(db_path, timeout=30, uri=db_path.startswith('file:'))
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self, db_path):
+        with closing(self._connect(db_path)) as conn, conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    key TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_key_status ON jobs (key, status)')
+
+    def _save(self, job, conn=None):
+        row = (
+            job.id, job.key, job.status, json.dumps(job.progress, ensure_ascii=False),
+            json.dumps(job.result, ensure_ascii=False) if job.result is not None else None,
+            job.error, job.created_at, job.started_at, job.finished_at, job.updated_at
+        )
+        sql = """
+            INSERT OR REPLACE INTO jobs
+                (id, key, status, progress, result, error, created_at, started_at, finished_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+        if conn is not None:
+            conn.execute(sql, row)
+            return
+        with closing(self._connect()) as conn, conn:
+            conn.execute(sql, row)
+
+    def _mark_stale(self, job):
+        """실행하던 프로세스가 응답하지 않는 미완료 작업이면 실패로 표시"""
+        if not job.finished and job.updated_at < time.time() - self.stale_after.total_seconds():
+            job.status = 'failed'
+            job.error = '작업을 실행하던 프로세스가 응답하지 않습니다. 작업을 다시 요청해주세요.'
+        return job
+
+    # ------------------------------------------------------------------
+    # 작업
+    # ------------------------------------------------------------------
+    def submit(self, key, fn, *args, **kwargs):
+        """
+        fn(job, *args, **kwargs)를 백그라운드에서 실행하고 (job, merged) 반환
+        merged가 True이면 같은 key의 진행 중인 작업에 합류한 것
+        """
+        now = time.time()
+        active_since = now - self.stale_after.total_seconds()
+        with closing(self._connect()) as conn:
+            # 다른 프로세스와 동시에 같은 key를 등록하지 않도록 쓰기 잠금을 잡고 확인
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._prune(conn, now)
+                row = conn.execute("""
+                    SELECT * FROM jobs
+                    WHERE key = ? AND status IN ('queued', 'running') AND updated_at >= ?
+                    ORDER BY created_at DESC LIMIT 1
+                """, (key, active_since)).fetchone()
+                if row is not None:
+                    conn.rollback()
+                    return Job.from_row(row), True
+                pending = conn.execute("""
+                    SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running') AND updated_at >= ?
+                """, (active_since,)).fetchone()[0]
+                if pending >= self.max_pending:
+                    raise JobQueueFull(f"Too many pending jobs ({self.max_pending})")
+
+                job = Job(uuid.uuid4().hex, key, on_change=self._save)
+                self._save(job, conn)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job, False
+
+    def get(self, job_id):
+        """job_id로 작업 조회 (없으면 None)"""
+        with closing(self._connect()) as conn:
+            row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return self._mark_stale(Job.from_row(row)) if row else None
+
+    def _run(self, job, fn, args, kwargs):
+        job.status = 'running'
+        job.started_at = time.time()
+        job._save()
+        try:
+            result = fn(job, *args, **kwargs)
+            error = None
+        except Exception as e:
+            print(f"[ERROR] Job {job.id} failed: {str(e)}")
+            result, error = None, str(e)
+        # finished_at을 먼저 채운 뒤 완료 상태를 기록 (완료 작업은 항상 finished_at이 있음)
+        job.finished_at = time.time()
+        job.result, job.error = result, error
+        job.status = 'failed' if error is not None else 'done'
+        try:
+            job._save()
+        except Exception as e:
+            print(f"[ERROR] Job {job.id} result could not be saved: {str(e)}")
+            job.result, job.error, job.status = None, f"결과를 저장하지 못했습니다: {str(e)}", 'failed'
+            job._save()
+
+    def _prune(self, conn, now):
+        """result_ttl이 지난 완료 작업과 오래 응답이 없는 미완료 작업 제거"""
+        conn.execute("""
+            DELETE FROM jobs
+            WHERE (finished_at IS NOT NULL AND finished_at < ?) OR updated_at < ?
+        """, (
+            now - self.result_ttl.total_seconds(),
+            now - max(self.result_ttl, self.stale_after).total_seconds()
+        ))
@@ -0,0 +1,194 @@
+# services/llm_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from datetime import timedelta
+from pathlib import Path
+
+from services.cache_dir import resolve_cache_dir
+
+# 프로젝트 루트 디렉토리 찾기
+root_dir = Path(__file__).resolve().parent.parent
+
+LLM_CACHE_DIR = os.getenv('LLM_CACHE_DIR', str(root_dir / "cache" / "llm"))  # 쓸 수 없으면 임시 디렉터리 사용
+
+
+class LLMResponseCache:
+    """
+    LLM 응답 캐시 (요청 전체의 해시를 key로 사용하는 content-addressed 캐시)
+      - key: model, messages, reasoning_effort, max_completion_tokens 등 요청 파라미터 전체의 SHA-256
+      - 1차: 메모리 LRU (max_entries), 2차: SQLite (cache_dir이 주어진 경우, 프로세스 재시작 후에도 유지)
+        SQLite 파일은 처음 사용할 때 생성하고, 디렉터리를 쓸 수 없으면 메모리 계층만 사용
+      - 두 계층 모두 ttl이 지난 항목은 사용하지 않음
+      - 실패한 호출은 저장하지 않음
+    """
+
+    def __init__(self, max_entries=256, ttl=timedelta(hours=24), cache_dir=None, max_disk_entries=10_000):
+        self.max_entries = max_entries
+        self.ttl = ttl.total_seconds()
+        self.max_disk_entries = max_disk_entries
+        self.enabled = True
+        self._memory = OrderedDict()  # key -> (created_at, response)
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'bypassed': 0}
+
+        self.cache_dir = cache_dir
+        self.db_path = None  # 처음 사용할 때 _disk()에서 결정
+        self._disk_checked = cache_dir is None
+        self._disk_lock = threading.Lock()
+
+    def _disk(self):
+        """디스크 계층 사용 가능 여부 (처음 호출할 때 SQLite 파일 생성)"""
+        if not self._disk_checked:
+            with self._disk_lock:
+                if not self._disk_checked:
+                    try:
+                        db_path = resolve_cache_dir(self.cache_dir, 'llm') / 'responses.sqlite3'
+                        self._init_db(db_path)
+                        self.db_path = db_path
+                    except (OSError, sqlite3.Error) as e:
+                        print(f"[WARNING] LLM 디스크 캐시를 사용할 수 없어 메모리 캐시만 사용합니다: {str(e)}")
+                    self._disk_checked = True
+        return self.db_path is not None
+
+    def _connect(self, db_path=None):
+        return sqlite3.connect(db_path or self.db_path, timeout=30)
+
+    def _init_db(self, db_path):
+        with closing(self._connect(db_path)) as conn, conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used)')
+
+    @staticmethod
+    def make_key(params):
+        """요청 파라미터 dict -> 캐시 key (dict 순서와 무관)"""
+        raw = json.dumps(params, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """캐시된 응답 (없거나 만료되었으면 None)"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[0] < self.ttl:
+                    self._memory.move_to_end(key)
+                    self._stats['hits'] += 1
+                    self._stats['memory_hits'] += 1
+                    return entry[1]
+                del self._memory[key]
+
+        if self._disk():
+            try:
+                with closing(self._connect()) as conn, conn:
+                    row = conn.execute(
+                        'SELECT response, created_at FROM responses WHERE key = ? AND created_at > ?',
+                        (key, now - self.ttl)
+                    ).fetchone()
+                    if row is not None:
+                        conn.execute('UPDATE responses SET last_used = ? WHERE key = ?', (now, key))
+            except sqlite3.Error as e:
+                print(f"[ERROR] LLM 캐시 조회 실패: {str(e)}")
+                row = None
+            if row is not None:
+                response, created_at = json.loads(row[0]), row[1]
+                with self._lock:
+                    self._remember(key, created_at, response)
+                    self._stats['hits'] += 1
+                    self._stats['disk_hits'] += 1
+                return response
+
+        with self._lock:
+            self._stats['misses'] += 1
+        return None
+
+    def _remember(self, key, created_at, response):
+        """메모리 계층에 저장 (lock을 잡은 상태에서 호출)"""
+        self._memory[key] = (created_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def put(self, key, response):
+        """응답 저장 (JSON 직렬화 가능한 값)"""
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, response)
+
+        if self._disk():
+            try:
+                with closing(self._connect()) as conn, conn:
+                    conn.execute(
+                        'INSERT OR REPLACE INTO responses (key, response, created_at, last_used) VALUES (?, ?, ?, ?)',
+                        (key, json.dumps(response, ensure_ascii=False), now, now)
+                    )
+                    conn.execute('DELETE FROM responses WHERE created_at <= ?', (now - self.ttl,))
+                    overflow = conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0] - self.max_disk_entries
+                    if overflow > 0:
+                        conn.execute("""
+                            DELETE FROM responses WHERE key IN (
+                                SELECT key FROM responses ORDER BY last_used LIMIT ?
+                            )
+                        """, (overflow,))
+            except sqlite3.Error as e:
+                print(f"[ERROR] LLM 캐시 저장 실패: {str(e)}")
+
+    def get_or_create(self, params, create, bypass=False):
+        """
+        params와 같은 요청의 캐시된 응답을 반환하고, 없으면 create()를 호출해 저장 후 반환
+        bypass=True이면 캐시를 읽지 않고 항상 새로 호출 (결과는 저장하여 캐시 갱신)
+        """
+        if not self.enabled:
+            return create()
+        key = self.make_key(params)
+        if bypass:
+            with self._lock:
+                self._stats['bypassed'] += 1
+        else:
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+        response = create()
+        if response:
+            self.put(key, response)
+        return response
+
+    def stats(self):
+        """적중/실패 카운터와 현재 크기"""
+        with self._lock:
+            stats = dict(self._stats, memory_entries=len(self._memory))
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else 0
+        stats['enabled'] = self.enabled
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self._disk():
+            with closing(self._connect()) as conn, conn:
+                conn.execute('DELETE FROM responses')
+
+
+# ChatService / GPTService가 공유하는 캐시 인스턴스
+# LLM_CACHE_DISK=0이면 메모리 계층만 사용, LLM_CACHE_ENABLED=0이면 캐시하지 않음
+llm_cache = LLMResponseCache(
+    max_entries=int(os.getenv('LLM_CACHE_MAX_ENTRIES', 256)),
+    ttl=timedelta(hours=float(os.getenv('LLM_CACHE_TTL_HOURS', 24))),
+    cache_dir=LLM_CACHE_DIR if os.getenv('LLM_CACHE_DISK', '1') != '0' else None
+)
+llm_cache.enabled = os.getenv('LLM_CACHE_ENABLED', '1') != '0'
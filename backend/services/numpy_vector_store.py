@@ -0,0 +1,307 @@
+# services/numpy_vector_store.py
+
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from services.quantization import QUANTIZERS
+
+try:
+    import fcntl  # 여러 프로세스의 동시 쓰기 방지 (Windows에서는 프로세스 내 lock만 사용)
+except ImportError:
+    fcntl = None
+
+INDEX_FILE = "index.json"
+QUERY_BLOCK = 64  # 한 번의 행렬 곱으로 채점할 질의 수 (점수 행렬 메모리 = QUERY_BLOCK x 문서 수 x 4바이트)
+
+
+def _top_indices(scores, count):
+    """점수 상위 count개의 위치 (정렬되지 않음)"""
+    if len(scores) <= count:
+        return np.arange(len(scores))
+    return np.argpartition(-scores, count)[:count]
+
+
+class NumpyVectorStore:
+    """
+    ChromaDB 컬렉션 대신 사용할 수 있는 프로세스 내 벡터 색인 (VECTOR_BACKEND=numpy)
+      - vectors-<세대>.f32: 정규화된 float32 임베딩 행렬 (read-only memory-map, 프로세스 간 page cache 공유)
+      - index.json: 현재 세대, 차원 수, ids/documents/metadatas
+    query()는 행렬-벡터 곱 한 번과 argpartition으로 코사인 유사도 상위 n개를 찾음
+    quantization("int8"/"pq")을 주면 쓰기 시 양자화 코드(quant-<세대>.*)도 함께 만들고,
+    질의는 코드로 근사 점수를 계산해 후보 n * rerank_factor개를 고른 뒤 float32 행렬로 정확히 재채점
+    (float32 행렬은 후보 행만 읽으므로 메모리에 올라오는 것은 주로 코드 - int8은 1/4, pq는 1/64)
+    쓰기는 새 세대의 행렬 파일을 만든 뒤 index.json을 원자적으로 교체하므로
+    읽는 쪽은 잠금 없이 index.json 변경만 확인하면 됨
+    쓰기(add/upsert/delete) 한 번마다 전체 행렬을 새로 쓰고 양자화 코드도 전체를 다시 학습하므로
+    비용은 추가한 문서 수가 아니라 색인 크기에 비례 - 문서는 가능한 한 큰 묶음으로 모아서 쓸 것
+    (읽기 위주의 작은 색인(수천~수만 개)을 위한 백엔드)
+    메서드 이름/반환 형식은 VectorService가 사용하는 Chroma 컬렉션 API와 같음
+    """
+
+    def __init__(self, path, embedding_function=None, quantization=None, rerank_factor=10):
+        self._init_state(embedding_function, quantization, rerank_factor)
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.index_path = os.path.join(path, INDEX_FILE)
+
+    def _init_state(self, embedding_function, quantization, rerank_factor):
+        """저장 위치와 무관한 공통 상태 초기화 (빈 색인) - 하위 클래스(BundleVectorStore)도 사용"""
+        if quantization is not None and quantization not in QUANTIZERS:
+            raise ValueError(f"Unknown quantization: {quantization}")
+        self.embedding_function = embedding_function
+        self.quantization = quantization
+        self.rerank_factor = rerank_factor
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._loaded_stat = None
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._quantizer = None
+        self._ids = []
+        self._documents = []
+        self._metadatas = []
+        self._positions = {}
+
+    # ---- 읽기 ----
+
+    def _refresh(self):
+        """다른 프로세스(인덱싱 스크립트 등)가 색인을 바꿨으면 다시 불러오기"""
+        try:
+            stat = os.stat(self.index_path)
+        except FileNotFoundError:
+            stat = None
+        key = (stat.st_ino, stat.st_mtime_ns) if stat else None
+        if key == self._loaded_stat:
+            return
+        with self._lock:
+            if key == self._loaded_stat:
+                return
+            if stat is None:
+                matrix, quantizer, ids, documents, metadatas = np.zeros((0, 0), dtype=np.float32), None, [], [], []
+            else:
+                matrix, quantizer, ids, documents, metadatas = self._load()
+            self._matrix, self._quantizer = matrix, quantizer
+            self._ids, self._documents, self._metadatas = ids, documents, metadatas
+            self._positions = {doc_id: i for i, doc_id in enumerate(ids)}
+            self._loaded_stat = key
+
+    def _load(self, attempts=3):
+        """index.json과 행렬 파일 읽기 (읽는 사이 다른 프로세스가 새 세대로 교체했으면 다시 시도)"""
+        for attempt in range(attempts):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            ids = index["ids"]
+            if not ids:
+                return np.zeros((0, index["dimension"]), dtype=np.float32), None, [], [], []
+            try:
+                matrix = np.memmap(os.path.join(self.path, index["vectors_file"]), dtype=np.float32,
+                                   mode="r", shape=(len(ids), index["dimension"]))
+                quantizer = None
+                if index.get("quantization"):
+                    meta = index["quantization"]
+                    quantizer = QUANTIZERS[meta["method"]].load(os.path.join(self.path, meta["prefix"]), len(ids), meta)
+                return matrix, quantizer, ids, index["documents"], index["metadatas"]
+            except FileNotFoundError:
+                if attempt == attempts - 1:
+                    raise
+                time.sleep(0.01)
+
+    def preload(self):
+        """검색 시 전체를 훑는 행렬(양자화 사용 시 코드만)을 미리 메모리에 올림 (첫 질의의 page fault 방지)"""
+        self._refresh()
+        scanned = self._quantizer.codes if self._quantizer is not None else self._matrix
+        np.asarray(scanned).sum()
+
+    def count(self):
+        self._refresh()
+        return len(self._ids)
+
+    def _records(self, positions, include):
+        result = {"ids": [self._ids[i] for i in positions]}
+        if "documents" in include:
+            result["documents"] = [self._documents[i] for i in positions]
+        if "metadatas" in include:
+            result["metadatas"] = [self._metadatas[i] for i in positions]
+        if "embeddings" in include:
+            result["embeddings"] = [self._matrix[i].tolist() for i in positions]
+        return result
+
+    def get(self, ids=None, include=("documents", "metadatas")):
+        """ids의 문서 (없는 id는 제외, ids가 None이면 전체)"""
+        self._refresh()
+        if ids is None:
+            positions = list(range(len(self._ids)))
+        else:
+            positions = [self._positions[doc_id] for doc_id in ids if doc_id in self._positions]
+        return self._records(positions, include)
+
+    def query(self, query_embeddings=None, query_texts=None, n_results=10, include=("documents", "metadatas", "distances")):
+        """
+        질의별 코사인 유사도 상위 n_results개
+        distances는 Chroma 기본 공간(l2)과 같은 제곱 L2 거리 - 정규화된 벡터이므로 2 - 2 * 코사인 유사도
+        (백엔드를 바꿔도 같은 거리 기준(임계값 등)을 그대로 사용할 수 있음)
+        """
+        if query_embeddings is None:
+            query_embeddings = self.embedding_function(query_texts)
+        self._refresh()
+        matrix = self._matrix
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        queries /= np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+
+        results = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        for top, similarities in self.search_many(queries, n_results, matrix, self._quantizer):
+            records = self._records(top.tolist(), include)
+            for field in results:
+                if field == "distances":
+                    results[field].append([max(float(2 - 2 * similarity), 0.0) for similarity in similarities])
+                elif field in records:
+                    results[field].append(records[field])
+        return {field: values for field, values in results.items() if field == "ids" or field in include}
+
+    def search(self, query, n_results, matrix=None, quantizer=None):
+        """
+        정규화된 질의 벡터 -> (상위 행 번호 배열, 코사인 유사도 배열), 유사도 내림차순
+        quantizer가 있으면 근사 점수 상위 n_results * rerank_factor개만 정확히 재채점
+        """
+        return self.search_many(np.asarray(query)[None, :], n_results, matrix, quantizer)[0]
+
+    def search_many(self, queries, n_results, matrix=None, quantizer=None):
+        """
+        (질의 수, 차원) 정규화된 질의 행렬 -> 질의별 search() 결과 리스트
+        양자화하지 않은 색인은 QUERY_BLOCK개 질의씩 행렬-행렬 곱 한 번으로 채점
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        if matrix is None:
+            self._refresh()
+            matrix, quantizer = self._matrix, self._quantizer
+        if not len(matrix):
+            empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32))
+            return [empty] * len(queries)
+
+        results = []
+        if quantizer is None:
+            for start in range(0, len(queries), QUERY_BLOCK):
+                scores = queries[start:start + QUERY_BLOCK] @ matrix.T
+                for similarities in scores:
+                    top = _top_indices(similarities, n_results)
+                    top = top[np.argsort(-similarities[top], kind="stable")]
+                    results.append((top, similarities[top]))
+            return results
+
+        for query in queries:
+            candidates = _top_indices(quantizer.scores(query), n_results * self.rerank_factor)
+            candidates.sort()  # memory-map 행을 파일 순서대로 읽기
+            similarities = matrix[candidates] @ query
+            top = _top_indices(similarities, n_results)
+            top = top[np.argsort(-similarities[top], kind="stable")]
+            results.append((candidates[top], similarities[top]))
+        return results
+
+    # ---- 쓰기 ----
+
+    def _write(self, update):
+        """
+        현재 색인(dict: id -> (벡터, document, metadata))에 update를 적용해 새 세대로 저장
+        다른 프로세스의 쓰기와 겹치지 않도록 lock 파일을 잡은 상태에서 최신 색인을 다시 읽고 수정
+        비용은 색인 전체 크기에 비례 (전체 행렬 재작성 + 양자화 재학습)
+        """
+        with self._write_lock, open(os.path.join(self.path, ".lock"), "w") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self._refresh()
+            records = {
+                doc_id: (self._matrix[i], self._documents[i], self._metadatas[i])
+                for i, doc_id in enumerate(self._ids)
+            }
+            update(records)
+
+            ids = list(records)
+            dimension = self._matrix.shape[1]
+            if ids:
+                matrix = np.stack([np.asarray(records[doc_id][0], dtype=np.float32) for doc_id in ids])
+                dimension = matrix.shape[1]
+            generation = time.time_ns()
+            vectors_file = f"vectors-{generation}.f32"
+            quantization = None
+            if ids:
+                matrix.tofile(os.path.join(self.path, vectors_file))
+                if self.quantization is not None:
+                    prefix = f"quant-{generation}"
+                    meta = QUANTIZERS[self.quantization].fit(matrix).save(os.path.join(self.path, prefix))
+                    quantization = dict(meta, method=self.quantization, prefix=prefix)
+            index = {
+                "generation": generation,
+                "vectors_file": vectors_file,
+                "quantization": quantization,
+                "dimension": dimension,
+                "ids": ids,
+                "documents": [records[doc_id][1] for doc_id in ids],
+                "metadatas": [records[doc_id][2] for doc_id in ids],
+            }
+            with open(self.index_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(index, f, ensure_ascii=False)
+            os.replace(self.index_path + ".tmp", self.index_path)
+
+            # 새 세대를 먼저 불러와 이전 세대 memory-map 참조(records의 행 포함)를 놓은 뒤 삭제
+            del records
+            self._refresh()
+            self._remove_stale_generations(generation)
+
+    def _remove_stale_generations(self, generation):
+        """
+        현재 세대가 아닌 행렬/코드 파일 삭제 (POSIX에서는 이미 매핑한 프로세스가 다시 불러올 때까지 기존 내용을 계속 읽음)
+        Windows에서 아직 매핑 중인 파일(다른 프로세스/진행 중인 질의)은 삭제가 실패하므로 남겨두고 다음 쓰기 때 다시 시도
+        """
+        for name in os.listdir(self.path):
+            if name.startswith(("vectors-", "quant-")) and not name.split(".")[0].endswith(f"-{generation}"):
+                try:
+                    os.remove(os.path.join(self.path, name))
+                except OSError as e:
+                    print(f"[WARNING] 이전 세대 색인 파일 삭제 실패 (다음 쓰기 때 다시 시도): {name} ({e})")
+
+    def _normalized(self, documents, embeddings):
+        if embeddings is None:
+            embeddings = self.embedding_function(documents)
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2 or len(matrix) != len(documents):
+            raise ValueError("embeddings must have one vector per document")
+        return matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+
+    def upsert(self, documents, metadatas=None, ids=None, embeddings=None):
+        matrix = self._normalized(documents, embeddings)
+        metadatas = metadatas or [None] * len(documents)
+
+        def update(records):
+            if records:
+                dimension = len(next(iter(records.values()))[0])
+                if matrix.shape[1] != dimension:
+                    raise ValueError(f"임베딩 차원 불일치: 색인 {dimension}, 입력 {matrix.shape[1]}")
+            for doc_id, vector, document, metadata in zip(ids, matrix, documents, metadatas):
+                records[doc_id] = (vector, document, metadata)
+        self._write(update)
+
+    def add(self, documents, metadatas=None, ids=None, embeddings=None):
+        """이미 있는 id가 포함되면 Chroma처럼 추가하지 않음"""
+        self._refresh()
+        existing = [doc_id for doc_id in ids if doc_id in self._positions]
+        if existing:
+            print(f"[WARNING] 이미 존재하는 id {len(existing)}개는 추가하지 않습니다: {existing[:5]}")
+            keep = [i for i, doc_id in enumerate(ids) if doc_id not in self._positions]
+            documents = [documents[i] for i in keep]
+            metadatas = [metadatas[i] for i in keep] if metadatas else None
+            embeddings = [embeddings[i] for i in keep] if embeddings is not None else None
+            ids = [ids[i] for i in keep]
+        if ids:
+            self.upsert(documents=documents, metadatas=metadatas, ids=ids, embeddings=embeddings)
+
+    def delete(self, ids):
+        def update(records):
+            for doc_id in ids:
+                records.pop(doc_id, None)
+        self._write(update)
+
+    def reset(self):
+        self._write(lambda records: records.clear())
@@ -0,0 +1,120 @@
+# services/quantization.py
+
+import numpy as np
+
+SCAN_CHUNK_ROWS = 256  # int8 -> float32 변환을 나눠서 하는 행 수 (변환 결과가 CPU 캐시에 남는 크기)
+
+
+class ScalarQuantizer:
+    """
+    int8 스칼라 양자화 (벡터마다 최대 절댓값을 127로 맞추는 대칭 양자화)
+    벡터당 차원 수 바이트 + scale 4바이트 (float32의 약 1/4)
+    """
+
+    name = "int8"
+
+    def __init__(self, codes=None, scales=None):
+        self.codes = codes  # (N, D) int8
+        self.scales = scales  # (N,) float32
+
+    @classmethod
+    def fit(cls, matrix):
+        scales = np.abs(matrix).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        codes = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+        return cls(codes, scales.astype(np.float32))
+
+    def save(self, prefix):
+        self.codes.tofile(f"{prefix}.codes")
+        self.scales.tofile(f"{prefix}.scales")
+        return {"dimension": int(self.codes.shape[1])}
+
+    @classmethod
+    def load(cls, prefix, count, meta):
+        codes = np.memmap(f"{prefix}.codes", dtype=np.int8, mode="r", shape=(count, meta["dimension"]))
+        scales = np.fromfile(f"{prefix}.scales", dtype=np.float32, count=count)
+        return cls(codes, scales)
+
+    def scores(self, query):
+        """근사 내적 (N,)"""
+        scores = np.empty(len(self.codes), dtype=np.float32)
+        for start in range(0, len(self.codes), SCAN_CHUNK_ROWS):
+            block = self.codes[start:start + SCAN_CHUNK_ROWS]
+            scores[start:start + len(block)] = block.astype(np.float32) @ query
+        return scores * self.scales
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + self.scales.nbytes
+
+
+class ProductQuantizer:
+    """
+    Product quantization: 차원을 subspaces개 구간으로 나누고 구간마다 k-means 중심(최대 256개) 번호 1바이트로 저장
+    질의 시 구간별 (질의 구간 · 중심) 표를 만든 뒤 코드로 표를 찾아 더함 (asymmetric distance)
+    ada-002(1536차원), subspaces=96이면 벡터당 96바이트 (float32의 1/64)
+    """
+
+    name = "pq"
+
+    def __init__(self, centroids=None, codes=None):
+        self.centroids = centroids  # (subspaces, k, D / subspaces) float32
+        self.codes = codes  # (subspaces, N) uint8 - 구간별로 연속 저장해 조회 시 한 줄씩 take
+
+    @classmethod
+    def fit(cls, matrix, subspaces=96, iterations=15, max_train=20_000, seed=0):
+        dimension = matrix.shape[1]
+        while dimension % subspaces:
+            subspaces -= 1
+        rng = np.random.default_rng(seed)
+        train = matrix if len(matrix) <= max_train else matrix[rng.choice(len(matrix), max_train, replace=False)]
+        k = min(256, len(train))
+        sub_dim = dimension // subspaces
+
+        centroids = np.empty((subspaces, k, sub_dim), dtype=np.float32)
+        codes = np.empty((subspaces, len(matrix)), dtype=np.uint8)
+        for m in range(subspaces):
+            part = np.ascontiguousarray(train[:, m * sub_dim:(m + 1) * sub_dim])
+            centers = part[rng.choice(len(part), k, replace=False)].copy()
+            for _ in range(iterations):
+                assignment = cls._assign(part, centers)
+                counts = np.bincount(assignment, minlength=k)
+                sums = np.stack([np.bincount(assignment, weights=part[:, d], minlength=k) for d in range(sub_dim)], axis=1)
+                filled = counts > 0
+                centers[filled] = sums[filled] / counts[filled, None]
+            centroids[m] = centers
+            codes[m] = cls._assign(matrix[:, m * sub_dim:(m + 1) * sub_dim], centers)
+        return cls(centroids, codes)
+
+    @staticmethod
+    def _assign(vectors, centers):
+        """가장 가까운 중심 번호 (L2)"""
+        distances = (centers ** 2).sum(axis=1)[None, :] - 2 * vectors @ centers.T
+        return distances.argmin(axis=1)
+
+    def save(self, prefix):
+        self.codes.tofile(f"{prefix}.codes")
+        np.save(f"{prefix}.centroids.npy", self.centroids)
+        return {"subspaces": int(self.codes.shape[0])}
+
+    @classmethod
+    def load(cls, prefix, count, meta):
+        centroids = np.load(f"{prefix}.centroids.npy")
+        codes = np.memmap(f"{prefix}.codes", dtype=np.uint8, mode="r", shape=(meta["subspaces"], count))
+        return cls(centroids, codes)
+
+    def scores(self, query):
+        """근사 내적 (N,)"""
+        subspaces, k, sub_dim = self.centroids.shape
+        table = np.einsum("mkd,md->mk", self.centroids, query.reshape(subspaces, sub_dim))
+        scores = np.zeros(self.codes.shape[1], dtype=np.float32)
+        for m in range(subspaces):
+            scores += table[m].take(self.codes[m])
+        return scores
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + self.centroids.nbytes
+
+
+QUANTIZERS = {quantizer.name: quantizer for quantizer in (ScalarQuantizer, ProductQuantizer)}
@@ -0,0 +1,188 @@
+# services/review_aggregator.py
+
+import heapq
+import sys
+from collections import Counter
+from itertools import count
+
+import numpy as np
+
+from services.review_batch import ReviewBatch
+from services.review_dedup import ReviewDeduplicator
+
+
+class ReviewAggregator:
+    """
+    리뷰 페이지를 한 번씩만 훑으면서 분석 결과를 누적하는 온라인 집계기
+      - 요약 통계 (전체/긍정/부정 수, 긍정 비율)
+      - 일별/주별/월별/시간대별 트렌드 버킷
+      - 긍정/부정 단어 빈도 (tokenizer가 주어진 경우, 페이지 단위로 비동기 토큰화)
+      - GPT 분석용 품질 상위 리뷰 (keep_top이 주어진 경우)
+      - dedup=True이면 거의 같은 리뷰를 묶어 그룹 대표만 토큰화하고 GPT 후보는 그룹의 극성별 대표만 사용,
+        단어 빈도는 대표 토큰에 중복 수(극성별)를 곱해 반영 (통계/트렌드는 모든 리뷰 기준)
+    페이지마다 ReviewBatch를 한 번 만들어 모든 집계를 벡터 연산으로 처리하며,
+    리뷰 전체를 보관하지 않으므로 리뷰 수와 무관하게 메모리 사용량이 일정함
+    (dedup 사용 시에는 고유 리뷰마다 MinHash 서명과 토큰 튜플만 보관)
+    """
+
+    def __init__(self, tokenizer=None, keep_top=0, dedup=False):
+        """
+        tokenizer: submit_counts((voted_up, text, review_id) 리스트) -> result()가 (긍정 Counter, 부정 Counter)인 객체
+                   submit_tokens((text, review_id) 리스트) -> result()가 토큰 리스트들인 객체
+                   를 제공하는 객체 (TokenizationEngine)
+        keep_top: 긍정/부정 각각 보관할 품질 상위 리뷰 수 (ReviewBatch.quality_scores 기준)
+        dedup: 거의 같은 리뷰 묶기 (ReviewDeduplicator)
+        """
+        self.tokenizer = tokenizer
+        self.keep_top = keep_top
+        self.dedup = ReviewDeduplicator() if dedup else None
+
+        self.total = 0
+        self.positive = 0
+        # 버킷 번호(ReviewBatch.day_index / week_index / month_index) -> [review_count, voted_up]
+        self.daily = {}
+        self.weekly = {}
+        self.monthly = {}
+        self.hourly = np.zeros((24, 2), dtype=np.int64)  # UTC 시각별 [review_count, voted_up]
+        self.pos_counter = Counter()
+        self.neg_counter = Counter()
+        self._token_futures = []
+        self._group_futures = []  # (submit_tokens 결과, 그룹 번호 배열) - dedup 사용 시
+        self._group_tokens = {}  # 그룹 번호 -> 대표 리뷰 토큰 튜플
+        self._group_weights = Counter()  # 그룹 번호 * 2 + voted_up -> 리뷰 수
+        self._polar_seen = set()  # GPT 후보로 이미 본 (그룹 번호 * 2 + voted_up)
+        self._pos_top = []
+        self._neg_top = []
+        self._seq = count()  # 동점 리뷰 비교 방지용 순번
+
+    def update(self, reviews):
+        """리뷰 페이지 하나를 누적 (체이닝 가능하도록 self 반환)"""
+        if not reviews:
+            return self
+        batch = ReviewBatch.from_reviews(reviews)
+
+        self.total += len(batch)
+        self.positive += batch.positive_count
+
+        for buckets, keys in ((self.daily, batch.day_index()),
+                              (self.weekly, batch.week_index()),
+                              (self.monthly, batch.month_index())):
+            for key, review_count, voted_up in zip(*batch.bucket_counts(keys)):
+                bucket = buckets.setdefault(int(key), [0, 0])
+                bucket[0] += int(review_count)
+                bucket[1] += int(voted_up)
+
+        hours = batch.hour_of_day()
+        self.hourly[:, 0] += np.bincount(hours, minlength=24)
+        self.hourly[:, 1] += np.bincount(hours, weights=batch.voted_up, minlength=24).astype(np.int64)
+
+        unique = candidates = np.ones(len(batch), dtype=bool)
+        if self.dedup is not None:
+            groups, unique = self.dedup.assign(batch.texts)
+            polar_keys = groups * 2 + batch.voted_up
+            keys, first, weights = np.unique(polar_keys, return_index=True, return_counts=True)
+            self._group_weights.update(dict(zip(keys.tolist(), weights.tolist())))
+            # 같은 텍스트가 긍정/부정 양쪽에 있으면 극성마다 대표 하나씩 GPT 후보로 사용
+            candidates = np.zeros(len(batch), dtype=bool)
+            for key, i in zip(keys.tolist(), first.tolist()):
+                if key not in self._polar_seen:
+                    self._polar_seen.add(key)
+                    candidates[i] = True
+
+        # 다음 페이지를 받는 동안 토큰화가 진행되도록 결과는 word_frequencies()에서 수거
+        if self.tokenizer and self.dedup is not None:
+            new = np.flatnonzero(unique)
+            self._group_futures.append((
+                self.tokenizer.submit_tokens([(batch.texts[i], batch.ids[i]) for i in new]),
+                groups[new]
+            ))
+        elif self.tokenizer:
+            self._token_futures.append(self.tokenizer.submit_counts(
+                list(zip(batch.voted_up.tolist(), batch.texts, batch.ids))
+            ))
+
+        if self.keep_top > 0:
+            self._keep_top_reviews(reviews, batch, candidates)
+        return self
+
+    def _keep_top_reviews(self, reviews, batch, eligible):
+        """페이지에서 극성별 상위 keep_top개만 골라 힙에 병합 (eligible: 후보가 될 수 있는 리뷰 마스크)"""
+        scores = batch.quality_scores()
+        for heap, mask in ((self._pos_top, batch.voted_up & eligible), (self._neg_top, ~batch.voted_up & eligible)):
+            candidates = np.flatnonzero(mask)
+            if len(candidates) > self.keep_top:
+                candidates = candidates[np.argpartition(scores[candidates], -self.keep_top)[-self.keep_top:]]
+            for i in candidates:
+                item = (int(scores[i]), next(self._seq), reviews[i])
+                if len(heap) < self.keep_top:
+                    heapq.heappush(heap, item)
+                elif item[0] > heap[0][0]:
+                    heapq.heapreplace(heap, item)
+
+    def summary_stats(self):
+        """요약 통계 (dedup 사용 시 고유 리뷰 수 포함)"""
+        stats = {
+            'total_reviews': self.total,
+            'positive_count': self.positive,
+            'negative_count': self.total - self.positive,
+            'positive_ratio': (self.positive / self.total * 100) if self.total > 0 else 0
+        }
+        if self.dedup is not None:
+            stats['unique_reviews'] = len(self.dedup)
+        return stats
+
+    @staticmethod
+    def _bucket_record(key_name, key, review_count, voted_up):
+        return {
+            key_name: key,
+            'review_count': int(review_count),
+            'voted_up': int(voted_up),
+            'positive_ratio': round(voted_up / review_count * 100, 2) if review_count else 0
+        }
+
+    def _bucket_records(self, buckets, key_name, label):
+        return [
+            self._bucket_record(key_name, label(key), review_count, voted_up)
+            for key, (review_count, voted_up) in sorted(buckets.items())
+        ]
+
+    def trends(self):
+        """일별/주별(월요일 시작)/월별/시간대별(UTC) 트렌드"""
+        return {
+            'daily': self._bucket_records(self.daily, 'date', lambda day: str(np.datetime64(day, 'D'))),
+            'weekly': self._bucket_records(self.weekly, 'week', lambda week: str(np.datetime64(week * 7 - 3, 'D'))),
+            'monthly': self._bucket_records(self.monthly, 'month', lambda month: str(np.datetime64(month, 'M'))),
+            'hourly': [
+                self._bucket_record('hour', hour, review_count, voted_up)
+                for hour, (review_count, voted_up) in enumerate(self.hourly.tolist())
+            ] if self.total else []
+        }
+
+    def word_frequencies(self, min_freq=2):
+        """긍정/부정 단어 빈도 (min_freq 미만 제거)"""
+        for future in self._token_futures:
+            pos, neg = future.result()
+            self.pos_counter.update(pos)
+            self.neg_counter.update(neg)
+        self._token_futures = []
+
+        for future, groups in self._group_futures:
+            for group, tokens in zip(groups.tolist(), future.result()):
+                self._group_tokens[group] = tuple(map(sys.intern, tokens))
+        self._group_futures = []
+        for key, weight in self._group_weights.items():
+            counter = self.pos_counter if key & 1 else self.neg_counter
+            for token in self._group_tokens.get(key >> 1, ()):
+                counter[token] += weight
+        self._group_weights = Counter()
+        return (
+            {word: freq for word, freq in self.pos_counter.items() if freq >= min_freq},
+            {word: freq for word, freq in self.neg_counter.items() if freq >= min_freq}
+        )
+
+    def top_reviews(self):
+        """품질 점수 상위 (긍정 리뷰 리스트, 부정 리뷰 리스트)"""
+        return (
+            [item[2] for item in sorted(self._pos_top, reverse=True)],
+            [item[2] for item in sorted(self._neg_top, reverse=True)]
+        )
@@ -0,0 +1,93 @@
+# services/review_batch.py
+
+import time
+
+import numpy as np
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class ReviewBatch:
+    """
+    Steam 리뷰 묶음의 컬럼 형식 표현 (수집 시 한 번만 생성)
+      - timestamps / voted_up / votes_up / playtime / text_lengths: NumPy 배열
+      - texts / ids: 파이썬 리스트
+    통계, 트렌드 버킷, 품질 점수를 dict 순회 없이 벡터 연산으로 계산
+    """
+
+    __slots__ = ('ids', 'texts', 'timestamps', 'voted_up', 'votes_up', 'playtime', 'text_lengths')
+
+    def __init__(self, ids, texts, timestamps, voted_up, votes_up, playtime):
+        self.ids = ids
+        self.texts = texts
+        self.timestamps = timestamps
+        self.voted_up = voted_up
+        self.votes_up = votes_up
+        self.playtime = playtime
+        self.text_lengths = np.fromiter(map(len, texts), dtype=np.int32, count=len(texts))
+
+    @classmethod
+    def from_reviews(cls, reviews):
+        """Steam 리뷰 dict 리스트에서 생성"""
+        n = len(reviews)
+        return cls(
+            ids=[review.get('recommendationid') for review in reviews],
+            texts=[review.get('review') if isinstance(review.get('review'), str) else '' for review in reviews],
+            timestamps=np.fromiter((int(review.get('timestamp_created', 0)) for review in reviews),
+                                   dtype=np.int64, count=n),
+            voted_up=np.fromiter((bool(review.get('voted_up', False)) for review in reviews),
+                                 dtype=bool, count=n),
+            votes_up=np.fromiter((int(review.get('votes_up', 0)) for review in reviews),
+                                 dtype=np.int64, count=n),
+            playtime=np.fromiter((int((review.get('author') or {}).get('playtime_forever', 0)) for review in reviews),
+                                 dtype=np.int64, count=n)
+        )
+
+    def __len__(self):
+        return len(self.texts)
+
+    # ------------------------------------------------------------------
+    # 집계
+    # ------------------------------------------------------------------
+    @property
+    def positive_count(self):
+        return int(np.count_nonzero(self.voted_up))
+
+    def day_index(self):
+        """1970-01-01(UTC) 기준 일 번호"""
+        return self.timestamps // SECONDS_PER_DAY
+
+    def week_index(self):
+        """월요일 시작 주 번호 (1970-01-01은 목요일이므로 3일 보정)"""
+        return (self.day_index() + 3) // 7
+
+    def month_index(self):
+        """1970-01 기준 월 번호"""
+        return self.timestamps.astype('datetime64[s]').astype('datetime64[M]').astype(np.int64)
+
+    def hour_of_day(self):
+        """작성 시각 (UTC 0~23시)"""
+        return (self.timestamps % SECONDS_PER_DAY) // 3600
+
+    def bucket_counts(self, keys):
+        """
+        keys별 (고유 key 배열, 리뷰 수 배열, 긍정 수 배열)을 bincount로 계산
+        """
+        unique, inverse = np.unique(keys, return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(unique))
+        positives = np.bincount(inverse, weights=self.voted_up, minlength=len(unique)).astype(np.int64)
+        return unique, counts, positives
+
+    def quality_scores(self, now=None):
+        """
+        리뷰 품질 점수 벡터
+        (투표 수 x2, 적당한 길이 +1, 플레이 시간 +3, 최근 3개월 +2)
+        """
+        if now is None:
+            now = time.time()
+        return (
+            self.votes_up * 2
+            + ((self.text_lengths >= 50) & (self.text_lengths <= 1000))
+            + (self.playtime > 10) * 3
+            + (self.timestamps > now - 90 * SECONDS_PER_DAY) * 2
+        )
@@ -0,0 +1,116 @@
+# services/review_dedup.py
+
+import re
+
+import numpy as np
+
+from services.tokenizer import normalize_review_text
+
+_NON_WORD_RE = re.compile(r'[\W_]+')
+
+# splitmix64 상수 (문자 n-gram 값을 64비트 해시로 섞음)
+_MIX_1 = np.uint64(0x9E3779B97F4A7C15)
+_MIX_2 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_3 = np.uint64(0x94D049BB133111EB)
+
+
+def _mix64(values):
+    """uint64 배열에 splitmix64 finalizer 적용 (오버플로는 mod 2^64로 처리됨)"""
+    z = values + _MIX_1
+    z = (z ^ (z >> np.uint64(30))) * _MIX_2
+    z = (z ^ (z >> np.uint64(27))) * _MIX_3
+    return z ^ (z >> np.uint64(31))
+
+
+def minhash_texts(texts, num_perm=32, shingle_size=3, chunk_size=1 << 16):
+    """
+    텍스트 리스트의 MinHash 서명을 한 번에 계산 ((len(texts), num_perm) uint32 배열)
+      - 소문자화 후 공백/구두점을 지운 문자 shingle_size-gram을 특징으로 사용 (한글/영어 공통)
+      - 전체 텍스트를 UTF-32 코드 포인트 배열 하나로 이어 붙여 n-gram 해시를 벡터 연산으로 계산하고
+        텍스트별 최솟값은 np.minimum.reduceat으로 구함 (임시 배열 크기는 chunk_size 단위로 제한)
+    """
+    if not texts:
+        return np.zeros((0, num_perm), dtype=np.uint32)
+    normalized = [
+        _NON_WORD_RE.sub('', normalize_review_text(text).lower()).ljust(shingle_size, '\0')
+        for text in texts
+    ]
+    lengths = np.fromiter(map(len, normalized), dtype=np.int64, count=len(normalized))
+    codes = np.frombuffer(''.join(normalized).encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+
+    # 위치 i에서 시작하는 n-gram 값 (코드 포인트는 21비트 이내이므로 겹치지 않게 이어 붙임)
+    grams = codes[:len(codes) - shingle_size + 1].copy()
+    for offset in range(1, shingle_size):
+        grams = (grams << np.uint64(21)) ^ codes[offset:len(codes) - shingle_size + 1 + offset]
+
+    # 텍스트 경계를 넘지 않는 n-gram만 선택 (텍스트마다 lengths - shingle_size + 1개, 최소 1개)
+    counts = lengths - shingle_size + 1
+    offsets = np.cumsum(counts) - counts
+    positions = np.repeat(np.cumsum(lengths) - lengths - offsets, counts) + np.arange(counts.sum())
+    hashes = _mix64(grams[positions])
+
+    seeds = _mix64(np.arange(1, num_perm + 1, dtype=np.uint64))
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint32)
+    # 긴 텍스트가 많아도 메모리가 커지지 않도록 텍스트 묶음 단위로 처리
+    first = 0
+    while first < len(texts):
+        last = int(np.searchsorted(offsets, offsets[first] + chunk_size, side='right'))
+        last = max(last, first + 1)
+        stop = offsets[last] if last < len(texts) else len(hashes)
+        permuted = (_mix64(hashes[offsets[first]:stop, None] ^ seeds) >> np.uint64(32)).astype(np.uint32)
+        signatures[first:last] = np.minimum.reduceat(permuted, offsets[first:last] - offsets[first], axis=0)
+        first = last
+    return signatures
+
+
+class ReviewDeduplicator:
+    """
+    거의 같은 리뷰(복사/붙여넣기, 밈 리뷰)를 MinHash + LSH로 묶는 온라인 중복 판별기
+      - 서명을 bands개 구간으로 나눠 구간별로 색인하고, 한 구간이라도 같은 대표만 후보로 비교
+      - 추정 Jaccard 유사도(같은 MinHash 값 비율)가 threshold 이상이면 같은 그룹
+      - 그룹 번호는 처음 등장한 리뷰(대표) 순서대로 0부터 부여
+    분석 요청 하나에서 여러 페이지에 걸쳐 사용 (상태 유지)
+    """
+
+    def __init__(self, threshold=0.7, num_perm=32, bands=8):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self._signatures = []  # 그룹 번호 -> 대표 서명
+        self._index = [{} for _ in range(bands)]  # 구간 바이트 -> 그룹 번호 리스트
+
+    def __len__(self):
+        """지금까지의 그룹(고유 리뷰) 수"""
+        return len(self._signatures)
+
+    def _find(self, signature, keys):
+        checked = set()
+        for index, key in zip(self._index, keys):
+            for group in index.get(key, ()):
+                if group in checked:
+                    continue
+                checked.add(group)
+                if np.count_nonzero(self._signatures[group] == signature) >= self.threshold * self.num_perm:
+                    return group
+        return None
+
+    def assign(self, texts):
+        """
+        텍스트마다 그룹 번호를 부여하고 (그룹 번호 배열, 새 그룹 여부 배열) 반환
+        같은 페이지 안의 중복도 함께 판별
+        """
+        groups = np.empty(len(texts), dtype=np.int64)
+        is_new = np.zeros(len(texts), dtype=bool)
+        for i, signature in enumerate(minhash_texts(texts, self.num_perm)):
+            keys = [band.tobytes() for band in np.split(signature, self.bands)]
+            group = self._find(signature, keys)
+            if group is None:
+                group = len(self._signatures)
+                self._signatures.append(signature)
+                for index, key in zip(self._index, keys):
+                    index.setdefault(key, []).append(group)
+                is_new[i] = True
+            groups[i] = group
+        return groups, is_new
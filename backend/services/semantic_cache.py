@@ -0,0 +1,101 @@
+# services/semantic_cache.py
+
+import threading
+import time
+from datetime import timedelta
+
+import numpy as np
+
+
+class SemanticAnswerCache:
+    """
+    질문 임베딩 기반 답변 캐시 (/scenario/chat)
+      - 새 질문의 임베딩과 코사인 유사도가 threshold 이상인 이전 질문 중
+        검색된 문맥 문서 id 목록까지 같은 항목의 답변을 재사용
+      - index_version(벡터 DB 재인덱싱 표시)이 바뀌면 전체 무효화
+      - max_entries를 넘으면 가장 오래 사용되지 않은 항목부터, ttl이 지난 항목은 조회 시 제거
+    """
+
+    def __init__(self, threshold=0.93, max_entries=512, ttl=timedelta(days=7)):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl.total_seconds()
+        self._lock = threading.Lock()
+        self._version = None
+        self._stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+        self._reset()
+
+    def _reset(self):
+        self._embeddings = None  # (항목 수, 차원) 정규화된 float32 행렬
+        self._entries = []  # [질문, 문맥 id 튜플, 답변, 생성 시각]
+        self._last_used = []
+
+    @staticmethod
+    def _normalize(embedding):
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _check_version(self, index_version):
+        """벡터 DB가 재인덱싱되었으면 캐시 비우기 (lock을 잡은 상태에서 호출)"""
+        if index_version != self._version:
+            if self._entries:
+                self._stats['invalidations'] += 1
+            self._reset()
+            self._version = index_version
+
+    def _evict(self, indices):
+        """indices 위치의 항목 제거 (lock을 잡은 상태에서 호출)"""
+        keep = np.setdiff1d(np.arange(len(self._entries)), indices)
+        self._embeddings = self._embeddings[keep] if len(keep) else None
+        self._entries = [self._entries[i] for i in keep]
+        self._last_used = [self._last_used[i] for i in keep]
+
+    def get(self, embedding, context_ids, index_version):
+        """같은 의미의 질문 + 같은 문맥에 대한 저장된 답변 (없으면 None)"""
+        query = self._normalize(embedding)
+        context_ids = tuple(context_ids)
+        now = time.time()
+        with self._lock:
+            self._check_version(index_version)
+            if self._embeddings is not None:
+                expired = [i for i, entry in enumerate(self._entries) if now - entry[3] >= self.ttl]
+                if expired:
+                    self._evict(expired)
+            if self._embeddings is not None and self._embeddings.shape[1] == query.shape[0]:
+                similarities = self._embeddings @ query
+                for i in np.argsort(-similarities):
+                    if similarities[i] < self.threshold:
+                        break
+                    if self._entries[i][1] == context_ids:
+                        self._last_used[i] = now
+                        self._stats['hits'] += 1
+                        return self._entries[i][2]
+            self._stats['misses'] += 1
+        return None
+
+    def put(self, question, embedding, context_ids, answer, index_version):
+        """답변 저장"""
+        vector = self._normalize(embedding)
+        now = time.time()
+        with self._lock:
+            self._check_version(index_version)
+            if self._embeddings is not None and self._embeddings.shape[1] != vector.shape[0]:
+                # 임베딩 모델이 바뀐 경우 - 이전 항목과 비교할 수 없으므로 비움
+                self._reset()
+            if len(self._entries) >= self.max_entries:
+                self._evict([int(np.argmin(self._last_used))])
+            self._embeddings = vector[None, :] if self._embeddings is None else np.vstack([self._embeddings, vector])
+            self._entries.append([question, tuple(context_ids), answer, now])
+            self._last_used.append(now)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats, entries=len(self._entries))
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else 0
+        return stats
+
+    def clear(self):
+        with self._lock:
+            self._reset()
@@ -0,0 +1,450 @@
+# services/steam_review_store.py
+
+import json
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import timedelta
+from pathlib import Path
+
+import requests
+
+from services.cache_dir import resolve_cache_dir
+
+STEAM_REVIEWS_URL = 'https://store.steampowered.com/appreviews/{app_id}'
+
+
+class SteamAPIError(Exception):
+    """Steam 리뷰 API 호출 실패"""
+
+    def __init__(self, error, details=None):
+        super().__init__(error)
+        self.error = error
+        self.details = details
+
+
+class SteamReviewStore:
+    """
+    app_id별 Steam 리뷰 저장소 (SQLite)
+      - 지금까지 본 가장 최신 timestamp_created와 과거 방향 cursor를 기억
+      - 재분석 시 마지막 동기화 이후의 신규 리뷰(delta)만 Steam에서 가져옴
+      - language / review_type / day_range 필터는 로컬에서 처리
+    """
+
+    PAGE_SIZE = 100
+    PAGE_DELAY = 1.0  # Steam API rate limit (페이지 간 대기)
+    SYNC_INTERVAL = timedelta(minutes=10)  # delta 동기화 최소 간격
+    MAX_FETCH_PER_SYNC = 2000  # 한 번의 동기화에서 과거 방향으로 가져올 최대 리뷰 수
+
+    def __init__(self, cache_dir, cache_duration=timedelta(hours=24)):
+        """
+        cache_dir: SQLite 파일이 저장될 디렉터리 (처음 사용할 때 생성, 쓸 수 없으면 임시 디렉터리 사용)
+        cache_duration: 이 기간이 지나면 수정/삭제된 리뷰 반영을 위해 전체 재동기화
+        """
+        self.cache_dir = Path(cache_dir)
+        self.db_path = None  # 처음 사용할 때 _open()에서 결정
+        self.cache_duration = cache_duration
+        self._memory_conn = None  # 디스크에 저장할 수 없을 때 메모리 DB를 유지하는 연결
+        self._open_lock = threading.Lock()
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _open(self):
+        """
+        SQLite 저장소를 한 번만 열기 (import 시점이 아니라 첫 사용 시)
+        디렉터리를 만들 수 없으면(읽기 전용 파일 시스템) 프로세스 메모리에만 저장 (재시작하면 다시 동기화)
+        """
+        with self._open_lock:
+            if self.db_path is not None:
+                return
+            try:
+                db_path = str(resolve_cache_dir(self.cache_dir, 'reviews') / 'reviews.sqlite3')
+                self._init_db(db_path)
+            except (OSError, sqlite3.Error) as e:
+                print(f"[WARNING] 리뷰 저장소를 디스크에 만들 수 없어 메모리에만 저장합니다: {str(e)}")
+                db_path = f'file:steam-reviews-{id(self)}?mode=memory&cache=shared'
+                self._memory_conn = sqlite3.connect(db_path, uri=True, check_same_thread=False)
+                self._init_db(db_path)
+            self.db_path = db_path
+
+    def _connect(self, db_path=None):
+        if db_path is None:
+            if self.db_path is None:
+                self._open()
+            db_path = self.db_path
+        conn = sqlite3.connect(db_path, timeout=30, uri=db_path.startswith('file:'))
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self, db_path):
+        with closing(self._connect(db_path)) as conn, conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS reviews (
+                    app_id TEXT NOT NULL,
+                    recommendationid TEXT NOT NULL,
+                    timestamp_created INTEGER NOT NULL,
+                    language TEXT,
+                    voted_up INTEGER NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (app_id, recommendationid)
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_reviews_app_created
+                ON reviews (app_id, timestamp_created DESC)
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    app_id TEXT PRIMARY KEY,
+                    newest_timestamp INTEGER NOT NULL,
+                    covered_since INTEGER NOT NULL,
+                    backfill_cursor TEXT,
+                    last_synced REAL NOT NULL,
+                    last_full_sync REAL NOT NULL
+                )
+            """)
+
+    def _app_lock(self, app_id):
+        with self._locks_guard:
+            return self._locks.setdefault(app_id, threading.Lock())
+
+    # ------------------------------------------------------------------
+    # 동기화 상태
+    # ------------------------------------------------------------------
+    def get_state(self, app_id):
+        """app_id의 동기화 상태 반환 (없으면 None)"""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                'SELECT * FROM sync_state WHERE app_id = ?', (str(app_id),)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def _save_state(self, conn, app_id, state):
+        conn.execute("""
+            INSERT OR REPLACE INTO sync_state
+                (app_id, newest_timestamp, covered_since, backfill_cursor, last_synced, last_full_sync)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (
+            str(app_id),
+            state['newest_timestamp'],
+            state['covered_since'],
+            state['backfill_cursor'],
+            state['last_synced'],
+            state['last_full_sync']
+        ))
+
+    def clear(self, app_id):
+        """app_id의 저장된 리뷰와 동기화 상태 삭제"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute('DELETE FROM reviews WHERE app_id = ?', (str(app_id),))
+            conn.execute('DELETE FROM sync_state WHERE app_id = ?', (str(app_id),))
+
+    # ------------------------------------------------------------------
+    # Steam API
+    # ------------------------------------------------------------------
+    def _fetch_page(self, app_id, cursor):
+        """Steam 리뷰 한 페이지 요청 (작성일 최신순, 모든 언어/유형)"""
+        params = {
+            'json': 1,
+            'filter': 'recent',
+            'language': 'all',
+            'review_type': 'all',
+            'purchase_type': 'all',
+            'cursor': cursor,
+            'num_per_page': self.PAGE_SIZE
+        }
+        try:
+            response = requests.get(
+                STEAM_REVIEWS_URL.format(app_id=app_id),
+                params=params,
+                timeout=30
+            )
+            response.raise_for_status()
+            data = response.json()
+        except requests.RequestException as e:
+            raise SteamAPIError('Steam API 요청 실패', str(e))
+
+        if not data.get('success'):
+            raise SteamAPIError('Steam API 응답 실패', data.get('error', 'Unknown error'))
+        return data
+
+    def _fetch_remote_page(self, app_id, cursor):
+        """cursor 위치의 (reviews, next_cursor) (더 이상 페이지가 없으면 next_cursor는 None)"""
+        data = self._fetch_page(app_id, cursor)
+        reviews = data.get('reviews') or []
+        next_cursor = data.get('cursor')
+        if not reviews or not next_cursor or next_cursor == cursor:
+            next_cursor = None
+        return reviews, next_cursor
+
+    def _iter_remote_pages(self, app_id, cursor='*'):
+        """cursor부터 과거 방향으로 (reviews, next_cursor) 페이지를 순회"""
+        while True:
+            reviews, next_cursor = self._fetch_remote_page(app_id, cursor)
+            yield reviews, next_cursor
+            if not reviews or next_cursor is None:
+                return
+            cursor = next_cursor
+            time.sleep(self.PAGE_DELAY)
+
+    def _upsert_reviews(self, conn, app_id, reviews):
+        conn.executemany("""
+            INSERT OR REPLACE INTO reviews
+                (app_id, recommendationid, timestamp_created, language, voted_up, data)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            (
+                str(app_id),
+                str(review.get('recommendationid')),
+                int(review.get('timestamp_created', 0)),
+                review.get('language'),
+                1 if review.get('voted_up') else 0,
+                json.dumps(review, ensure_ascii=False)
+            )
+            for review in reviews
+            if review.get('recommendationid')
+        ])
+
+    # ------------------------------------------------------------------
+    # 동기화
+    # ------------------------------------------------------------------
+    def sync(self, app_id, day_range=30, max_fetch=None):
+        """day_range 기간을 커버하도록 app_id의 리뷰를 동기화하고 상태 반환"""
+        app_id = str(app_id)
+        self._sync_delta(app_id)
+        for _ in self._iter_backfill(app_id, day_range, max_fetch):
+            pass
+        return self.get_state(app_id)
+
+    def _sync_delta(self, app_id):
+        """
+        app_id lock을 잡은 채로 상태를 확인하고 필요하면 신규 리뷰(delta)를 수집
+          1. 저장소가 비었거나 cache_duration이 지나면 상태 초기화 (이후 backfill이 최신부터 수집)
+             아직 리뷰를 하나도 저장하지 못한 상태(newest_timestamp == 0, 첫 backfill 실패 등)도
+             delta로 전체 기록을 받지 않도록 초기화해서 기간/개수 제한이 있는 backfill에 맡김
+          2. SYNC_INTERVAL이 지났으면 newest_timestamp 이후의 신규 리뷰만 최대 MAX_FETCH_PER_SYNC개 수집
+             - 기존 지점까지 이어서 받으면 newest_timestamp만 갱신
+             - 끝까지 받았으면 전체 기간 커버
+             - 제한에 걸리면 받은 구간만 이어진 것으로 보고 covered_since/backfill_cursor를 delta 마지막 페이지로 옮김
+               (그 아래 빈 구간은 다음 backfill이 채움)
+        """
+        now = time.time()
+        with self._app_lock(app_id), closing(self._connect()) as conn:
+            state = self.get_state(app_id)
+
+            if state and now - state['last_full_sync'] > self.cache_duration.total_seconds():
+                print(f"[DEBUG] Review store expired for app_id={app_id}, full resync")
+                self.clear(app_id)
+                state = None
+
+            if state is None or state['newest_timestamp'] == 0:
+                state = {
+                    'newest_timestamp': 0,
+                    'covered_since': int(now),
+                    'backfill_cursor': '*',
+                    'last_synced': now,
+                    'last_full_sync': now
+                }
+            elif now - state['last_synced'] >= self.SYNC_INTERVAL.total_seconds():
+                fetched = 0
+                newest = state['newest_timestamp']
+                delta_newest = newest
+                delta_oldest = None
+                for reviews, next_cursor in self._iter_remote_pages(app_id):
+                    timestamps = [int(r.get('timestamp_created', 0)) for r in reviews]
+                    if timestamps:
+                        delta_newest = max(delta_newest, max(timestamps))
+                        delta_oldest = min(timestamps) if delta_oldest is None else min(delta_oldest, min(timestamps))
+                    with conn:
+                        self._upsert_reviews(conn, app_id, reviews)
+                    fetched += len(reviews)
+                    if not timestamps or min(timestamps) <= newest:
+                        break
+                    if next_cursor is None:
+                        # 가장 오래된 리뷰까지 받음 → 전체 기간 커버
+                        state['covered_since'] = 0
+                        state['backfill_cursor'] = None
+                        break
+                    if fetched >= self.MAX_FETCH_PER_SYNC:
+                        state['covered_since'] = delta_oldest
+                        state['backfill_cursor'] = next_cursor
+                        print(f"[DEBUG] Delta sync for app_id={app_id} hit the fetch limit, "
+                              f"backfill continues from {delta_oldest}")
+                        break
+                state['newest_timestamp'] = delta_newest
+                state['last_synced'] = now
+                print(f"[DEBUG] Delta sync for app_id={app_id}: {fetched} reviews fetched")
+
+            with conn:
+                self._save_state(conn, app_id, state)
+
+    def _backfill_page(self, app_id, cutoff):
+        """
+        요청 기간(cutoff 이후)이 아직 커버되지 않았으면 저장된 cursor부터 과거 리뷰 한 페이지를 수집
+        반환: 저장한 리뷰 수 (더 수집할 것이 없으면 None)
+        페이지마다 lock을 잡고 최신 상태를 다시 읽으므로 같은 app_id를 동시에 동기화하는 요청들이 cursor를 이어받음
+        """
+        with self._app_lock(app_id), closing(self._connect()) as conn:
+            state = self.get_state(app_id)
+            if state is None or state['covered_since'] <= cutoff or not state['backfill_cursor']:
+                return None
+            reviews, next_cursor = self._fetch_remote_page(app_id, state['backfill_cursor'])
+            timestamps = [int(r.get('timestamp_created', 0)) for r in reviews]
+            if timestamps:
+                state['newest_timestamp'] = max(state['newest_timestamp'], max(timestamps))
+                state['covered_since'] = min(state['covered_since'], min(timestamps))
+            state['backfill_cursor'] = next_cursor
+            if next_cursor is None:
+                # 더 이상 과거 리뷰가 없음 → 전체 기간 커버
+                state['covered_since'] = 0
+            with conn:
+                self._upsert_reviews(conn, app_id, reviews)
+                self._save_state(conn, app_id, state)
+            return len(reviews)
+
+    def _iter_backfill(self, app_id, day_range=30, max_fetch=None):
+        """
+        day_range 기간이 커버되거나 max_fetch개를 받을 때까지 과거 방향으로 한 페이지씩 수집하며
+        페이지마다 저장한 리뷰 수를 yield (yield 중에는 lock을 잡고 있지 않으므로 소비가 느려도 다른 요청을 막지 않음)
+        """
+        cutoff = int(time.time()) - day_range * 24 * 60 * 60
+        if max_fetch is None:
+            max_fetch = self.MAX_FETCH_PER_SYNC
+
+        fetched = pages = 0
+        while fetched < max_fetch:
+            if pages:
+                time.sleep(self.PAGE_DELAY)
+            count = self._backfill_page(app_id, cutoff)
+            if count is None:
+                break
+            fetched += count
+            pages += 1
+            yield count
+        if pages:
+            state = self.get_state(app_id)
+            print(f"[DEBUG] Backfill sync for app_id={app_id}: {fetched} reviews fetched "
+                  f"(covered since {state['covered_since']})")
+
+    # ------------------------------------------------------------------
+    # 로컬 조회
+    # ------------------------------------------------------------------
+    def _build_query(self, app_id, language='all', review_type='all', day_range=30):
+        cutoff = int(time.time()) - day_range * 24 * 60 * 60
+        clauses = ['app_id = ?', 'timestamp_created >= ?']
+        args = [str(app_id), cutoff]
+        if language != 'all':
+            clauses.append('language = ?')
+            args.append(language)
+        if review_type == 'positive':
+            clauses.append('voted_up = 1')
+        elif review_type == 'negative':
+            clauses.append('voted_up = 0')
+        return ' AND '.join(clauses), args
+
+    @staticmethod
+    def _matches(review, cutoff, language='all', review_type='all'):
+        """_build_query와 같은 조건을 메모리상의 리뷰에 적용"""
+        if int(review.get('timestamp_created', 0)) < cutoff:
+            return False
+        if language != 'all' and review.get('language') != language:
+            return False
+        if review_type == 'positive' and not review.get('voted_up'):
+            return False
+        if review_type == 'negative' and review.get('voted_up'):
+            return False
+        return True
+
+    def get_reviews(self, app_id, language='all', review_type='all', day_range=30, limit=None, offset=0):
+        """저장된 리뷰를 필터링하여 작성일 최신순으로 반환 (limit/offset으로 페이지 조회)"""
+        where, args = self._build_query(app_id, language, review_type, day_range)
+        sql = f'SELECT data FROM reviews WHERE {where} ORDER BY timestamp_created DESC, recommendationid DESC'
+        if limit is not None:
+            sql += ' LIMIT ? OFFSET ?'
+            args.extend([int(limit), int(offset)])
+        with closing(self._connect()) as conn:
+            rows = conn.execute(sql, args).fetchall()
+        return [json.loads(row['data']) for row in rows]
+
+    def count_reviews(self, app_id, language='all', review_type='all', day_range=30):
+        """필터 조건에 맞는 저장된 리뷰 수"""
+        where, args = self._build_query(app_id, language, review_type, day_range)
+        with closing(self._connect()) as conn:
+            return conn.execute(f'SELECT COUNT(*) FROM reviews WHERE {where}', args).fetchone()[0]
+
+    def _has_reviews(self, app_id):
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                'SELECT 1 FROM reviews WHERE app_id = ? LIMIT 1', (str(app_id),)
+            ).fetchone() is not None
+
+    def _iter_stored(self, app_id, language='all', review_type='all', day_range=30,
+                     before=None, limit=None, page_size=500):
+        """
+        저장된 리뷰를 (timestamp_created, recommendationid) 내림차순으로 page_size씩 yield
+        before가 (timestamp_created, recommendationid)이면 그보다 뒤(오래된) 리뷰만 조회 (keyset 페이지네이션)
+        """
+        where, args = self._build_query(app_id, language, review_type, day_range)
+        if before is not None:
+            where += ' AND (timestamp_created < ? OR (timestamp_created = ? AND recommendationid < ?))'
+            args.extend([before[0], before[0], before[1]])
+        sql = f'SELECT data FROM reviews WHERE {where} ORDER BY timestamp_created DESC, recommendationid DESC'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            args.append(int(limit))
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(sql, args)
+            while True:
+                rows = cursor.fetchmany(page_size)
+                if not rows:
+                    break
+                yield [json.loads(row['data']) for row in rows]
+
+    def iter_pages(self, app_id, language='all', review_type='all', day_range=30,
+                   limit=None, page_size=500, max_fetch=None, sync=True):
+        """
+        필터링된 리뷰를 작성일 최신순 페이지(list) 단위로 yield하는 제너레이터 (메모리 사용량 일정)
+          - sync=True이면 신규 리뷰(delta)를 먼저 저장한 뒤 저장된 리뷰를 SQLite cursor로 page_size씩 yield
+          - 요청 기간이 아직 커버되지 않았다면 과거 방향 페이지를 하나 받을 때마다
+            이미 yield한 리뷰보다 오래된 리뷰를 이어서 yield
+        전체가 하나의 (timestamp_created, recommendationid) 내림차순이므로 limit으로 잘라도 최신 리뷰가 남음
+        저장된 리뷰가 전혀 없는 상태에서 Steam 호출이 실패하면 SteamAPIError 발생
+        """
+        app_id = str(app_id)
+        remaining = limit
+        last = None  # 마지막으로 yield한 리뷰의 정렬 키
+
+        def stored_pages():
+            nonlocal remaining, last
+            for page in self._iter_stored(app_id, language, review_type, day_range, last, remaining, page_size):
+                tail = page[-1]
+                last = (int(tail.get('timestamp_created', 0)), str(tail.get('recommendationid')))
+                if remaining is not None:
+                    remaining -= len(page)
+                yield page
+
+        if sync:
+            try:
+                self._sync_delta(app_id)
+            except SteamAPIError as e:
+                # 저장된 리뷰가 있으면 동기화 실패와 무관하게 로컬에서 제공
+                if not self._has_reviews(app_id):
+                    raise
+                print(f"[WARNING] Sync failed for app_id={app_id} ({e.details}), serving stored reviews")
+                sync = False
+
+        yield from stored_pages()
+        if not sync or remaining == 0:
+            return
+
+        try:
+            for _ in self._iter_backfill(app_id, day_range, max_fetch):
+                yield from stored_pages()
+                if remaining == 0:
+                    return
+        except SteamAPIError as e:
+            if last is None and not self._has_reviews(app_id):
+                raise
+            print(f"[WARNING] Backfill failed for app_id={app_id} ({e.details}), serving stored reviews")
@@ -0,0 +1,125 @@
+# services/token_cache.py
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+
+from services.cache_dir import resolve_cache_dir
+
+EVICT_SLACK = 0.1  # 넘치면 max_entries의 이 비율만큼 여유를 더 두고 제거 (제거 직후 매번 COUNT하지 않도록)
+
+
+class TokenCache:
+    """
+    리뷰 토큰화 결과 디스크 캐시 (SQLite)
+      - key: (recommendationid, 텍스트 해시, 토크나이저 버전)
+      - value: simple_tokenize_ko / simple_tokenize_en이 반환한 필터링된 토큰 리스트
+      - max_entries를 넘으면 가장 오래 사용되지 않은 항목부터 제거
+        (항목 수는 쓰기마다 세지 않고 추정치가 max_entries를 넘을 때만 COUNT로 확인)
+      - SQLite 파일은 처음 사용할 때 생성, 캐시 디렉터리를 쓸 수 없으면 캐시 없이 동작 (get_many는 모두 None)
+    """
+
+    def __init__(self, cache_dir, version, max_entries=500_000):
+        self.cache_dir = Path(cache_dir)
+        self.db_path = None  # 처음 사용할 때 _open()에서 결정
+        self.version = version
+        self.max_entries = max_entries
+        self._open_lock = threading.Lock()
+        self._disabled = False  # 캐시 파일을 만들 수 없음
+        self._write_lock = threading.Lock()
+        self._entry_count = None  # 저장된 항목 수의 상한 추정치 (다른 프로세스의 쓰기는 COUNT할 때 반영)
+
+    def _open(self):
+        """SQLite 파일을 한 번만 열고 사용 가능 여부 반환"""
+        with self._open_lock:
+            if self.db_path is None and not self._disabled:
+                try:
+                    db_path = resolve_cache_dir(self.cache_dir, 'tokens') / 'tokens.sqlite3'
+                    self._init_db(db_path)
+                    self.db_path = db_path
+                except (OSError, sqlite3.Error) as e:
+                    print(f"[WARNING] 토큰 캐시를 사용할 수 없어 캐시 없이 토큰화합니다: {str(e)}")
+                    self._disabled = True
+            return self.db_path is not None
+
+    def _connect(self, db_path=None):
+        return sqlite3.connect(db_path or self.db_path, timeout=30)
+
+    def _init_db(self, db_path):
+        with closing(self._connect(db_path)) as conn, conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tokens (
+                    review_id TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    tokens TEXT NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (review_id, text_hash, version)
+                )
+            """)
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_tokens_last_used ON tokens (last_used)')
+
+    @staticmethod
+    def text_hash(text):
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def get_many(self, entries):
+        """
+        (review_id, text) 리스트에 대해 캐시된 토큰 리스트를 같은 순서로 반환 (없으면 None)
+        """
+        if not self._open():
+            return [None] * len(entries)
+        keys = [(str(review_id or ''), self.text_hash(text)) for review_id, text in entries]
+        found = {}
+        with closing(self._connect()) as conn:
+            # SQLite 변수 개수 제한을 피하기 위해 나눠서 조회
+            for i in range(0, len(keys), 400):
+                chunk = keys[i:i + 400]
+                where = ' OR '.join(['(review_id = ? AND text_hash = ?)'] * len(chunk))
+                rows = conn.execute(
+                    f'SELECT review_id, text_hash, tokens FROM tokens WHERE version = ? AND ({where})',
+                    [self.version] + [value for key in chunk for value in key]
+                ).fetchall()
+                for review_id, text_hash, tokens in rows:
+                    found[(review_id, text_hash)] = json.loads(tokens)
+
+            if found:
+                with self._write_lock, conn:
+                    conn.executemany(
+                        'UPDATE tokens SET last_used = ? WHERE review_id = ? AND text_hash = ? AND version = ?',
+                        [(time.time(), review_id, text_hash, self.version) for review_id, text_hash in found]
+                    )
+        return [found.get(key) for key in keys]
+
+    def put_many(self, entries):
+        """(review_id, text, tokens) 리스트를 저장하고 필요하면 오래된 항목 제거"""
+        if not entries or not self._open():
+            return
+        now = time.time()
+        with self._write_lock, closing(self._connect()) as conn, conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO tokens (review_id, text_hash, version, tokens, last_used)
+                VALUES (?, ?, ?, ?, ?)
+            """, [
+                (str(review_id or ''), self.text_hash(text), self.version,
+                 json.dumps(tokens, ensure_ascii=False), now)
+                for review_id, text, tokens in entries
+            ])
+            # 갱신(REPLACE)된 항목도 더하므로 추정치는 실제 이상
+            if self._entry_count is not None:
+                self._entry_count += len(entries)
+            if self._entry_count is None or self._entry_count > self.max_entries:
+                self._entry_count = conn.execute('SELECT COUNT(*) FROM tokens').fetchone()[0]
+                if self._entry_count > self.max_entries:
+                    target = int(self.max_entries * (1 - EVICT_SLACK))
+                    conn.execute("""
+                        DELETE FROM tokens WHERE rowid IN (
+                            SELECT rowid FROM tokens ORDER BY last_used LIMIT ?
+                        )
+                    """, (self._entry_count - target,))
+                    self._entry_count = target
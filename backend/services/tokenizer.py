@@ -0,0 +1,364 @@
+# services/tokenizer.py
+
+import hashlib
+import multiprocessing
+import os
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import nltk  # 영어 토큰화
+import numpy as np
+from konlpy.tag import Okt  # 한글 형태소 분석
+
+# 토큰화 도구 (프로세스마다 처음 사용할 때 한 번만 초기화)
+_okt = None
+_english_stopwords = None
+
+
+def _get_okt():
+    """Okt 인스턴스 (JVM 시작 비용이 크므로 프로세스당 하나만 생성)"""
+    global _okt
+    if _okt is None:
+        _okt = Okt()
+    return _okt
+
+
+def _get_english_stopwords():
+    global _english_stopwords
+    if _english_stopwords is None:
+        for resource, name in (('tokenizers/punkt', 'punkt'), ('corpora/stopwords', 'stopwords')):
+            try:
+                nltk.data.find(resource)
+            except LookupError:
+                nltk.download(name, quiet=True)
+        _english_stopwords = set(nltk.corpus.stopwords.words('english'))
+    return _english_stopwords
+
+
+# 언어 코드 (detect_languages가 반환하는 int8 배열의 값)
+LANG_ETC, LANG_KO, LANG_EN = 0, 1, 2
+LANGUAGE_LABELS = ('etc', 'ko', 'en')
+
+MAX_TOKENIZE_CHARS = 2000  # 토큰화 전 리뷰 최대 길이 (초과분은 잘라냄)
+
+_BBCODE_RE = re.compile(r'\[/?[a-zA-Z*][^\[\]]*\]')
+_URL_RE = re.compile(r'(?:https?://|www\.)\S+')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def normalize_review_text(text, max_chars=MAX_TOKENIZE_CHARS):
+    """BBCode 태그/URL 제거, 공백 정리 후 max_chars로 자르기"""
+    if not isinstance(text, str):
+        return ''
+    text = _URL_RE.sub(' ', _BBCODE_RE.sub(' ', text))
+    return _SPACE_RE.sub(' ', text).strip()[:max_chars]
+
+
+def detect_languages(texts):
+    """
+    여러 텍스트의 언어를 한 번에 판별하여 np.int8 배열(LANG_*)로 반환
+    전체 텍스트를 하나의 코드포인트 배열로 만들어 한글/영문 글자 수를 한 번에 계산
+    한글 또는 영문 비율이 60%를 넘으면 해당 언어, 아니면 LANG_ETC
+    """
+    texts = [text if isinstance(text, str) else '' for text in texts]
+    if not texts:
+        return np.zeros(0, dtype=np.int8)
+
+    codepoints = np.frombuffer(''.join(texts).encode('utf-32-le'), dtype=np.uint32)
+    lowered = codepoints | 0x20  # A-Z -> a-z
+    is_korean = (codepoints >= 0xAC00) & (codepoints <= 0xD7A3)  # 가-힣
+    is_english = (lowered >= ord('a')) & (lowered <= ord('z'))
+
+    # 누적합으로 텍스트별 구간 합 계산 (빈 문자열도 안전)
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    korean_cum = np.concatenate(([0], np.cumsum(is_korean, dtype=np.int64)))
+    english_cum = np.concatenate(([0], np.cumsum(is_english, dtype=np.int64)))
+    korean_chars = korean_cum[ends] - korean_cum[starts]
+    english_chars = english_cum[ends] - english_cum[starts]
+    total_chars = korean_chars + english_chars
+
+    labels = np.full(len(texts), LANG_ETC, dtype=np.int8)
+    labels[(english_chars * 5 > total_chars * 3) & (total_chars > 0)] = LANG_EN
+    labels[(korean_chars * 5 > total_chars * 3) & (total_chars > 0)] = LANG_KO
+    return labels
+
+
+def detect_language(text):
+    """텍스트의 언어를 감지 (한글/영어)"""
+    if not isinstance(text, str):
+        return 'etc'
+    return LANGUAGE_LABELS[detect_languages([text])[0]]
+
+# 한국어 불용어
+KOREAN_STOP_WORDS = {
+    # 기본 불용어
+    '게임', '겜', '중', '것', '등', '듯', '때', '나', '좀', '네', '예', 
+    '더', '수', '말', '개', '달', '전', '분', '시간', '이번', '그냥',
+    '정도', '처음', '다음', '이후', '진짜', '계속', '많이', '이거',
+    '저거', '근데', '그리고', '하나', '이제', '그때', '이런', '그런',
+    '무슨', '어떤', '같은', '요즘', '매우', '약간', '조금', '보고',
+    # 조사/어미/접속사
+    '가', '이', '을', '를', '에', '의', '로', '와', '과', '은', '는',
+    '께서', '에서', '으로', '처럼', '만큼', '까지', '부터', '이나', '나',
+    '고', '라고', '하고', '하면', '하니', '하지만', '하더라도', '하여',
+    '이고', '이면', '이니', '이지만', '이더라도', '이며', '이야', '랑',
+    # 대명사
+    '나', '너', '우리', '저희', '당신', '그', '그녀', '그들', '저', '이',
+    '저것', '이것', '그것', '여기', '저기', '거기', '어디', '누구',
+    # 부사
+    '매우', '정말', '너무', '아주', '잘', '더', '덜', '많이', '조금',
+    '그냥', '바로', '자주', '이미', '아직', '드디어', '마침내', '결국',
+    # 형용사/동사 기본형
+    '좋다', '나쁘다', '크다', '작다', '많다', '적다', '되다', '하다',
+    '이다', '있다', '없다', '가다', '오다', '주다', '받다', '보다',
+    # 게임 관련 기본 용어
+    '플레이', '스팀', '유저', '버전', '패치', '업데이트', '출시', '평가',
+    '리뷰', '추천', '비추천', '가격', '원', '시작', '설치', '실행', '구매',
+    '환불', '시즌', '다운로드', '접속', '로딩', '버그', '오류', '생각',
+    '느낌', '때문', '이유', '경우', '관련', '현재', '계정', '시스템',
+    # 시간 관련
+    '년', '월', '일', '시', '분', '초', '전', '후', '동안', '오늘',
+    '어제', '내일', '모레', '언제', '이번', '저번', '다음', '이후',
+    # 수량 관련
+    '하나', '둘', '셋', '넷', '다섯', '여섯', '일곱', '여덟', '아홉',
+    '열', '백', '천', '만', '억', '조', '몇', '얼마', '많은', '적은',
+    # 접속/연결어
+    '그리고', '하지만', '또는', '또한', '그러나', '그래서', '따라서',
+    '그러므로', '그런데', '그리하여', '하여', '또', '혹은', '및'
+}
+
+# 영어 불용어
+ENGLISH_STOP_WORDS = {
+    'the', 'be', 'to', 'of', 'and', 'a', 'in', 'that', 'have', 'i',
+    'it', 'for', 'not', 'on', 'with', 'he', 'as', 'you', 'do', 'at',
+    'this', 'but', 'his', 'by', 'from', 'they', 'we', 'say', 'her',
+    'she', 'or', 'an', 'will', 'my', 'one', 'all', 'would', 'there',
+    'their', 'what', 'so', 'up', 'out', 'if', 'about', 'who', 'get',
+    'which', 'go', 'me', 'game', 'play', 'games', 'playing', 'played',
+    'steam', 'user', 'version', 'patch', 'update', 'release', 'also', 'etc'
+}
+# 토큰화 규칙이 바뀌면 캐시가 무효화되도록 불용어 목록을 버전에 포함
+TOKENIZER_VERSION = '2-' + hashlib.sha1(
+    '|'.join(sorted(KOREAN_STOP_WORDS) + sorted(ENGLISH_STOP_WORDS)).encode('utf-8')
+).hexdigest()[:8]
+
+
+def simple_tokenize_ko(text):
+    """한글 텍스트 토큰화"""
+    try:
+        # 명사, 형용사, 동사만 추출
+        tokens = _get_okt().pos(text, norm=True, stem=True)
+        words = [word for word, pos in tokens if pos in ['Noun', 'Adjective', 'Verb']]
+        # 2글자 이상이고 불용어가 아닌 단어만 선택
+        return [w for w in words if len(w) > 1 and w not in KOREAN_STOP_WORDS]
+    except Exception as e:
+        print(f"[ERROR] 한글 토큰화 실패: {str(e)}")
+        return []
+
+def simple_tokenize_en(text):
+    """영어 텍스트 토큰화"""
+    try:
+        stopwords = _get_english_stopwords()
+        # 단어 토큰화 및 소문자 변환
+        words = nltk.word_tokenize(text.lower())
+        # 불용어 및 특수문자 제거, 2글자 이상 단어만 선택
+        return [w for w in words if w.isalnum() and len(w) > 2 and w not in stopwords]
+    except Exception as e:
+        print(f"[ERROR] 영어 토큰화 실패: {str(e)}")
+        return []
+
+
+def tokenize_by_language(lang, text):
+    """detect_languages 결과(LANG_*)에 맞는 토크나이저 적용"""
+    if lang == LANG_KO:
+        return simple_tokenize_ko(text)
+    elif lang == LANG_EN:
+        return simple_tokenize_en(text)
+    return []
+
+
+def tokenize_review(text):
+    """정규화와 언어 감지 후 한글/영어 토큰화 (그 외 언어는 빈 리스트)"""
+    text = normalize_review_text(text)
+    return tokenize_by_language(detect_languages([text])[0], text)
+
+
+def _init_worker():
+    """프로세스 풀 워커 초기화: Okt(JVM)와 NLTK 자원을 미리 띄워 둠"""
+    _get_okt().pos('워커 준비', norm=True, stem=True)
+    _get_english_stopwords()
+
+
+def _tokenize_batch(items):
+    """워커에서 (언어 코드, 정규화된 텍스트) 묶음을 토큰화하여 토큰 리스트들을 반환"""
+    return [tokenize_by_language(lang, text) for lang, text in items]
+
+
+class _PendingResult:
+    """
+    result()를 처음 호출한 스레드에서 compute()를 실행해 결과를 돌려주는 Future 대용
+    (풀이 깨졌을 때의 순차 토큰화나 캐시 저장이 풀 관리 스레드가 아닌 결과를 기다리는 쪽에서 실행되도록)
+    """
+
+    def __init__(self, compute):
+        self._compute = compute
+        self._lock = threading.Lock()
+        self._value = None
+
+    def result(self):
+        with self._lock:
+            if self._compute is not None:
+                self._value = self._compute()
+                self._compute = None
+        return self._value
+
+
+class TokenizationEngine:
+    """
+    긍정/부정 리뷰를 한 번에 묶어 프로세스 풀에서 병렬 토큰화하는 엔진
+      - 워커마다 Okt(JVM)를 한 번만 띄우고 계속 재사용 (GIL/JNI 병목 회피)
+      - 워커는 spawn으로 필요할 때 띄우고 initializer(_init_worker)에서 Okt/NLTK를 한 번 준비
+        (spawn 워커는 부모의 __main__을 다시 import하므로 app.py는 라우트/서비스를 create_app() 안에서 import)
+      - 리뷰를 batch_size 단위로 나눠 워커에 분배
+      - cache(TokenCache)가 주어지면 이미 토큰화한 리뷰는 Okt/NLTK를 거치지 않음
+      - max_workers=0이거나 풀이 깨지면 결과를 기다리는 스레드에서 순차 처리
+    submit_*는 result()로 결과를 받는 객체를 반환
+    """
+
+    def __init__(self, max_workers=None, batch_size=64, cache=None):
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.cache = cache
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None and self.max_workers != 0:
+                # JPype JVM은 fork 이후 사용할 수 없으므로 spawn으로 워커 생성
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers or os.cpu_count() or 1,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker
+                )
+            return self._pool
+
+    def _disable_pool(self, error):
+        print(f"[ERROR] 토큰화 프로세스 풀 오류, 순차 처리로 전환: {str(error)}")
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self.max_workers = 0
+
+    def _batches(self, items):
+        for i in range(0, len(items), self.batch_size):
+            yield items[i:i + self.batch_size]
+
+    def _submit_tokenize(self, items):
+        """(언어 코드, 텍스트) 리스트의 토큰 리스트들을 같은 순서로 돌려주는 _PendingResult 반환"""
+        pool = self._get_pool()
+        if pool is None or not items:
+            return _PendingResult(lambda: _tokenize_batch(items))
+
+        batches = list(self._batches(items))
+        try:
+            futures = [pool.submit(_tokenize_batch, batch) for batch in batches]
+        except BrokenProcessPool as e:
+            self._disable_pool(e)
+            return self._submit_tokenize(items)
+
+        def collect():
+            results = []
+            for batch, future in zip(batches, futures):
+                try:
+                    results.extend(future.result())
+                except BrokenProcessPool as e:
+                    self._disable_pool(e)
+                    results.extend(_tokenize_batch(batch))
+                except Exception as e:
+                    print(f"[ERROR] 토큰화 배치 실패, 순차 처리로 재시도: {str(e)}")
+                    results.extend(_tokenize_batch(batch))
+            return results
+
+        return _PendingResult(collect)
+
+    def submit_tokens(self, items):
+        """
+        (text, review_id) 리스트의 토큰화를 비동기로 시작
+        result()가 입력과 같은 순서의 토큰 리스트들을 돌려주는 객체 반환
+        """
+        items = [(text if isinstance(text, str) else '', review_id) for text, review_id in items]
+        tokens = [None] * len(items)
+        if self.cache is not None and items:
+            try:
+                tokens = self.cache.get_many([(review_id, text) for text, review_id in items])
+            except Exception as e:
+                print(f"[ERROR] 토큰 캐시 조회 실패: {str(e)}")
+
+        missing = [i for i, cached in enumerate(tokens) if cached is None]
+
+        # 정규화/언어 감지는 한 번에 처리하고, 한글/영어 리뷰만 워커로 보냄
+        texts = [normalize_review_text(items[i][0]) for i in missing]
+        langs = detect_languages(texts)
+        to_tokenize = [j for j, lang in enumerate(langs) if lang != LANG_ETC]
+        for j in range(len(missing)):
+            tokens[missing[j]] = []
+        pending = self._submit_tokenize([(int(langs[j]), texts[j]) for j in to_tokenize])
+
+        def finish():
+            for j, new_tokens in zip(to_tokenize, pending.result()):
+                tokens[missing[j]] = new_tokens
+            if self.cache is not None and missing:
+                try:
+                    self.cache.put_many([(items[i][1], items[i][0], tokens[i]) for i in missing])
+                except Exception as e:
+                    print(f"[ERROR] 토큰 캐시 저장 실패: {str(e)}")
+            return tokens
+
+        return _PendingResult(finish)
+
+    def submit_counts(self, items):
+        """
+        (voted_up, text[, review_id]) 리스트의 토큰 빈도 집계를 비동기로 시작
+        result()가 (긍정 Counter, 부정 Counter)를 돌려주는 객체 반환
+        """
+        items = [
+            (item[0], item[1], item[2] if len(item) > 2 else None)
+            for item in items
+            if isinstance(item[1], str)
+        ]
+        pending = self.submit_tokens([(text, review_id) for _, text, review_id in items])
+
+        def finish():
+            pos_counter, neg_counter = Counter(), Counter()
+            for (voted_up, _, _), review_tokens in zip(items, pending.result()):
+                (pos_counter if voted_up else neg_counter).update(review_tokens)
+            return pos_counter, neg_counter
+
+        return _PendingResult(finish)
+
+    def count(self, positive_texts, negative_texts):
+        """긍정/부정 텍스트를 한 번에 토큰화하여 (긍정 Counter, 부정 Counter) 반환"""
+        items = [(True, text) for text in positive_texts] + [(False, text) for text in negative_texts]
+        return self.submit_counts(items).result()
+
+    def warm_up(self):
+        """워커 프로세스를 미리 띄워 첫 요청의 JVM 시작 지연을 없앰"""
+        pool = self._get_pool()
+        if pool is None:
+            _init_worker()
+            return
+        for future in [pool.submit(_init_worker) for _ in range(self.max_workers or os.cpu_count() or 1)]:
+            future.result()
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
@@ -4,61 +4,192 @@ from dotenv import load_dotenv
 load_dotenv()  # .env 파일 로드
 
 import os
-import chromadb
-from chromadb.config import Settings
-from chromadb.utils.embedding_functions import OpenAIEmbeddingFunction
+import threading
+import time
+from pathlib import Path
+from services.numpy_vector_store import NumpyVectorStore
+from services.index_bundle import BundleVectorStore, BundleError
+
+EMBEDDING_MODEL = "text-embedding-ada-002"
+
+# scripts/export_index_bundle.py가 만드는 읽기 전용 색인 번들 (cwd와 무관한 backend 기준 경로)
+BUNDLE_PATH = Path(__file__).resolve().parent.parent / "bundle" / "index.bundle"
+
+def _chroma_embedding_function(embedding_fn):
+    """embedding_fn을 chromadb EmbeddingFunction으로 감쌈 (chromadb가 입력/결과를 자체 형식으로 검사/변환하도록)"""
+    from chromadb.api.types import EmbeddingFunction
+
+    class ChromaEmbeddingFunction(EmbeddingFunction):
+        def __call__(self, input):
+            return embedding_fn(input)
+
+    return ChromaEmbeddingFunction()
 
 class VectorService:
-    def __init__(self, collection_name: str = "my_collection", persist_path: str = None):
+    def __init__(self, collection_name: str = "my_collection", persist_path: str = None, backend: str = None):
         """
         VectorService 초기화:
           - persist_path가 주어지지 않으면 환경변수 CHROMA_PERSIST_DIRECTORY 확인 후 기본값 ../vector_store 사용
           - 절대 경로로 변환 후, 디렉터리가 없으면 생성
-          - chromadb.Client를 is_persistent=True로 설정하여 실제 디스크에 데이터가 저장되도록 함
+          - backend (기본값: 환경변수 VECTOR_BACKEND, 없으면 "chroma")
+            - "chroma": chromadb.Client를 is_persistent=True로 설정하여 실제 디스크에 데이터가 저장되도록 함
+            - "numpy": persist_path/numpy/<collection_name>의 memory-map 행렬 색인 (NumpyVectorStore)
+              시작이 빠르고 여러 워커 프로세스가 같은 색인을 page cache로 공유
+              VECTOR_QUANTIZATION(int8/pq)을 설정하면 양자화 근사 검색 + 정확한 재채점
+            - "bundle": VECTOR_BUNDLE_PATH(기본값 backend/bundle/index.bundle) 번들을 읽기 전용으로 memory-map
+              디스크에 쓰지 않으므로 서버리스(Vercel) 배포용, 열 때 체크섬 확인 (VECTOR_BUNDLE_VERIFY=0이면 생략)
         """
+        if backend is None:
+            backend = os.getenv("VECTOR_BACKEND", "chroma")
+        if backend not in ("chroma", "numpy", "bundle"):
+            raise ValueError(f"Unknown vector backend: {backend}")
+        self.backend = backend
+
         if persist_path is None:
             persist_path = os.getenv("CHROMA_PERSIST_DIRECTORY", "../vector_store")
         
         # 절대 경로 변환
         persist_path = os.path.abspath(persist_path)
 
-        # 디렉터리가 존재하지 않을 경우 생성
-        os.makedirs(persist_path, exist_ok=True)
+        # 디렉터리가 존재하지 않을 경우 생성 (번들은 읽기 전용 파일 시스템에서도 열 수 있도록 생략)
+        if backend != "bundle":
+            os.makedirs(persist_path, exist_ok=True)
 
         # 환경변수에 persist_path 설정 (디버깅용)
         os.environ["CHROMA_PERSIST_DIRECTORY"] = persist_path
+        self.persist_path = persist_path
 
-        # ChromaDB Client 생성 (퍼시스턴트 모드)
-        self.client = chromadb.Client(
-            Settings(
-                is_persistent=True,
-                persist_directory=persist_path
-            )
+        # 컬렉션이 바뀔 때마다 갱신되는 인덱스 버전 파일 (다른 프로세스의 재인덱싱도 감지하기 위해 디스크에 기록)
+        self.version_path = os.path.join(persist_path, "index_version")
+
+        # OpenAI 임베딩 함수 설정 (openai 클라이언트 직접 사용 - chromadb는 chroma 백엔드에서만 필요)
+        # EMBEDDING_OFFLINE=1이면 API를 호출하지 않고 캐시된 임베딩만 사용 (테스트/오프라인 환경)
+        from services.embedding_cache import (
+            EmbeddingCache, CachedEmbeddingFunction, OpenAIEmbeddingFunction, EMBEDDING_CACHE_DIR
         )
 
-        # OpenAI 임베딩 함수 설정
         openai_api_key = os.getenv("OPENAI_API_KEY")
-        if openai_api_key is None:
+        offline = os.getenv("EMBEDDING_OFFLINE", "0") == "1"
+        if openai_api_key is None and not offline:
             raise RuntimeError("OPENAI_API_KEY is not set in environment variables")
 
-        self.embedding_fn = OpenAIEmbeddingFunction(
+        self.embedding_fn = None if offline else OpenAIEmbeddingFunction(
             api_key=openai_api_key,
-            model_name="text-embedding-ada-002"
+            model_name=EMBEDDING_MODEL
         )
 
-        # 컬렉션 가져오기/생성 (임베딩 함수 등록)
-        self.collection = self.client.get_or_create_collection(
-            name=collection_name,
-            embedding_function=self.embedding_fn
-        )
+        # 임베딩 디스크 캐시 (모델 + 텍스트 해시 기준) - 재인덱싱/반복 질의 시 API 호출 생략
+        # EMBEDDING_CACHE_ENABLED=0이면 사용하지 않음
+        self.embedding_cache = None
+        if os.getenv("EMBEDDING_CACHE_ENABLED", "1") != "0":
+            try:
+                self.embedding_cache = EmbeddingCache(os.getenv("EMBEDDING_CACHE_DIR", EMBEDDING_CACHE_DIR), EMBEDDING_MODEL)
+            except OSError as e:
+                # 읽기 전용 파일 시스템(서버리스 등) - 캐시 없이 동작
+                print(f"[WARNING] 임베딩 캐시를 사용할 수 없습니다: {str(e)}")
+        if self.embedding_cache is not None:
+            self.embedding_fn = CachedEmbeddingFunction(self.embedding_fn, self.embedding_cache)
+        elif offline:
+            raise RuntimeError("EMBEDDING_OFFLINE requires the embedding cache")
+
+        if backend == "bundle":
+            self.client = None
+            self.store_path = os.getenv("VECTOR_BUNDLE_PATH", str(BUNDLE_PATH))
+            self.collection = BundleVectorStore(
+                self.store_path,
+                embedding_function=self.embedding_fn,
+                verify=os.getenv("VECTOR_BUNDLE_VERIFY", "1") != "0"
+            )
+            if self.collection.header.get("model") not in (None, EMBEDDING_MODEL):
+                raise BundleError(
+                    f"번들 임베딩 모델({self.collection.header['model']})이 현재 모델({EMBEDDING_MODEL})과 다릅니다"
+                )
+        elif backend == "numpy":
+            self.client = None
+            self.store_path = os.path.join(persist_path, "numpy", collection_name)
+            # VECTOR_QUANTIZATION=int8|pq: 양자화 코드로 근사 검색 후 후보만 float32로 재채점
+            self.collection = NumpyVectorStore(
+                self.store_path,
+                embedding_function=self.embedding_fn,
+                quantization=os.getenv("VECTOR_QUANTIZATION") or None,
+                rerank_factor=int(os.getenv("VECTOR_RERANK_FACTOR", 10))
+            )
+        else:
+            # chromadb는 import만으로 수 초가 걸리므로 chroma 백엔드에서만 불러옴 (numpy/bundle은 chromadb 없이 동작)
+            import chromadb
+            from chromadb.config import Settings
+
+            # ChromaDB Client 생성 (퍼시스턴트 모드)
+            self.client = chromadb.Client(
+                Settings(
+                    is_persistent=True,
+                    persist_directory=persist_path
+                )
+            )
+            self.store_path = persist_path
+
+            # 컬렉션 가져오기/생성 (임베딩 함수 등록)
+            self.collection = self.client.get_or_create_collection(
+                name=collection_name,
+                embedding_function=_chroma_embedding_function(self.embedding_fn)
+            )
 
-    def add_documents(self, documents: list[str], metadatas: list[dict] = None, ids: list[str] = None):
-        """여러 개의 문서를 한 번에 추가"""
+    def add_documents(self, documents: list[str], metadatas: list[dict] = None, ids: list[str] = None,
+                      embeddings: list[list[float]] = None):
+        """여러 개의 문서를 한 번에 추가 (embeddings를 주면 임베딩 함수를 다시 호출하지 않음)"""
         if metadatas is None:
             metadatas = [{}] * len(documents)
         if ids is None:
             ids = [f"id_{i}" for i in range(len(documents))]
-        self.collection.add(documents=documents, metadatas=metadatas, ids=ids)
+        self.collection.add(documents=documents, metadatas=metadatas, ids=ids, embeddings=embeddings)
+        self.bump_index_version()
+
+    def upsert_documents(self, documents: list[str], metadatas: list[dict], ids: list[str],
+                         embeddings: list[list[float]] = None):
+        """문서 추가 또는 같은 id의 기존 문서 교체"""
+        self.collection.upsert(documents=documents, metadatas=metadatas, ids=ids, embeddings=embeddings)
+        self.bump_index_version()
+
+    def delete_documents(self, ids: list[str]):
+        """id 목록의 문서 삭제"""
+        if ids:
+            self.collection.delete(ids=ids)
+            self.bump_index_version()
+
+    def get_documents(self, ids: list[str]):
+        """id 목록의 문서 본문/메타데이터 ({"ids", "documents", "metadatas"}, 없는 id는 제외)"""
+        return self.collection.get(ids=ids, include=["documents", "metadatas"])
+
+    def list_ids(self) -> list[str]:
+        """컬렉션에 저장된 모든 문서 id"""
+        return self.collection.get(include=[])["ids"]
+
+    def index_version(self) -> str:
+        """현재 인덱스 버전 (문서 추가/초기화 시 바뀜, 답변 캐시 무효화에 사용)"""
+        if self.backend == "bundle":
+            return self.collection.version
+        try:
+            with open(self.version_path, "r", encoding="utf-8") as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return "0"
+
+    def bump_index_version(self):
+        with open(self.version_path, "w", encoding="utf-8") as f:
+            f.write(str(time.time_ns()))
+
+    def embed(self, text: str):
+        """단일 텍스트 임베딩 (query에 query_embedding으로 넘기면 같은 요청에서 다시 임베딩하지 않음)"""
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: list[str], batch_size: int = None):
+        """여러 텍스트를 임베딩 API 요청 한 번으로 임베딩 (batch_size가 주어지면 그 크기씩 나눠 요청)"""
+        if batch_size is None:
+            batch_size = max(len(texts), 1)
+        embeddings = []
+        for start in range(0, len(texts), batch_size):
+            embeddings.extend(list(embedding) for embedding in self.embedding_fn(texts[start:start + batch_size]))
+        return embeddings
 
     def add_document(self, doc_id: str, content: str, metadata: dict):
         """단일 문서 추가 (doc_id, content, metadata)"""
@@ -69,15 +200,114 @@ class VectorService:
             print(f"Error adding document {doc_id}: {e}")
             return False
 
-    def query(self, query_text: str, top_k: int = 5):
-        """쿼리 텍스트에 가장 유사한 문서 top_k개 반환"""
+    def query(self, query_text: str, top_k: int = 5, query_embedding=None):
+        """쿼리 텍스트에 가장 유사한 문서 top_k개 반환 (query_embedding이 있으면 임베딩 호출 생략)"""
+        if query_embedding is not None:
+            return self.collection.query(query_embeddings=[query_embedding], n_results=top_k)
         results = self.collection.query(query_texts=[query_text], n_results=top_k)
         return results
 
+    def query_many(self, query_texts: list[str], top_k: int = 5, include: list[str] = None, query_embeddings=None):
+        """
+        여러 질의를 한 번에 검색 (임베딩 요청 한 번 + 일괄 유사도 검색)
+        include: documents / metadatas / distances 중 반환할 항목 (기본값: 전부)
+        distances는 모든 백엔드에서 제곱 L2 거리 (Chroma 기본 공간, 정규화된 임베딩이면 2 - 2 * 코사인 유사도)
+        반환 형식은 query()와 같음 ({"ids": [[...], ...], "documents": [[...], ...], ...})
+        """
+        if include is None:
+            include = ["documents", "metadatas", "distances"]
+        if query_embeddings is None:
+            query_embeddings = self.embed_many(query_texts)
+        return self.collection.query(query_embeddings=query_embeddings, n_results=top_k, include=include)
+
     def reset(self):
         """컬렉션 전체 초기화"""
-        self.client.reset()
+        if self.client is None:
+            self.collection.reset()
+        else:
+            self.client.reset()
+        self.bump_index_version()
+
+
+class LazyVectorService:
+    """
+    처음 사용할 때 VectorService를 만드는 전역 인스턴스용 래퍼
+      - import 시점에는 Chroma/OpenAI 설정이 필요 없음 (리뷰 blueprint만 쓰는 도구도 import 가능)
+      - 여러 요청 스레드가 동시에 처음 사용해도 lock으로 한 번만 생성, 실패하면 다음 사용 시 다시 시도
+      - warm_up(): 색인 미리 읽기 + 자주 쓰는 질의 임베딩 준비, status(): 준비 상태 (readiness 확인용)
+    VectorService의 속성/메서드는 그대로 위임
+    """
+
+    def __init__(self, factory=VectorService):
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+        self._load_seconds = None
+        self._warmup = None  # warm_up() 결과
+        self._warming = False
+        self._error = None
+
+    def get(self) -> VectorService:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    start = time.perf_counter()
+                    try:
+                        self._instance = self._factory()
+                    except Exception as e:
+                        self._error = str(e)
+                        raise
+                    self._load_seconds = time.perf_counter() - start
+                    self._error = None
+        return self._instance
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+    def warm_up(self, queries=()):
+        """
+        색인을 열고 첫 질의가 느리지 않도록 미리 읽기
+          - numpy/bundle: 행렬 페이지를 메모리에 올림, chroma: 저장된 벡터 하나로 질의해 HNSW 색인 로드
+          - queries: 자주 들어오는 질문 (임베딩 캐시에 미리 저장)
+        """
+        self._warming = True
+        start = time.perf_counter()
+        try:
+            service = self.get()
+            collection = service.collection
+            count = collection.count()
+            if hasattr(collection, "preload"):
+                collection.preload()
+            elif count:
+                sample = collection.peek(1)
+                collection.query(query_embeddings=[list(sample["embeddings"][0])], n_results=1)
+            if queries:
+                service.embed_many(list(queries))
+            self._warmup = {"count": count, "queries": len(queries), "seconds": round(time.perf_counter() - start, 4)}
+        except Exception as e:
+            self._error = str(e)
+            print(f"[ERROR] 벡터 색인 warm-up 실패: {str(e)}")
+            raise
+        finally:
+            self._warming = False
+        return self._warmup
+
+    def status(self):
+        """준비 상태 (ready: warm-up까지 끝나 바로 질의할 수 있음)"""
+        status = {
+            "ready": self._warmup is not None,
+            "initialized": self._instance is not None,
+            "warming": self._warming,
+            "load_seconds": round(self._load_seconds, 4) if self._load_seconds is not None else None,
+            "warmup": self._warmup,
+            "error": self._error,
+        }
+        if self._instance is not None:
+            status["backend"] = self._instance.backend
+            status["count"] = self._instance.collection.count()
+            status["index_version"] = self._instance.index_version()
+        return status
 
 
-# 싱글톤처럼 재사용할 수 있는 전역 인스턴스
-vector_service = VectorService()
\ No newline at end of file
+# 싱글톤처럼 재사용할 수 있는 전역 인스턴스 (처음 사용할 때 생성)
+vector_service = LazyVectorService()
\ No newline at end of file
@@ -0,0 +1,93 @@
+# services/wordcloud_renderer.py
+
+import base64
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+from wordcloud import WordCloud
+
+WORDCLOUD_FORMATS = ('png', 'webp', 'layout')
+
+
+class WordCloudRenderer:
+    """
+    단어 빈도 -> 워드클라우드 변환기 (matplotlib 없이 PIL로 바로 인코딩)
+      - png / webp: base64 인코딩된 이미지 문자열
+      - layout: 클라이언트가 직접 그릴 수 있는 단어/크기/위치 JSON
+    같은 빈도 dict와 크기/형식의 결과는 LRU로 메모이즈 (random_state 고정으로 결과가 항상 같음)
+    """
+
+    def __init__(self, font_path, max_entries=64, scale=1):
+        self.font_path = font_path
+        self.max_entries = max_entries
+        self.scale = scale  # 이미지 해상도 배율 (레이아웃 계산 비용은 동일)
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(word_freq, width, height, fmt):
+        raw = json.dumps(sorted(word_freq.items()), ensure_ascii=False)
+        return hashlib.sha1(f"{width}x{height}:{fmt}:{raw}".encode('utf-8')).hexdigest()
+
+    def render(self, word_freq, width=400, height=200, fmt='png'):
+        """워드클라우드 생성 (빈도가 없으면 None)"""
+        if not word_freq:
+            return None
+        if fmt not in WORDCLOUD_FORMATS:
+            raise ValueError(f"Unsupported wordcloud format: {fmt}")
+
+        key = self._cache_key(word_freq, width, height, fmt)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        wc = WordCloud(
+            width=width,
+            height=height,
+            scale=self.scale,
+            background_color='white',
+            font_path=self.font_path,
+            min_font_size=10,
+            max_font_size=100,
+            random_state=0
+        )
+        wc.generate_from_frequencies(word_freq)
+        result = self._layout(wc, word_freq, width, height) if fmt == 'layout' else self._encode(wc, fmt)
+
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _encode(wc, fmt):
+        buf = io.BytesIO()
+        image = wc.to_image()
+        if fmt == 'webp':
+            image.save(buf, format='WEBP', quality=80, method=4)
+        else:
+            image.save(buf, format='PNG')
+        return base64.b64encode(buf.getvalue()).decode()
+
+    @staticmethod
+    def _layout(wc, word_freq, width, height):
+        """WordCloud.layout_를 JSON으로 변환 (x, y는 단어 상자의 좌상단)"""
+        words = []
+        for (word, weight), font_size, (row, col), orientation, color in wc.layout_:
+            words.append({
+                'text': word,
+                'freq': int(word_freq.get(word, 0)),
+                'weight': round(float(weight), 4),
+                'size': int(font_size),
+                'x': int(col),
+                'y': int(row),
+                'rotate': orientation == Image.ROTATE_90,  # 90도 회전 (아래에서 위로 읽힘)
+                'color': color
+            })
+        return {'width': width, 'height': height, 'words': words}
@@ -0,0 +1,7 @@
+# tests/conftest.py
+
+import os
+import sys
+
+# backend 폴더를 Python 경로에 추가 (앱과 같은 방식으로 services.* import)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -0,0 +1,51 @@
+# tests/test_entity_index.py
+
+import os
+
+from services.entity_index import ALIAS_FILE, EntityIndex, entity_aliases, load_alias_map
+from services.hybrid_search import DATA_DIR, load_corpus
+
+
+def doc(doc_id, source_file, keywords=(), chunk_index=0):
+    return (doc_id, 'content', list(keywords), source_file, chunk_index)
+
+
+def test_entity_aliases_split_names():
+    assert set(entity_aliases('Black Tortoise, 玄武')) == {'black tortoise, 玄武', 'black tortoise', '玄武'}
+    assert 'grand general' in entity_aliases('Wuun Lionel, the Grand General Story')
+    assert entity_aliases('result_140') == []
+
+
+def test_latin_alias_matches_on_word_boundary_only():
+    index = EntityIndex().build([doc('mu_0', 'Eye of Mu.json', ['Mud'])])
+    assert index.match('Who is Mud?') == ['mud']
+    assert index.match('muddy water') == []
+
+
+def test_hangul_alias_matches_with_particle_and_longest_first(tmp_path):
+    alias_file = tmp_path / ALIAS_FILE
+    alias_file.write_text('# 주석\nCrazy Ivan\t크레이지 이반\nCrazy Ivan Captain\t크레이지 이반 선동자\n잘못된 줄\n', encoding='utf-8')
+    index = EntityIndex().build(
+        [doc('ivan_0', 'Crazy Ivan.json'), doc('captain_0', 'Crazy Ivan Captain.json')],
+        load_alias_map(alias_file)
+    )
+    assert index.match('크레이지 이반 선동자는 누구야?') == ['크레이지 이반 선동자']
+    assert index.match('크레이지 이반이 뭐야?') == ['크레이지 이반']
+    assert index.entities['크레이지 이반'] == ['ivan_0']
+
+
+def test_generic_keyword_is_excluded():
+    documents = [doc(f'doc_{i}', f'Entity {i}.json', ['story']) for i in range(4)]
+    index = EntityIndex().build(documents)
+    assert 'story' not in index.entities
+    assert index.match('entity 1 story') == ['entity 1']
+
+
+def test_missing_alias_file_is_empty(tmp_path):
+    assert load_alias_map(tmp_path / ALIAS_FILE) == {}
+
+
+def test_hangul_question_finds_data_entity():
+    index = EntityIndex().build(load_corpus(), load_alias_map(os.path.join(DATA_DIR, ALIAS_FILE)))
+    assert index.match('펜릴이 누구야?') == ['펜릴']
+    assert index.entities['펜릴'] == ['Penril_0000']
@@ -0,0 +1,118 @@
+# tests/test_hybrid_search.py
+
+import json
+import math
+from collections import Counter
+
+import pytest
+
+from services.entity_index import ALIAS_FILE
+from services.hybrid_search import BM25Index, HybridRetriever, load_corpus, reciprocal_rank_fusion, tokenize
+
+DOCUMENTS = [
+    ('lore_0', 'The black tortoise guards the northern gate', ['Black Tortoise'], 'a.json', 0),
+    ('lore_1', 'Goblins attack the northern village at night', [], 'b.json', 0),
+    ('lore_2', '펜릴은 독샘의 주인이라고 불리는 루가루이다', ['Penril'], 'c.json', 0),
+    ('lore_3', 'A quiet village with a tortoise statue', [], 'd.json', 0),
+]
+
+
+def reference_bm25(query, documents, k1=1.2, b=0.75, boost=3):
+    term_freqs = []
+    for _, content, keywords, *_ in documents:
+        tf = Counter(tokenize(content))
+        for keyword in keywords:
+            for token in tokenize(keyword):
+                tf[token] += boost
+        term_freqs.append(tf)
+    average = sum(sum(tf.values()) for tf in term_freqs) / len(term_freqs)
+    scores = []
+    for tf in term_freqs:
+        length = sum(tf.values())
+        score = 0.0
+        for term in set(tokenize(query)):
+            containing = sum(term in other for other in term_freqs)
+            if not tf[term]:
+                continue
+            idf = math.log(1 + (len(term_freqs) - containing + 0.5) / (containing + 0.5))
+            score += idf * tf[term] * (k1 + 1) / (tf[term] + k1 * (1 - b + b * length / average))
+        scores.append(score)
+    return scores
+
+
+def test_tokenize_uses_hangul_bigrams():
+    assert tokenize('펜릴이 Black-Tortoise 2') == ['펜릴', '릴이', 'black', 'tortoise', '2']
+
+
+def test_bm25_matches_reference_formula():
+    index = BM25Index().build(DOCUMENTS)
+    for query in ('northern tortoise', '펜릴 루가루', 'village'):
+        reference = reference_bm25(query, DOCUMENTS)
+        results = index.search(query, top_k=len(DOCUMENTS))
+        expected = sorted((i for i, score in enumerate(reference) if score > 0), key=lambda i: -reference[i])
+        assert [doc_id for doc_id, _ in results] == [DOCUMENTS[i][0] for i in expected]
+        for doc_id, score in results:
+            assert score == pytest.approx(reference[[doc[0] for doc in DOCUMENTS].index(doc_id)], rel=1e-5)
+    assert index.search('unknown words') == []
+
+
+def test_keyword_boost_ranks_entity_document_first():
+    results = BM25Index().build(DOCUMENTS).search('tortoise', top_k=2)
+    assert [doc_id for doc_id, _ in results] == ['lore_0', 'lore_3']
+
+
+def test_reciprocal_rank_fusion():
+    # c: 1/63 + 1/61 > b: 1/62 + 1/62 > a: 1/61 > d: 1/63
+    assert reciprocal_rank_fusion([['a', 'b', 'c'], ['c', 'b', 'd']], k=60) == ['c', 'b', 'a', 'd']
+    # 동점은 doc_id 순서
+    assert reciprocal_rank_fusion([['y'], ['x']]) == ['x', 'y']
+
+
+class FakeVectorService:
+    def __init__(self, documents):
+        self.documents = {doc_id: content for doc_id, content, *_ in documents}
+        self.vector_ids = []
+
+    def query(self, query_text, top_k=5, query_embedding=None):
+        ids = self.vector_ids[:top_k]
+        return {"ids": [ids], "documents": [[self.documents[i] for i in ids]], "metadatas": [[{} for _ in ids]]}
+
+    def get_documents(self, ids):
+        ids = [doc_id for doc_id in ids if doc_id in self.documents]
+        return {"ids": ids, "documents": [self.documents[i] for i in ids], "metadatas": [{} for _ in ids]}
+
+
+def write_data(path, documents):
+    for doc_id, content, keywords, source_file, chunk_index in documents:
+        with open(path / source_file, "w", encoding="utf-8") as f:
+            json.dump([{"id": doc_id, "content": content,
+                        "metadata": {"keywords": keywords, "chunk_index": chunk_index}}], f, ensure_ascii=False)
+
+
+def test_load_corpus_reads_keywords_and_aliases(tmp_path):
+    (tmp_path / "e.json").write_text(json.dumps([
+        {"id": "e_0", "content": "text", "metadata": {"keywords": "A, B", "aliases": ["C"]}},
+        {"id": "", "content": "no id"},
+    ]), encoding="utf-8")
+    (tmp_path / "broken.json").write_text("{", encoding="utf-8")
+    assert load_corpus(tmp_path) == [("e_0", "text", ["A", "B", "C"], "e.json", 0)]
+
+
+def test_hybrid_query_fuses_vector_and_keyword_results(tmp_path):
+    write_data(tmp_path, DOCUMENTS)
+    vectors = FakeVectorService(DOCUMENTS)
+    vectors.vector_ids = ['lore_1', 'lore_0']
+    retriever = HybridRetriever(vectors, data_directory=tmp_path, candidates=4)
+
+    results = retriever.query('tortoise', top_k=3, index_version='1')
+    assert results["ids"] == [['lore_0', 'lore_1', 'lore_3']]
+    assert results["documents"][0][2] == DOCUMENTS[3][1]  # 키워드로만 찾은 문서는 저장소에서 본문 조회
+    assert retriever.status()["ready"] and retriever.status()["documents"] == 4
+
+    assert retriever.entity_query('Who is Penril?', index_version='1')["ids"] == [['lore_2']]
+    assert retriever.entity_query('펜릴은 누구야?', index_version='1') is None
+
+    # 별칭 파일은 색인을 다시 만들 때(index_version 변경) 반영
+    (tmp_path / ALIAS_FILE).write_text('Penril\t펜릴\n', encoding='utf-8')
+    entity = retriever.entity_query('펜릴은 누구야?', index_version='2')
+    assert entity["ids"] == [['lore_2']] and entity["entities"] == ['펜릴']
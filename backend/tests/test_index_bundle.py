@@ -0,0 +1,100 @@
+# tests/test_index_bundle.py
+
+import json
+import struct
+
+import numpy as np
+import pytest
+
+from services.index_bundle import ALIGN, MAGIC, BundleError, BundleVectorStore, export_bundle, read_header
+from services.numpy_vector_store import NumpyVectorStore
+
+
+def make_store(path, order=None, count=40, dimension=12):
+    vectors = np.random.default_rng(0).normal(size=(count, dimension)).astype(np.float32)
+    order = list(range(count)) if order is None else order
+    store = NumpyVectorStore(str(path))
+    store.add(documents=[f'doc {i}' for i in order], metadatas=[{'i': i} for i in order],
+              ids=[f'id_{i:02d}' for i in order], embeddings=vectors[order].tolist())
+    return store, vectors
+
+
+def test_bundle_answers_like_source_store(tmp_path):
+    store, vectors = make_store(tmp_path / 'store')
+    header = export_bundle(store, str(tmp_path / 'index.bundle'), model_name='test-model')
+    assert header['count'] == 40 and header['dimension'] == 12 and header['model'] == 'test-model'
+    assert all(section['offset'] % ALIGN == 0 for section in header['sections'].values())
+
+    bundle = BundleVectorStore(str(tmp_path / 'index.bundle'))
+    assert bundle.version == header['version'] and bundle.count() == 40
+    queries = np.random.default_rng(1).normal(size=(5, 12)).tolist()
+    expected = store.query(query_embeddings=queries, n_results=5)
+    found = bundle.query(query_embeddings=queries, n_results=5)
+    assert found['ids'] == expected['ids'] and found['metadatas'] == expected['metadatas']
+    np.testing.assert_allclose(found['distances'], expected['distances'], atol=1e-6)
+    assert bundle.get(ids=['id_03'])['documents'] == ['doc 3']
+
+
+def test_version_depends_only_on_content(tmp_path):
+    first, _ = make_store(tmp_path / 'a')
+    second, _ = make_store(tmp_path / 'b', order=list(reversed(range(40))))
+    version = export_bundle(first, str(tmp_path / 'a.bundle'))['version']
+    assert export_bundle(second, str(tmp_path / 'b.bundle'))['version'] == version
+
+    second.delete(ids=['id_00'])
+    assert export_bundle(second, str(tmp_path / 'c.bundle'))['version'] != version
+
+
+def corrupt(path, offset):
+    with open(path, 'r+b') as f:
+        f.seek(offset)
+        byte = f.read(1)
+        f.seek(offset)
+        f.write(bytes([byte[0] ^ 0xFF]))
+
+
+def test_checksum_mismatch_is_rejected(tmp_path):
+    store, _ = make_store(tmp_path / 'store')
+    path = str(tmp_path / 'index.bundle')
+    header = export_bundle(store, path)
+    corrupt(path, header['sections']['vectors']['offset'] + 5)
+
+    with pytest.raises(BundleError, match='vectors'):
+        BundleVectorStore(path)
+    # verify=False이면 체크섬을 확인하지 않고 열림
+    assert BundleVectorStore(path, verify=False).count() == 40
+
+
+def test_truncated_and_foreign_files_are_rejected(tmp_path):
+    store, _ = make_store(tmp_path / 'store')
+    path = str(tmp_path / 'index.bundle')
+    export_bundle(store, path)
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    with open(path, 'wb') as f:
+        f.write(data[:-10])
+    with pytest.raises(BundleError, match='잘렸습니다'):
+        BundleVectorStore(path)
+
+    (tmp_path / 'other.bin').write_bytes(b'not a bundle at all')
+    with pytest.raises(BundleError):
+        read_header(str(tmp_path / 'other.bin'))
+
+    header = json.dumps({'format_version': 999}).encode()
+    (tmp_path / 'future.bundle').write_bytes(MAGIC + struct.pack('<Q', len(header)) + header)
+    with pytest.raises(BundleError):
+        read_header(str(tmp_path / 'future.bundle'))
+
+
+def test_bundle_is_read_only_and_empty_export_fails(tmp_path):
+    store, _ = make_store(tmp_path / 'store')
+    export_bundle(store, str(tmp_path / 'index.bundle'))
+    bundle = BundleVectorStore(str(tmp_path / 'index.bundle'))
+    with pytest.raises(BundleError):
+        bundle.add(documents=['x'], ids=['x'], embeddings=[[0.0] * 12])
+    with pytest.raises(BundleError):
+        bundle.delete(ids=['id_00'])
+
+    with pytest.raises(BundleError):
+        export_bundle(NumpyVectorStore(str(tmp_path / 'empty')), str(tmp_path / 'empty.bundle'))
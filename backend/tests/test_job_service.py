@@ -0,0 +1,144 @@
+# tests/test_job_service.py
+
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+
+from services.job_service import JobManager, JobQueueFull
+
+
+def wait_finished(manager, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get(job_id)
+        if job.finished:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_job_result_and_progress_are_stored(tmp_path):
+    manager = JobManager(cache_dir=tmp_path)
+
+    def work(job, value):
+        job.update(stage='collecting', reviews_processed=10)
+        return {'value': value}
+
+    job, merged = manager.submit('key', work, 42)
+    assert not merged
+    done = wait_finished(manager, job.id)
+    assert done.status == 'done'
+    assert done.result == {'value': 42}
+    assert done.progress == {'stage': 'collecting', 'reviews_processed': 10}
+    assert done.finished_at is not None
+
+
+def test_same_key_merges_into_running_job(tmp_path):
+    manager = JobManager(cache_dir=tmp_path)
+    release = threading.Event()
+    calls = []
+
+    def work(job):
+        calls.append(job.id)
+        release.wait(5)
+        return 'ok'
+
+    first, merged_first = manager.submit('same', work)
+    second, merged_second = manager.submit('same', work)
+    other, merged_other = manager.submit('other', work)
+    release.set()
+
+    assert (merged_first, merged_second, merged_other) == (False, True, False)
+    assert second.id == first.id
+    assert other.id != first.id
+    wait_finished(manager, first.id)
+    wait_finished(manager, other.id)
+    assert len(calls) == 2
+
+
+def test_jobs_are_visible_to_other_workers(tmp_path):
+    # gunicorn 워커 두 개 = 같은 디렉터리를 쓰는 JobManager 두 개
+    worker_a = JobManager(cache_dir=tmp_path)
+    worker_b = JobManager(cache_dir=tmp_path)
+    release = threading.Event()
+
+    job, _ = worker_a.submit('key', lambda job: release.wait(5) and 'ok')
+    assert worker_b.get(job.id).status in ('queued', 'running')
+    assert worker_b.submit('key', lambda job: 'duplicate')[1] is True
+    release.set()
+    assert wait_finished(worker_b, job.id).result == 'ok'
+
+
+def test_failed_job_records_error(tmp_path):
+    manager = JobManager(cache_dir=tmp_path)
+
+    def work(job):
+        raise RuntimeError('Steam API 요청 실패')
+
+    job, _ = manager.submit('key', work)
+    failed = wait_finished(manager, job.id)
+    assert failed.status == 'failed'
+    assert 'Steam API' in failed.error
+
+
+def test_pending_limit(tmp_path):
+    manager = JobManager(max_workers=1, max_pending=2, cache_dir=tmp_path)
+    release = threading.Event()
+    jobs = [manager.submit(f'key-{i}', lambda job: release.wait(5))[0] for i in range(2)]
+    with pytest.raises(JobQueueFull):
+        manager.submit('key-2', lambda job: None)
+    release.set()
+    for job in jobs:
+        wait_finished(manager, job.id)
+
+
+def test_prune_while_jobs_finish(tmp_path):
+    # 작업이 끝나는 동안 계속 submit(→ prune)해도 오류 없이 처리
+    manager = JobManager(max_workers=4, max_pending=1000, cache_dir=tmp_path, result_ttl=timedelta(0))
+    for i in range(200):
+        manager.submit(f'key-{i}', lambda job: None)
+
+
+def test_expired_results_are_pruned(tmp_path):
+    manager = JobManager(cache_dir=tmp_path, result_ttl=timedelta(seconds=0.05))
+    job, _ = manager.submit('key', lambda job: 'ok')
+    wait_finished(manager, job.id)
+    time.sleep(0.1)
+    manager.submit('other', lambda job: 'ok')
+    assert manager.get(job.id) is None
+
+
+def test_stale_job_is_reported_as_failed(tmp_path):
+    manager = JobManager(cache_dir=tmp_path, stale_after=timedelta(seconds=0.05))
+    release = threading.Event()
+    job, _ = manager.submit('key', lambda job: release.wait(5))
+    time.sleep(0.1)
+    stale = manager.get(job.id)
+    assert stale.status == 'failed'
+    # 응답 없는 작업에는 합류하지 않고 새 작업 생성
+    assert manager.submit('key', lambda job: None)[1] is False
+    release.set()
+
+
+def test_memory_only_without_cache_dir():
+    manager = JobManager()
+    job, _ = manager.submit('key', lambda job: 'ok')
+    assert wait_finished(manager, job.id).result == 'ok'
+
+
+def test_finished_status_is_saved_with_finished_at(tmp_path, monkeypatch):
+    # 완료 상태가 기록되는 시점에는 항상 finished_at이 있어야 prune이 None과 비교하지 않음
+    manager = JobManager(cache_dir=tmp_path)
+    saved = []
+    original = JobManager._save
+
+    def record(self, job, conn=None):
+        saved.append((job.status, job.finished_at))
+        original(self, job, conn)
+
+    monkeypatch.setattr(JobManager, '_save', record)
+    job, _ = manager.submit('key', lambda job: 'ok')
+    wait_finished(manager, job.id)
+    assert all(finished_at is not None for status, finished_at in saved if status in ('done', 'failed'))
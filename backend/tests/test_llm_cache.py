@@ -0,0 +1,37 @@
+# tests/test_llm_cache.py
+
+from services import cache_dir
+from services.llm_cache import LLMResponseCache
+
+
+def test_disk_tier_is_created_on_first_use_and_survives_restart(tmp_path):
+    cache = LLMResponseCache(cache_dir=tmp_path / 'llm')
+    assert not (tmp_path / 'llm').exists()
+    calls = []
+    params = {'model': 'm', 'messages': [{'role': 'user', 'content': '안녕'}]}
+    assert cache.get_or_create(params, lambda: calls.append(1) or 'answer') == 'answer'
+    assert (tmp_path / 'llm' / 'responses.sqlite3').exists()
+
+    restarted = LLMResponseCache(cache_dir=tmp_path / 'llm')
+    assert restarted.get_or_create(params, lambda: calls.append(1) or 'new') == 'answer'
+    assert calls == [1]
+    assert restarted.stats()['disk_hits'] == 1
+
+
+def test_unwritable_directory_falls_back_to_memory(tmp_path, monkeypatch):
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    monkeypatch.setattr(cache_dir, 'TEMP_CACHE_ROOT', blocker / 'tmp-cache')
+    cache = LLMResponseCache(cache_dir=blocker / 'llm')
+    params = {'model': 'm', 'messages': []}
+    assert cache.get_or_create(params, lambda: 'answer') == 'answer'
+    assert cache.get_or_create(params, lambda: 'other') == 'answer'
+    assert cache.db_path is None
+    assert cache.stats()['memory_hits'] == 1
+
+
+def test_key_ignores_dict_order_and_failed_calls_are_not_stored():
+    cache = LLMResponseCache()
+    assert cache.make_key({'a': 1, 'b': 2}) == cache.make_key({'b': 2, 'a': 1})
+    assert cache.get_or_create({'q': 1}, lambda: None) is None
+    assert cache.get_or_create({'q': 1}, lambda: 'ok') == 'ok'
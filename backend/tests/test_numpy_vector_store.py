@@ -0,0 +1,57 @@
+# tests/test_numpy_vector_store.py
+
+import os
+
+import numpy as np
+
+from services.numpy_vector_store import NumpyVectorStore
+
+
+def random_vectors(count, dimension=16, seed=0):
+    return np.random.default_rng(seed).normal(size=(count, dimension)).astype(np.float32)
+
+
+def make_store(path, count=50, **kwargs):
+    vectors = random_vectors(count)
+    store = NumpyVectorStore(str(path), **kwargs)
+    store.add(documents=[f'doc {i}' for i in range(count)], metadatas=[{'i': i} for i in range(count)],
+              ids=[f'id_{i}' for i in range(count)], embeddings=vectors.tolist())
+    return store, vectors
+
+
+def test_query_matches_brute_force_and_squared_l2(tmp_path):
+    store, vectors = make_store(tmp_path)
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    query = random_vectors(1, seed=1)[0]
+    query /= np.linalg.norm(query)
+
+    result = store.query(query_embeddings=[query.tolist()], n_results=5)
+    expected = np.argsort(((normalized - query) ** 2).sum(axis=1))[:5]
+    assert result['ids'][0] == [f'id_{i}' for i in expected]
+    assert result['metadatas'][0][0] == {'i': int(expected[0])}
+    # Chroma(l2)와 같은 제곱 L2 거리
+    np.testing.assert_allclose(result['distances'][0], ((normalized[expected] - query) ** 2).sum(axis=1), atol=1e-5)
+
+
+def test_add_skips_existing_ids_and_upsert_replaces(tmp_path):
+    store, _ = make_store(tmp_path, count=3)
+    store.add(documents=['new', 'dup'], ids=['id_new', 'id_0'], embeddings=random_vectors(2, seed=2).tolist())
+    assert store.count() == 4
+    assert store.get(ids=['id_0'])['documents'] == ['doc 0']
+
+    store.upsert(documents=['replaced'], metadatas=[{}], ids=['id_0'], embeddings=random_vectors(1, seed=3).tolist())
+    assert store.get(ids=['id_0', 'missing'])['documents'] == ['replaced']
+
+
+def test_other_instance_sees_writes_and_old_generations_are_removed(tmp_path):
+    store, _ = make_store(tmp_path, count=5)
+    reader = NumpyVectorStore(str(tmp_path))
+    assert reader.count() == 5
+
+    store.delete(ids=['id_0', 'id_1'])
+    assert reader.count() == 3
+    assert len([name for name in os.listdir(tmp_path) if name.startswith('vectors-')]) == 1
+
+    store.reset()
+    assert reader.count() == 0
+    assert reader.query(query_embeddings=random_vectors(1).tolist(), n_results=3)['ids'] == [[]]
@@ -0,0 +1,76 @@
+# tests/test_quantization.py
+
+import numpy as np
+import pytest
+
+from services.numpy_vector_store import NumpyVectorStore
+from services.quantization import QUANTIZERS, ProductQuantizer, ScalarQuantizer
+
+
+def clustered_vectors(count, dimension=64, clusters=20, seed=0):
+    """임베딩처럼 군집이 있는 정규화된 벡터"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dimension))
+    vectors = centers[rng.integers(clusters, size=count)] + 0.5 * rng.normal(size=(count, dimension))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def exact_top(matrix, queries, k):
+    return np.argsort(-(queries @ matrix.T), axis=1)[:, :k]
+
+
+def test_int8_scores_approximate_inner_product(tmp_path):
+    matrix = clustered_vectors(500)
+    query = clustered_vectors(1, seed=1)[0]
+    quantizer = ScalarQuantizer.fit(matrix)
+    assert quantizer.codes.dtype == np.int8 and quantizer.nbytes < matrix.nbytes / 3
+    np.testing.assert_allclose(quantizer.scores(query), matrix @ query, atol=0.02)
+
+    meta = quantizer.save(str(tmp_path / 'q'))
+    loaded = ScalarQuantizer.load(str(tmp_path / 'q'), len(matrix), meta)
+    np.testing.assert_array_equal(loaded.scores(query), quantizer.scores(query))
+
+
+def test_int8_zero_vector_has_zero_score():
+    quantizer = ScalarQuantizer.fit(np.zeros((2, 8), dtype=np.float32))
+    assert quantizer.scores(np.ones(8, dtype=np.float32)).tolist() == [0.0, 0.0]
+
+
+def test_pq_round_trip_and_code_size(tmp_path):
+    matrix = clustered_vectors(600)
+    quantizer = ProductQuantizer.fit(matrix, subspaces=16, iterations=5)
+    assert quantizer.codes.shape == (16, 600) and quantizer.codes.dtype == np.uint8
+    assert quantizer.centroids.shape == (16, 256, 4)
+
+    query = clustered_vectors(1, seed=1)[0]
+    meta = quantizer.save(str(tmp_path / 'pq'))
+    loaded = ProductQuantizer.load(str(tmp_path / 'pq'), len(matrix), meta)
+    np.testing.assert_allclose(loaded.scores(query), quantizer.scores(query), rtol=1e-6)
+    # 근사 점수와 정확한 내적의 상관관계
+    assert np.corrcoef(quantizer.scores(query), matrix @ query)[0, 1] > 0.9
+
+
+def test_pq_reduces_subspaces_to_divide_dimension():
+    quantizer = ProductQuantizer.fit(clustered_vectors(300, dimension=30), subspaces=8, iterations=2)
+    assert quantizer.codes.shape[0] == 6  # 30 % 8, 30 % 7 != 0
+
+
+@pytest.mark.parametrize("method", sorted(QUANTIZERS))
+def test_quantized_store_recall_after_rerank(tmp_path, method):
+    matrix = clustered_vectors(1000)
+    queries = clustered_vectors(30, seed=1)
+    store = NumpyVectorStore(str(tmp_path), quantization=method, rerank_factor=10)
+    store.add(documents=[str(i) for i in range(len(matrix))], ids=[str(i) for i in range(len(matrix))],
+              embeddings=matrix.tolist())
+
+    # 다른 인스턴스가 저장된 양자화 코드를 불러와서 검색
+    reader = NumpyVectorStore(str(tmp_path))
+    found = reader.query(query_embeddings=queries.tolist(), n_results=10)["ids"]
+    exact = exact_top(matrix, queries, 10)
+    recall = np.mean([len(set(map(int, ids)) & set(top.tolist())) / 10 for ids, top in zip(found, exact)])
+    assert recall >= 0.95
+
+
+def test_unknown_quantization_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        NumpyVectorStore(str(tmp_path), quantization="fp4")
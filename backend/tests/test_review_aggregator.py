@@ -0,0 +1,111 @@
+# tests/test_review_aggregator.py
+
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+# review_aggregator -> review_dedup -> tokenizer(nltk, konlpy)
+pytest.importorskip("nltk")
+pytest.importorskip("konlpy")
+
+from services.review_aggregator import ReviewAggregator  # noqa: E402
+
+
+class Done:
+    def __init__(self, value):
+        self.value = value
+
+    def result(self):
+        return self.value
+
+
+class FakeTokenizer:
+    """공백 단위 토큰화 (TokenizationEngine과 같은 submit_* 인터페이스)"""
+
+    def __init__(self):
+        self.tokenized = 0
+
+    def submit_counts(self, entries):
+        self.tokenized += len(entries)
+        pos, neg = Counter(), Counter()
+        for voted_up, text, _ in entries:
+            (pos if voted_up else neg).update(text.split())
+        return Done((pos, neg))
+
+    def submit_tokens(self, entries):
+        self.tokenized += len(entries)
+        return Done([text.split() for text, _ in entries])
+
+
+def review(i, timestamp, voted_up, text=None, votes_up=0):
+    return {
+        'recommendationid': str(i), 'review': text or f'review number {i}', 'timestamp_created': timestamp,
+        'voted_up': voted_up, 'votes_up': votes_up, 'author': {'playtime_forever': 0}
+    }
+
+
+def sample_reviews():
+    start = datetime(2024, 2, 26, 22, tzinfo=timezone.utc)  # 월요일, 월 경계를 넘도록 2월 말부터
+    return [
+        review(i, int((start + timedelta(hours=7 * i)).timestamp()), i % 3 != 0)
+        for i in range(60)
+    ]
+
+
+def expected_buckets(reviews, key):
+    buckets = {}
+    for item in reviews:
+        bucket = buckets.setdefault(key(datetime.fromtimestamp(item['timestamp_created'], timezone.utc)), [0, 0])
+        bucket[0] += 1
+        bucket[1] += item['voted_up']
+    return [(label, count, up) for label, (count, up) in sorted(buckets.items())]
+
+
+def test_trends_match_reference_and_page_split():
+    reviews = sample_reviews()
+    whole = ReviewAggregator().update(reviews)
+    paged = ReviewAggregator()
+    for start in range(0, len(reviews), 7):
+        paged.update(reviews[start:start + 7])
+    trends = whole.trends()
+    assert paged.trends() == trends
+    assert paged.summary_stats() == whole.summary_stats() == {
+        'total_reviews': 60, 'positive_count': 40, 'negative_count': 20, 'positive_ratio': 40 / 60 * 100
+    }
+
+    def records(name, key):
+        return [(record[key], record['review_count'], record['voted_up']) for record in trends[name]]
+
+    assert records('daily', 'date') == expected_buckets(reviews, lambda d: d.strftime('%Y-%m-%d'))
+    assert records('weekly', 'week') == expected_buckets(
+        reviews, lambda d: (d - timedelta(days=d.weekday())).strftime('%Y-%m-%d'))
+    assert records('monthly', 'month') == expected_buckets(reviews, lambda d: d.strftime('%Y-%m'))
+    hourly = {hour: (count, up) for hour, count, up in expected_buckets(reviews, lambda d: d.hour)}
+    assert [(r['review_count'], r['voted_up']) for r in trends['hourly']] == [hourly.get(h, (0, 0)) for h in range(24)]
+    assert trends['monthly'][0]['positive_ratio'] == round(
+        trends['monthly'][0]['voted_up'] / trends['monthly'][0]['review_count'] * 100, 2)
+
+
+def test_empty_aggregator():
+    aggregator = ReviewAggregator().update([])
+    assert aggregator.trends() == {'daily': [], 'weekly': [], 'monthly': [], 'hourly': []}
+    assert aggregator.summary_stats()['positive_ratio'] == 0
+
+
+def test_dedup_weights_words_and_keeps_one_candidate_per_polarity():
+    tokenizer = FakeTokenizer()
+    meme = 'great game great fun would play again'
+    reviews = [review(i, 1_700_000_000, True, meme, votes_up=i) for i in range(5)]
+    reviews += [review(5, 1_700_000_000, False, meme), review(6, 1_700_000_000, False, 'crashes on launch every time')]
+    aggregator = ReviewAggregator(tokenizer=tokenizer, keep_top=3, dedup=True).update(reviews)
+
+    pos, neg = aggregator.word_frequencies(min_freq=1)
+    assert tokenizer.tokenized == 2  # 그룹 대표만 토큰화
+    assert pos['great'] == 10 and pos['fun'] == 5
+    assert neg['great'] == 2 and neg['crashes'] == 1
+    assert aggregator.summary_stats()['unique_reviews'] == 2
+
+    top_pos, top_neg = aggregator.top_reviews()
+    assert [item['recommendationid'] for item in top_pos] == ['0']
+    assert sorted(item['recommendationid'] for item in top_neg) == ['5', '6']
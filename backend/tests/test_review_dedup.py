@@ -0,0 +1,44 @@
+# tests/test_review_dedup.py
+
+import numpy as np
+import pytest
+
+# review_dedup은 tokenizer(nltk, konlpy)의 텍스트 정규화를 사용
+pytest.importorskip("nltk")
+pytest.importorskip("konlpy")
+
+from services.review_dedup import ReviewDeduplicator, minhash_texts  # noqa: E402
+
+
+def test_signature_ignores_case_spacing_and_punctuation():
+    signatures = minhash_texts(['Best game ever!!!', 'best   game, EVER', 'Worst purchase of my life'])
+    assert signatures.shape == (3, 32) and signatures.dtype == np.uint32
+    assert (signatures[0] == signatures[1]).all()
+    assert (signatures[0] == signatures[2]).mean() < 0.5
+
+
+def test_chunked_signatures_match_single_pass():
+    texts = [f'리뷰 {i} ' + '재미있는 게임 ' * (i % 7) for i in range(50)] + ['', 'a']
+    np.testing.assert_array_equal(minhash_texts(texts, chunk_size=16), minhash_texts(texts))
+
+
+def test_groups_near_duplicates_across_pages():
+    dedup = ReviewDeduplicator()
+    groups, is_new = dedup.assign([
+        'This game is absolutely amazing, I love the story and the music',
+        'Totally unrelated complaint about server lag and crashes',
+        'This game is absolutely amazing, I love the story and the music!!',
+    ])
+    assert groups.tolist() == [0, 1, 0]
+    assert is_new.tolist() == [True, True, False]
+
+    # 다음 페이지에서도 이전 그룹에 합쳐짐
+    groups, is_new = dedup.assign(['this game is absolutely amazing i love the story and the music', '새로운 한국어 리뷰입니다'])
+    assert groups.tolist() == [0, 2]
+    assert is_new.tolist() == [False, True]
+    assert len(dedup) == 3
+
+
+def test_bands_must_divide_num_perm():
+    with pytest.raises(ValueError):
+        ReviewDeduplicator(num_perm=32, bands=5)
@@ -0,0 +1,120 @@
+# tests/test_steam_review_store.py
+
+import time
+
+import pytest
+
+from services import cache_dir
+from services.steam_review_store import SteamReviewStore, SteamAPIError
+
+DAY = 24 * 60 * 60
+
+
+class FakeSteamStore(SteamReviewStore):
+    """Steam API 대신 메모리의 리뷰 목록(최신순)을 페이지로 반환"""
+
+    PAGE_SIZE = 10
+    PAGE_DELAY = 0
+    MAX_FETCH_PER_SYNC = 50
+
+    def __init__(self, cache_dir, reviews):
+        super().__init__(cache_dir)
+        self.remote = reviews
+        self.requested = []
+        self.fail = False
+
+    def _fetch_page(self, app_id, cursor):
+        self.requested.append(cursor)
+        if self.fail:
+            raise SteamAPIError('Steam API 요청 실패', 'offline')
+        start = 0 if cursor == '*' else int(cursor)
+        page = self.remote[start:start + self.PAGE_SIZE]
+        return {'success': 1, 'reviews': page, 'cursor': str(start + len(page))}
+
+
+def make_reviews(count, newest, step=60):
+    return [
+        {'recommendationid': str(100000 + i), 'timestamp_created': newest - i * step,
+         'language': 'english', 'voted_up': i % 2 == 0, 'review': f'review {i}'}
+        for i in range(count)
+    ]
+
+
+def expire_sync_interval(store, app_id):
+    state = store.get_state(app_id)
+    state['last_synced'] -= store.SYNC_INTERVAL.total_seconds() + 1
+    with store._connect() as conn:
+        store._save_state(conn, app_id, state)
+
+
+def test_store_is_created_on_first_use(tmp_path):
+    store = FakeSteamStore(tmp_path / 'reviews', [])
+    assert not (tmp_path / 'reviews').exists()
+    store.get_state('1')
+    assert (tmp_path / 'reviews' / 'reviews.sqlite3').exists()
+
+
+def test_unwritable_directory_falls_back_to_temp(tmp_path, monkeypatch):
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    monkeypatch.setattr(cache_dir, 'TEMP_CACHE_ROOT', tmp_path / 'tmp-cache')
+    store = FakeSteamStore(blocker / 'reviews', [])
+    store.get_state('1')
+    assert store.db_path == str(tmp_path / 'tmp-cache' / 'reviews' / 'reviews.sqlite3')
+
+
+def test_no_writable_directory_keeps_reviews_in_memory(tmp_path, monkeypatch):
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    monkeypatch.setattr(cache_dir, 'TEMP_CACHE_ROOT', blocker / 'tmp-cache')
+    now = int(time.time())
+    store = FakeSteamStore(blocker / 'reviews', make_reviews(5, now))
+    reviews = [review for page in store.iter_pages('1', day_range=1) for review in page]
+    assert len(reviews) == 5
+    assert store.db_path.startswith('file:')
+
+
+def test_failed_first_backfill_does_not_download_full_history(tmp_path):
+    now = int(time.time())
+    store = FakeSteamStore(tmp_path, make_reviews(500, now, step=DAY // 10 + 1))
+    store.fail = True
+    with pytest.raises(SteamAPIError):
+        list(store.iter_pages('1', day_range=1))
+    assert store.get_state('1')['newest_timestamp'] == 0
+
+    store.fail = False
+    store.requested.clear()
+    expire_sync_interval(store, '1')
+    reviews = [review for page in store.iter_pages('1', day_range=1) for review in page]
+    # day_range=1은 첫 10개 리뷰(하루 분량)만 필요 → 한두 페이지만 요청
+    assert len(reviews) == 10
+    assert len(store.requested) <= 2
+
+
+def test_delta_sync_is_capped_and_moves_backfill_cursor(tmp_path):
+    now = int(time.time())
+    old = make_reviews(20, now - 30 * DAY)
+    store = FakeSteamStore(tmp_path, old)
+    list(store.iter_pages('1', day_range=60))
+    assert store.get_state('1')['covered_since'] == 0
+
+    # 마지막 동기화 이후 신규 리뷰가 MAX_FETCH_PER_SYNC보다 많음
+    new = [dict(review, recommendationid=str(200000 + i)) for i, review in enumerate(make_reviews(120, now))]
+    store.remote = new + old
+    store.requested.clear()
+    expire_sync_interval(store, '1')
+    store._sync_delta('1')
+
+    state = store.get_state('1')
+    assert len(store.requested) == store.MAX_FETCH_PER_SYNC // store.PAGE_SIZE
+    assert state['newest_timestamp'] == now
+    assert state['covered_since'] == new[store.MAX_FETCH_PER_SYNC - 1]['timestamp_created']
+    assert state['backfill_cursor'] == str(store.MAX_FETCH_PER_SYNC)
+
+    # backfill은 delta가 멈춘 곳부터 이어서 수집 (이미 받은 페이지를 다시 받지 않음)
+    store.requested.clear()
+    store.sync('1', day_range=60)
+    assert store.requested[0] == str(store.MAX_FETCH_PER_SYNC)
+    store.sync('1', day_range=60)
+    assert store.count_reviews('1', day_range=60) == 140
+    assert store.get_state('1')['covered_since'] == 0
@@ -0,0 +1,39 @@
+# tests/test_token_cache.py
+
+from services import cache_dir
+from services.token_cache import TokenCache
+
+
+def test_round_trip_and_version(tmp_path):
+    cache = TokenCache(tmp_path, 'v1')
+    cache.put_many([('1', '재밌는 게임', ['재밌다']), ('2', 'fun game', ['fun'])])
+    assert cache.get_many([('1', '재밌는 게임'), ('2', 'fun game'), ('3', 'new')]) == [['재밌다'], ['fun'], None]
+    # 텍스트가 바뀌거나 토크나이저 버전이 바뀌면 다시 토큰화
+    assert cache.get_many([('1', '수정된 리뷰')]) == [None]
+    assert TokenCache(tmp_path, 'v2').get_many([('1', '재밌는 게임')]) == [None]
+
+
+def test_directory_is_created_on_first_use(tmp_path):
+    cache = TokenCache(tmp_path / 'tokens', 'v1')
+    assert not (tmp_path / 'tokens').exists()
+    cache.get_many([('1', 'text')])
+    assert (tmp_path / 'tokens' / 'tokens.sqlite3').exists()
+
+
+def test_unwritable_directory_disables_cache(tmp_path, monkeypatch):
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    monkeypatch.setattr(cache_dir, 'TEMP_CACHE_ROOT', blocker / 'tmp-cache')
+    cache = TokenCache(blocker / 'tokens', 'v1')
+    cache.put_many([('1', 'text', ['text'])])
+    assert cache.get_many([('1', 'text')]) == [None]
+
+
+def test_eviction_keeps_recently_used(tmp_path):
+    cache = TokenCache(tmp_path, 'v1', max_entries=10)
+    cache.put_many([(str(i), f'review {i}', [str(i)]) for i in range(10)])
+    cache.get_many([('0', 'review 0')])  # 최근 사용
+    cache.put_many([('new', 'new review', ['new'])])
+    remaining = cache.get_many([(str(i), f'review {i}') for i in range(10)] + [('new', 'new review')])
+    assert sum(tokens is not None for tokens in remaining) == 9
+    assert remaining[0] == ['0'] and remaining[-1] == ['new']
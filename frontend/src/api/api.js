@@ -27,6 +27,49 @@ export const reviewApi = {
   searchGames: (query) => api.get('/review/search/games', { params: { q: query } }),
   getSteamReviews: (appId, params = {}) => api.get(`/review/steam/${appId}`, { params }),
   analyzeReviews: (data) => api.post('/review/analyze', data),
+  // 분석 응답에는 첫 페이지만 포함되므로 나머지 원본 리뷰는 페이지 단위로 조회
+  getReviewPage: (appId, params = {}) => api.get(`/review/reviews/${appId}`, { params }),
+  // 비동기 분석 작업: 생성 후 job_id로 상태/결과 조회
+  createAnalysisJob: (data) => api.post('/review/jobs', data),
+  getAnalysisJob: (jobId) => api.get(`/review/jobs/${jobId}`),
+  getAnalysisJobResult: (jobId) => api.get(`/review/jobs/${jobId}/result`),
+  // 스트리밍 분석 (NDJSON): 섹션이 준비될 때마다 onSection(section, data) 호출
+  analyzeReviewsStream: async (data, onSection) => {
+    const res = await fetch(`${API_BASE_URL}/review/analyze`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', Accept: 'application/x-ndjson' },
+      credentials: 'include',
+      body: JSON.stringify({ ...data, stream: 'ndjson' }),
+    });
+    if (!res.ok) {
+      // 다른 axios 요청과 같이 error.response.data로 오류 내용을 확인할 수 있게 throw
+      const body = await res.text();
+      let payload;
+      try {
+        payload = JSON.parse(body);
+      } catch {
+        payload = { error: body || res.statusText };
+      }
+      const error = new Error(`Request failed with status code ${res.status}`);
+      error.response = { status: res.status, data: payload };
+      throw error;
+    }
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      const lines = buffer.split('\n');
+      buffer = lines.pop();
+      for (const line of lines) {
+        if (!line.trim()) continue;
+        const { section, data: payload } = JSON.parse(line);
+        onSection(section, payload);
+      }
+    }
+  },
 };
 
 export const chatbotApi = {
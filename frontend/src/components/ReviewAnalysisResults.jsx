@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect } from 'react';
 import {
   Box,
   Tabs,
@@ -8,7 +8,13 @@ import {
   Grid,
   Divider,
   Alert,
+  Button,
+  Chip,
+  CircularProgress,
+  List,
+  ListItem,
 } from '@mui/material';
+import { reviewApi } from '../api/api';
 import { Line, Pie, Bar } from 'react-chartjs-2';
 import ReactMarkdown from 'react-markdown';
 import remarkGfm from 'remark-gfm';  // GitHub Flavored Markdown 지원
@@ -50,6 +56,139 @@ function TabPanel({ children, value, index, ...other }) {
   );
 }
 
+// 서버가 계산한 워드클라우드 배치(layout)를 SVG로 직접 그리기
+function WordCloudLayout({ layout }) {
+  return (
+    <svg
+      viewBox={`0 0 ${layout.width} ${layout.height}`}
+      style={{ width: '100%', maxWidth: 400, height: 'auto', background: 'white' }}
+    >
+      {layout.words.map((w) => (
+        <text
+          key={w.text}
+          x={w.x}
+          y={w.y}
+          fontSize={w.size}
+          fill={w.color}
+          dominantBaseline="text-before-edge"
+          textAnchor={w.rotate ? 'end' : 'start'}
+          transform={w.rotate ? `rotate(-90 ${w.x} ${w.y})` : undefined}
+        >
+          {w.text}
+        </text>
+      ))}
+    </svg>
+  );
+}
+
+// 워드클라우드 이미지(base64) 또는 배치(layout) 표시
+function WordCloudView({ wordcloud, side, alt }) {
+  const layout = wordcloud?.[`${side}_layout`];
+  const image = wordcloud?.[`${side}_wc_base64`];
+  if (layout) {
+    return <WordCloudLayout layout={layout} />;
+  }
+  if (image) {
+    return (
+      <img
+        src={`data:image/${wordcloud.image_format || 'png'};base64,${image}`}
+        alt={alt}
+        style={{ width: '100%', maxWidth: 400, height: 'auto' }}
+      />
+    );
+  }
+  return <Typography>워드클라우드 이미지가 없습니다.</Typography>;
+}
+
+// 원본 리뷰 목록: 분석 응답의 첫 페이지를 보여주고, 나머지는 저장된 리뷰를 페이지 단위로 조회
+function ReviewList({ appId, settings, initialReviews, pageInfo }) {
+  const [reviews, setReviews] = useState(initialReviews || []);
+  const [page, setPage] = useState(pageInfo || { page: 1, has_more: false });
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [loadError, setLoadError] = useState(null);
+
+  useEffect(() => {
+    setReviews(initialReviews || []);
+    setPage(pageInfo || { page: 1, has_more: false });
+  }, [initialReviews, pageInfo]);
+
+  const handleLoadMore = async () => {
+    setLoadingMore(true);
+    setLoadError(null);
+    try {
+      const res = await reviewApi.getReviewPage(appId, {
+        language: settings.language,
+        review_type: settings.review_type,
+        day_range: settings.day_range,
+        page: page.page + 1,
+        page_size: page.page_size
+      });
+      setReviews(prev => [...prev, ...res.data.reviews]);
+      setPage(res.data);
+    } catch (error) {
+      console.error('[DEBUG] 리뷰 페이지 조회 오류:', error);
+      setLoadError(error.response?.data?.error || '리뷰를 더 불러오지 못했습니다.');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  return (
+    <Box>
+      <Typography variant="subtitle1" color="text.secondary" gutterBottom>
+        {reviews.length.toLocaleString()} / {(page.total ?? reviews.length).toLocaleString()}개 표시
+      </Typography>
+      <List>
+        {reviews.map((review) => (
+          <ListItem
+            key={review.recommendationid}
+            sx={{ display: 'block', mb: 1, border: '1px solid', borderColor: 'divider', borderRadius: 1 }}
+          >
+            <Box sx={{ display: 'flex', gap: 1, mb: 1, flexWrap: 'wrap' }}>
+              <Chip
+                size="small"
+                label={review.voted_up ? '추천' : '비추천'}
+                color={review.voted_up ? 'success' : 'error'}
+              />
+              {review.language && <Chip size="small" variant="outlined" label={review.language} />}
+              {review.timestamp_created && (
+                <Chip
+                  size="small"
+                  variant="outlined"
+                  label={new Date(review.timestamp_created * 1000).toLocaleDateString()}
+                />
+              )}
+              {review.author?.playtime_forever !== undefined && (
+                <Chip
+                  size="small"
+                  variant="outlined"
+                  label={`플레이 ${(review.author.playtime_forever / 60).toFixed(1)}시간`}
+                />
+              )}
+            </Box>
+            <Typography variant="body2" sx={{ whiteSpace: 'pre-wrap', wordBreak: 'break-word' }}>
+              {review.review}
+            </Typography>
+          </ListItem>
+        ))}
+      </List>
+      {loadError && <Alert severity="error" sx={{ mb: 2 }}>{loadError}</Alert>}
+      {page.has_more && (
+        <Box sx={{ textAlign: 'center' }}>
+          <Button
+            variant="outlined"
+            onClick={handleLoadMore}
+            disabled={loadingMore}
+            startIcon={loadingMore ? <CircularProgress size={20} /> : null}
+          >
+            리뷰 더 보기
+          </Button>
+        </Box>
+      )}
+    </Box>
+  );
+}
+
 function MarkdownContent({ children }) {
   return (
     <Box sx={{ 
@@ -77,7 +216,7 @@ function MarkdownContent({ children }) {
   );
 }
 
-export default function ReviewAnalysisResults({ analyzeResult, useGpt }) {
+export default function ReviewAnalysisResults({ analyzeResult, useGpt, appId, settings }) {
   const [tabValue, setTabValue] = useState(0);
 
   const chartOptions = {
@@ -184,6 +323,7 @@ export default function ReviewAnalysisResults({ analyzeResult, useGpt }) {
           <Tab label="요약 통계" />
           <Tab label="키워드 분석" />
           <Tab label="트렌드 분석" />
+          <Tab label="리뷰 목록" />
         </Tabs>
       </Box>
 
@@ -307,15 +447,7 @@ export default function ReviewAnalysisResults({ analyzeResult, useGpt }) {
                 긍정적 키워드
               </Typography>
               <Box sx={{ mb: 4 }}>
-                {analyzeResult.wordcloud?.pos_wc_base64 ? (
-                  <img
-                    src={`data:image/png;base64,${analyzeResult.wordcloud.pos_wc_base64}`}
-                    alt="Positive WordCloud"
-                    style={{ width: '100%', maxWidth: 400, height: 'auto' }}
-                  />
-                ) : (
-                  <Typography>워드클라우드 이미지가 없습니다.</Typography>
-                )}
+                <WordCloudView wordcloud={analyzeResult.wordcloud} side="pos" alt="Positive WordCloud" />
               </Box>
               <Typography variant="subtitle1" gutterBottom>
                 주요 키워드 빈도
@@ -347,15 +479,7 @@ export default function ReviewAnalysisResults({ analyzeResult, useGpt }) {
                 부정적 키워드
               </Typography>
               <Box sx={{ mb: 4 }}>
-                {analyzeResult.wordcloud?.neg_wc_base64 ? (
-                  <img
-                    src={`data:image/png;base64,${analyzeResult.wordcloud.neg_wc_base64}`}
-                    alt="Negative WordCloud"
-                    style={{ width: '100%', maxWidth: 400, height: 'auto' }}
-                  />
-                ) : (
-                  <Typography>워드클라우드 이미지가 없습니다.</Typography>
-                )}
+                <WordCloudView wordcloud={analyzeResult.wordcloud} side="neg" alt="Negative WordCloud" />
               </Box>
               <Typography variant="subtitle1" gutterBottom>
                 주요 키워드 빈도
@@ -433,6 +557,16 @@ export default function ReviewAnalysisResults({ analyzeResult, useGpt }) {
           </Grid>
         </Grid>
       </TabPanel>
+
+      {/* 리뷰 목록 탭 */}
+      <TabPanel value={tabValue} index={3}>
+        <ReviewList
+          appId={appId}
+          settings={settings}
+          initialReviews={analyzeResult.reviews}
+          pageInfo={analyzeResult.reviews_page}
+        />
+      </TabPanel>
     </Paper>
   );
 } 
\ No newline at end of file
@@ -75,6 +75,7 @@ function ReviewTab({ reviewState, setReviewState }) {
     day_range: 30
   });
   const [analyzing, setAnalyzing] = React.useState(false);
+  const [analysisProgress, setAnalysisProgress] = React.useState(0);  // 지금까지 집계한 리뷰 수
 
   const handleSearchGames = async () => {
     if (!searchQuery.trim()) return;
@@ -157,66 +158,62 @@ function ReviewTab({ reviewState, setReviewState }) {
     e.preventDefault();
     if (!selectedGame) return;
 
-    setReviewState(prev => ({ ...prev, loading: true, error: null }));
-
-    try {
-      const payload = {
-        app_id: selectedGame.appid,
-        settings: {
-          language: reviewSettings.language,
-          review_type: reviewSettings.review_type,
-          day_range: parseInt(reviewSettings.day_range)
-        },
-        use_gpt: reviewSettings.use_gpt
-      };
+    setAnalyzing(true);
+    setAnalysisProgress(0);
+    setReviewState(prev => ({ ...prev, loading: true, error: null, analysisResult: null }));
 
-      console.log('[DEBUG] 리뷰 분석 요청:', payload);
-      const res = await reviewApi.analyzeReviews(payload);
+    const payload = {
+      app_id: selectedGame.appid,
+      settings: {
+        language: reviewSettings.language,
+        review_type: reviewSettings.review_type,
+        day_range: parseInt(reviewSettings.day_range)
+      },
+      use_gpt: reviewSettings.use_gpt
+    };
 
-      if (res.data.success && (!res.data.reviews || res.data.reviews.length === 0)) {
-        setReviewState(prev => ({
-          ...prev,
-          analysisResult: {
-            success: true,
-            message: `선택한 기간(${reviewSettings.day_range}일) 동안의 리뷰가 없습니다.`,
-            summary_stats: {
-              total_reviews: 0,
-              positive_count: 0,
-              negative_count: 0
-            }
-          },
-          loading: false
-        }));
-        return;
+    // 스트리밍 응답: 통계/트렌드가 도착하면 바로 결과를 표시하고, 워드클라우드/AI 분석은 도착하는 대로 채움
+    const result = { success: true };
+    const showResult = () => {
+      if (result.summary_stats && result.trends) {
+        setReviewState(prev => ({ ...prev, analysisResult: { ...result }, loading: false }));
       }
+    };
 
-      if (res.data.success && res.data.reviews?.length > 0) {
-        console.log('[DEBUG] 분석 결과:', res.data);
-        setReviewState(prev => ({
-          ...prev,
-          analysisResult: res.data,
-          loading: false
-        }));
-        
-        if (res.data.gpt_error) {
-          setReviewState(prev => ({
-            ...prev,
-            error: {
-              severity: 'warning',
-              message: `리뷰 분석은 완료되었으나, AI 분석 중 오류가 발생했습니다: ${res.data.gpt_error}`
-            }
-          }));
+    try {
+      console.log('[DEBUG] 리뷰 분석 요청:', payload);
+      await reviewApi.analyzeReviewsStream(payload, (section, data) => {
+        switch (section) {
+          case 'progress':
+            setAnalysisProgress(data.total_reviews);
+            break;
+          case 'error':
+            setReviewState(prev => ({
+              ...prev,
+              error: {
+                severity: 'error',
+                message: data.error || '리뷰 데이터를 분석하는 중 오류가 발생했습니다.'
+              },
+              loading: false
+            }));
+            break;
+          case 'gpt_error':
+            setReviewState(prev => ({
+              ...prev,
+              error: {
+                severity: 'warning',
+                message: `리뷰 분석은 완료되었으나, AI 분석 중 오류가 발생했습니다: ${data}`
+              }
+            }));
+            break;
+          case 'done':
+            break;
+          default:
+            result[section] = data;
+            showResult();
         }
-      } else {
-        setReviewState(prev => ({
-          ...prev,
-          error: {
-            severity: 'error',
-            message: res.data.error || '리뷰 데이터를 분석하는 중 오류가 발생했습니다.'
-          },
-          loading: false
-        }));
-      }
+      });
+      console.log('[DEBUG] 분석 결과:', result);
     } catch (error) {
       console.error('[DEBUG] 분석 오류:', error);
       setReviewState(prev => ({
@@ -227,6 +224,9 @@ function ReviewTab({ reviewState, setReviewState }) {
         },
         loading: false
       }));
+    } finally {
+      setAnalyzing(false);
+      setReviewState(prev => ({ ...prev, loading: false }));
     }
   };
 
@@ -501,7 +501,9 @@ function ReviewTab({ reviewState, setReviewState }) {
                     disabled={analyzing}
                     startIcon={analyzing ? <CircularProgress size={20} /> : null}
                   >
-                    {analyzing ? '분석 중...' : '리뷰 분석 시작'}
+                    {analyzing
+                      ? `분석 중... (${analysisProgress.toLocaleString()}개)`
+                      : '리뷰 분석 시작'}
                   </Button>
                 </Box>
               </Paper>
@@ -516,6 +518,8 @@ function ReviewTab({ reviewState, setReviewState }) {
             {analysisResult && (
               <ReviewAnalysisResults 
                 analyzeResult={analysisResult}
+                appId={selectedGame.appid}
+                settings={reviewSettings}
               />
             )}
           </Paper>